@@ -1,29 +1,612 @@
 import tkinter as tk
 from tkinter import ttk
+import sys
+import time
 import numpy as np
+import scipy.sparse as sparse
+from scipy.sparse.linalg import splu
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from phase_profiler import PROFILER
+from core_materials import build_core_layout, face_coefficients
+
+# Konstanta dua grup (indeks 0 = cepat, 1 = termal) per material:
+# D (cm), Sigma_a (/cm), Sigma_s[g][g'] hamburan dari grup g ke g' (/cm),
+# nu_Sigma_f (/cm), dan spektrum fisi chi
+group_data = {
+    "U-235": {"D": [1.4, 0.4], "Sigma_a": [0.010, 0.085], "Sigma_s": [[0.0, 0.018], [0.0, 0.0]],
+              "nu_Sigma_f": [0.006, 0.110], "chi": [1.0, 0.0]},
+    "Pu-239": {"D": [1.4, 0.4], "Sigma_a": [0.012, 0.120], "Sigma_s": [[0.0, 0.017], [0.0, 0.0]],
+               "nu_Sigma_f": [0.008, 0.160], "chi": [1.0, 0.0]},
+    "Th-232": {"D": [1.4, 0.4], "Sigma_a": [0.009, 0.060], "Sigma_s": [[0.0, 0.018], [0.0, 0.0]],
+               "nu_Sigma_f": [0.002, 0.010], "chi": [1.0, 0.0]},
+    "Moderator": {"D": [1.1, 0.2], "Sigma_a": [0.0005, 0.020], "Sigma_s": [[0.0, 0.050], [0.0, 0.0]],
+                  "nu_Sigma_f": [0.0, 0.0], "chi": [1.0, 0.0]},
+    "Reflector": {"D": [1.3, 0.9], "Sigma_a": [0.0004, 0.0003], "Sigma_s": [[0.0, 0.010], [0.0, 0.0]],
+                  "nu_Sigma_f": [0.0, 0.0], "chi": [1.0, 0.0]},
+}
 
 # Fungsi untuk menghitung flux neutron 2D menggunakan metode iterasi defisi
+# `initial` dapat berisi tebakan awal (misalnya hasil calculate_flux_multigrid) sebagai ganti nol
 
-def calculate_flux(shape, D, Sigma_a, S, max_iter=500, tol=1e-5):
+def calculate_flux(shape, D, Sigma_a, S, max_iter=500, tol=1e-5, initial=None):
     nx, ny = shape
-    flux = np.zeros((nx, ny))
+    flux = np.zeros((nx, ny)) if initial is None else np.array(initial, dtype=float)
     for _ in range(max_iter):
-        flux_new = np.copy(flux)
-        for i in range(1, nx - 1):
-            for j in range(1, ny - 1):
-                flux_new[i, j] = (S[i, j] + D * (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1])) / (4 * D + Sigma_a[i, j])
-        if np.linalg.norm(flux_new - flux) < tol:
+        PROFILER.count("steps")
+        with PROFILER.phase("copy"):
+            flux_new = np.copy(flux)
+        with PROFILER.phase("stencil"):
+            flux_new[1:-1, 1:-1] = (S[1:-1, 1:-1] + D * (flux[2:, 1:-1] + flux[:-2, 1:-1] + flux[1:-1, 2:] + flux[1:-1, :-2])) / (4 * D + Sigma_a[1:-1, 1:-1])
+        with PROFILER.phase("convergence"):
+            converged = np.linalg.norm(flux_new - flux) < tol
+        if converged:
             break
         flux = flux_new
     return flux
 
+# Fungsi untuk merakit matriks sparse 5 titik -div(D grad) + Sigma_r pada sel bagian dalam
+# Batas grid bernilai nol (Dirichlet), sama seperti calculate_flux
+
+def assemble_diffusion_operator(D_map, removal, dx=1.0):
+    faces = face_coefficients(D_map, dx)
+    mx, my = faces["ip"].shape
+    index = np.arange(mx * my).reshape(mx, my)
+    diagonal = faces["ip"] + faces["im"] + faces["jp"] + faces["jm"] + removal[1:-1, 1:-1]
+    rows = [index.ravel(), index[:-1, :].ravel(), index[1:, :].ravel(), index[:, :-1].ravel(), index[:, 1:].ravel()]
+    cols = [index.ravel(), index[1:, :].ravel(), index[:-1, :].ravel(), index[:, 1:].ravel(), index[:, :-1].ravel()]
+    vals = [diagonal.ravel(), -faces["ip"][:-1, :].ravel(), -faces["im"][1:, :].ravel(),
+            -faces["jp"][:, :-1].ravel(), -faces["jm"][:, 1:].ravel()]
+    return sparse.csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(mx * my, mx * my))
+
+# Fungsi untuk merakit operator multigrup (G grup) sekali per layout
+# Setiap grup memiliki blok diagonal sparse sendiri yang langsung difaktorkan (LU);
+# kopling antargrup (hamburan) disimpan sebagai vektor diagonal per pasangan grup,
+# sehingga tidak pernah dibentuk matriks padat berukuran G x N
+
+def assemble_multigroup(labels, materials, dx=1.0, table=group_data):
+    def lookup(key):
+        return np.array([table[name][key] for name in materials], dtype=float)[labels]
+
+    D = lookup("D")  # (nx, ny, G)
+    Sigma_a = lookup("Sigma_a")
+    Sigma_s = lookup("Sigma_s")  # (nx, ny, G, G)
+    groups = D.shape[-1]
+    inner = (slice(1, -1), slice(1, -1))
+
+    removal = Sigma_a + Sigma_s.sum(axis=-1) - np.einsum("...gg->...g", Sigma_s)
+    operators = [assemble_diffusion_operator(D[..., g], removal[..., g], dx) for g in range(groups)]
+    return {
+        "shape": labels.shape,
+        "groups": groups,
+        "operators": operators,
+        # Operator simetris: urutan minimum degree pada A^T + A memberi fill-in jauh lebih kecil
+        "factors": [splu(A, permc_spec="MMD_AT_PLUS_A", options={"SymmetricMode": True}) for A in operators],
+        "scatter": [[Sigma_s[inner][..., g_from, g_to].ravel() for g_to in range(groups)] for g_from in range(groups)],
+        "upscatter": bool(np.any(np.tril(Sigma_s.reshape(-1, groups, groups).max(axis=0), k=-1))),
+        "nu_fission": lookup("nu_Sigma_f")[inner].reshape(-1, groups).T.copy(),
+        "chi": lookup("chi")[inner].reshape(-1, groups).T.copy(),
+    }
+
+# Fungsi untuk menyelesaikan sistem multigrup dengan iterasi blok Gauss-Seidel
+# Tiap grup diselesaikan dengan faktorisasi LU yang sudah disimpan; bila hanya ada
+# hamburan ke bawah (down-scatter), satu sapuan dari grup cepat ke termal sudah eksak
+
+def solve_multigroup(system, source, tol=1e-8, max_sweeps=100):
+    groups = system["groups"]
+    phi = np.zeros_like(source)
+    for _ in range(max_sweeps):
+        change = 0.0
+        for g in range(groups):
+            q = source[g].copy()
+            for g_from in range(groups):
+                if g_from != g:
+                    q += system["scatter"][g_from][g] * phi[g_from]
+            new = system["factors"][g].solve(q)
+            change = max(change, np.linalg.norm(new - phi[g]) / max(np.linalg.norm(new), 1e-300))
+            phi[g] = new
+        if not system["upscatter"] or change < tol:
+            break
+    return phi
+
+# Fungsi untuk mengembalikan vektor grup ke bentuk grid (G, nx, ny) dengan batas nol
+
+def unpack_groups(system, phi):
+    nx, ny = system["shape"]
+    flux = np.zeros((system["groups"], nx, ny))
+    flux[:, 1:-1, 1:-1] = phi.reshape(system["groups"], nx - 2, ny - 2)
+    return flux
+
+# Fungsi untuk menghitung flux dua grup (cepat/termal) dari sumber eksternal S
+# Neutron sumber dipancarkan mengikuti spektrum chi (default: seluruhnya di grup cepat)
+
+def calculate_multigroup_flux(labels, materials, S, dx=1.0, table=group_data, system=None):
+    if system is None:
+        system = assemble_multigroup(labels, materials, dx, table)
+    source = system["chi"] * S[1:-1, 1:-1].ravel()
+    return unpack_groups(system, solve_multigroup(system, source))
+
+# Fungsi untuk menghitung sumber fisi per sel, sum_g nu_Sigma_f,g * phi_g
+
+def fission_source(system, phi):
+    return np.einsum("gn,gn->n", system["nu_fission"], phi)
+
+# Fungsi untuk merakit dan memfaktorkan operator tergeser Wielandt (M - chi nu_Sigma_f^T / k_shift)
+# Operator ini mengkopel semua grup (fisi termal masuk ke grup cepat), sehingga dirakit sebagai
+# matriks blok sparse G x G dan difaktorkan sekali untuk seluruh iterasi luar
+
+def wielandt_factor(system, k_shift):
+    groups = system["groups"]
+    blocks = [[None] * groups for _ in range(groups)]
+    for g_to in range(groups):
+        for g_from in range(groups):
+            coupling = -system["chi"][g_to] * system["nu_fission"][g_from] / k_shift
+            if g_from == g_to:
+                blocks[g_to][g_from] = system["operators"][g_to] + sparse.diags(coupling)
+            else:
+                coupling = coupling - system["scatter"][g_from][g_to]
+                if np.any(coupling):
+                    blocks[g_to][g_from] = sparse.diags(coupling)
+    return splu(sparse.bmat(blocks, format="csc"))
+
+# Fungsi untuk menghitung faktor multiplikasi efektif (k-eigenvalue) dengan iterasi daya sumber fisi
+# Beberapa iterasi awal tanpa akselerasi dipakai untuk menaksir k dan rasio dominansi;
+# setelah itu, dengan acceleration="wielandt", iterasi memakai operator tergeser pada
+# k_shift = k + shift sehingga rasio konvergensi turun drastis. Solve dalam memakai
+# faktorisasi yang tersimpan (LU per grup atau LU operator tergeser)
+# Wielandt mengurangi jumlah iterasi luar, tetapi tiap iterasinya menyelesaikan LU gabungan
+# semua grup yang jauh lebih mahal daripada sapuan LU per grup. Ia baru menguntungkan bila
+# rasio dominansi mendekati 1 (teras besar/terkopel lemah, ratusan iterasi luar). Bawaan
+# acceleration="auto" hanya beralih ke Wielandt jika rasio dominansi hasil pemanasan
+# >= WIELANDT_MIN_RATIO; "none" selalu memakai iterasi daya biasa.
+# Jika nilai eigen ternyata di atas k_shift (taksiran pemanasan belum konvergen), k_shift
+# dinaikkan dan operator tergeser difaktorkan ulang
+
+WIELANDT_MIN_RATIO = 0.95
+
+def calculate_k_eigenvalue(labels, materials, dx=1.0, table=group_data, system=None, acceleration="auto",
+                           shift=0.1, tol=1e-6, max_outer=1000, warmup=5):
+    if acceleration not in ("auto", "wielandt", "none"):
+        raise ValueError(f"Akselerasi tidak dikenal: {acceleration}")
+    if shift <= 0:
+        raise ValueError("shift Wielandt harus positif.")
+    start = time.perf_counter()
+    if system is None:
+        system = assemble_multigroup(labels, materials, dx, table)
+    groups, cells = system["chi"].shape
+
+    phi = np.ones((groups, cells))
+    source = fission_source(system, phi)
+    source /= source.sum()
+    k = 1.0
+    k_history, ratios = [], []
+    previous_change = None
+    factor, k_shift = None, None
+    dominance_ratio = None
+
+    for outer in range(1, max_outer + 1):
+        PROFILER.count("steps")
+        if factor is None:
+            phi = solve_multigroup(system, system["chi"] * source / k)
+            new_source = fission_source(system, phi)
+            k_new = k * new_source.sum() / source.sum()
+        else:
+            # Iterasi daya pada (M - W / k_shift)^-1 W dengan nilai eigen lam = 1 / (1/k - 1/k_shift)
+            lam = 1.0 / (1.0 / k - 1.0 / k_shift)
+            phi = factor.solve((system["chi"] * source / lam).ravel()).reshape(groups, cells)
+            new_source = fission_source(system, phi)
+            lam_new = lam * new_source.sum() / source.sum()
+            if lam_new <= 0:
+                # Nilai eigen di atas k_shift: geser lebih jauh (jarak digandakan) dan ulangi
+                shift *= 2
+                k_shift += shift
+                factor = wielandt_factor(system, k_shift)
+                continue
+            k_new = 1.0 / (1.0 / lam_new + 1.0 / k_shift)
+        new_source /= new_source.sum()
+
+        change = np.linalg.norm(new_source - source)
+        if previous_change:
+            ratios.append(change / previous_change)
+        previous_change = change
+        k_history.append(k_new)
+        converged = abs(k_new - k) < tol * k_new and change < tol * np.linalg.norm(new_source)
+        k, source = k_new, new_source
+        if converged:
+            break
+
+        if outer == warmup and factor is None:
+            dominance_ratio = ratios[-1] if ratios else None
+            if acceleration == "wielandt" or (acceleration == "auto" and dominance_ratio is not None
+                                               and dominance_ratio >= WIELANDT_MIN_RATIO):
+                k_shift = k + shift
+                assert k_shift > k
+                factor = wielandt_factor(system, k_shift)
+
+    if dominance_ratio is None and ratios:
+        dominance_ratio = ratios[-1]
+    flux = unpack_groups(system, phi / max(fission_source(system, phi).sum(), 1e-300))
+    return {
+        "k": k,
+        "flux": flux,
+        "outer_iterations": outer,
+        "dominance_ratio": dominance_ratio,
+        "convergence_ratio": ratios[-1] if ratios else None,
+        "k_shift": k_shift,
+        "k_history": np.array(k_history),
+        "seconds": time.perf_counter() - start,
+    }
+
+# Fungsi untuk menyelesaikan -D lap(phi) + Sigma_a phi = source pada simpul aktif dengan spasi h
+# Simpul tidak aktif bertindak sebagai syarat batas Dirichlet dengan nilai dari `values`.
+# Faktorisasi LU disimpan di `cache` karena pola simpul aktif tiap level tetap selama siklus
+
+def solve_active_region(values, active, h, D, Sigma_a, source, cache=None):
+    if cache is not None and "factor" in cache:
+        factor, index = cache["factor"], cache["index"]
+    else:
+        index = -np.ones(active.shape, dtype=np.intp)
+        index[active] = np.arange(np.count_nonzero(active))
+        rows, cols, vals = [index[active]], [index[active]], [np.full(np.count_nonzero(active), 4 * D / h**2 + Sigma_a)]
+        for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            neighbor = np.roll(np.roll(index, -di, axis=0), -dj, axis=1)
+            pair = active & (neighbor >= 0)
+            rows.append(index[pair])
+            cols.append(neighbor[pair])
+            vals.append(np.full(np.count_nonzero(pair), -D / h**2))
+        n = np.count_nonzero(active)
+        with PROFILER.phase("factorize"):
+            factor = splu(sparse.csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n)),
+                          permc_spec="MMD_AT_PLUS_A", options={"SymmetricMode": True})
+        if cache is not None:
+            cache["factor"], cache["index"] = factor, index
+
+    # Kontribusi simpul Dirichlet tetangga dipindah ke ruas kanan
+    fixed = np.where(active, 0.0, values)
+    padded = np.pad(fixed, 1)
+    rhs = source + D / h**2 * (padded[2:, 1:-1] + padded[:-2, 1:-1] + padded[1:-1, 2:] + padded[1:-1, :-2])
+    result = values.copy()
+    with PROFILER.phase("solve"):
+        result[active] = factor.solve(rhs[active])
+    return result
+
+# Fungsi untuk interpolasi bilinear nilai level kasar ke kotak level halus (rasio 2)
+# Indeks global level halus I berimpit dengan indeks kasar I/2. Interpolasi ini hanya
+# mencocokkan nilai flux di tepi level halus, bukan arus neutron (D grad phi) lintas tepi
+
+def prolong(coarse, coarse_origin, fine_origin, fine_shape):
+    result = []
+    for axis in range(2):
+        position = (fine_origin[axis] + np.arange(fine_shape[axis])) / 2 - coarse_origin[axis]
+        low = np.floor(position).astype(np.intp)
+        result.append((low, position - low))
+    (i0, wi), (j0, wj) = result
+    i1 = np.minimum(i0 + 1, coarse.shape[0] - 1)
+    j1 = np.minimum(j0 + 1, coarse.shape[1] - 1)
+    return ((1 - wi)[:, None] * ((1 - wj) * coarse[i0][:, j0] + wj * coarse[i0][:, j1])
+            + wi[:, None] * ((1 - wj) * coarse[i1][:, j0] + wj * coarse[i1][:, j1]))
+
+# Fungsi untuk menghitung flux steady dengan penghalusan mesh adaptif berstruktur blok di sekitar sumber titik
+# Level 0 adalah grid kasar (spasi dx * 2^levels) di seluruh domain. Pada setiap level, simpul dengan
+# gradien flux relatif melebihi `threshold` ditandai, blok `block` x `block` simpul yang memuatnya
+# dihaluskan 2x, dan level halus diselesaikan dengan batas Dirichlet dari interpolasi level kasar.
+# Simpul kasar yang tertutup level halus diberi nilai injeksi dari level halus lalu level kasar
+# diselesaikan ulang, sehingga medan jauh ikut merasakan solusi dekat sumber yang lebih akurat.
+# Sumber titik dikonservasi: total Q = S * dx^2 diletakkan sebagai densitas Q / h^2 di setiap level.
+# Catatan: kopling kasar-halus TIDAK konservatif. Tepi level halus memakai nilai Dirichlet hasil
+# interpolasi bilinear dan level kasar menerima injeksi nilai, tanpa penyamaan arus (refluxing)
+# di muka antarmuka, sehingga neraca neutron lintas antarmuka hanya seimbang sampai galat
+# diskretisasi. Untuk sumber titik ini cukup untuk puncak flux (galat ~1e-5 terhadap grid
+# seragam pada benchmark_amr), tetapi total flux/absorpsi per zona tidak dijamin kekal.
+
+def calculate_flux_amr(shape, D, Sigma_a, source_strength=1.0, dx=1.0, levels=3, threshold=0.01, block=4, cycles=3):
+    nx, ny = shape
+    ratio = 2 ** levels
+    if (nx - 1) % (2 * ratio) or (ny - 1) % (2 * ratio):
+        raise ValueError(f"Ukuran grid {shape} harus berbentuk k * 2^{levels + 1} + 1 agar sumber pusat berimpit di semua level")
+    charge = source_strength * dx**2
+    center = ((nx - 1) // 2, (ny - 1) // 2)
+
+    def make_source(level, origin, level_shape, h):
+        source = np.zeros(level_shape)
+        scale = 2 ** (levels - level)
+        ci, cj = center[0] // scale - origin[0], center[1] // scale - origin[1]
+        if 0 <= ci < level_shape[0] and 0 <= cj < level_shape[1]:
+            source[ci, cj] = charge / h**2
+        return source
+
+    # Level 0: seluruh domain, batas luar nol
+    h0 = dx * ratio
+    base_shape = ((nx - 1) // ratio + 1, (ny - 1) // ratio + 1)
+    active = np.zeros(base_shape, dtype=bool)
+    active[1:-1, 1:-1] = True
+    hierarchy = [{"origin": (0, 0), "h": h0, "active": active, "covered": np.ones(base_shape, dtype=bool),
+                  "values": np.zeros(base_shape), "source": make_source(0, (0, 0), base_shape, h0)}]
+    hierarchy[0]["values"] = solve_active_region(hierarchy[0]["values"], active, h0, D, Sigma_a,
+                                                 hierarchy[0]["source"])
+
+    # Membangun level halus secara berurutan dari penanda gradien
+    for level in range(1, levels + 1):
+        parent = hierarchy[-1]
+        values = parent["values"]
+        gradient = np.zeros(values.shape)
+        gradient[:-1, :] = np.maximum(gradient[:-1, :], np.abs(np.diff(values, axis=0)))
+        gradient[1:, :] = np.maximum(gradient[1:, :], np.abs(np.diff(values, axis=0)))
+        gradient[:, :-1] = np.maximum(gradient[:, :-1], np.abs(np.diff(values, axis=1)))
+        gradient[:, 1:] = np.maximum(gradient[:, 1:], np.abs(np.diff(values, axis=1)))
+        flagged = (gradient > threshold * np.abs(values).max()) & parent["active"]
+
+        # Blok ditandai bila memuat simpul bertanda dan seluruhnya berada di area level induk
+        covered = np.zeros(values.shape, dtype=bool)
+        for bi in range(0, values.shape[0] - 1, block):
+            for bj in range(0, values.shape[1] - 1, block):
+                rows, cols = slice(bi, min(bi + block, values.shape[0] - 1) + 1), slice(bj, min(bj + block, values.shape[1] - 1) + 1)
+                if flagged[rows, cols].any() and parent["covered"][rows, cols].all():
+                    covered[rows, cols] = True
+        if not covered.any():
+            break
+
+        rows = np.flatnonzero(covered.any(axis=1))
+        cols = np.flatnonzero(covered.any(axis=0))
+        box = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        origin = (2 * (parent["origin"][0] + rows[0]), 2 * (parent["origin"][1] + cols[0]))
+        fine_shape = (2 * (rows[-1] - rows[0]) + 1, 2 * (cols[-1] - cols[0]) + 1)
+
+        # Area halus = gabungan blok; simpul di tepi gabungan menjadi batas Dirichlet
+        fine_covered = prolong(covered[box].astype(float), (0, 0), (0, 0), fine_shape) > 0.999
+        padded = np.pad(fine_covered, 1)
+        interior = (padded[2:, 1:-1] & padded[:-2, 1:-1] & padded[1:-1, 2:] & padded[1:-1, :-2]
+                    & padded[2:, 2:] & padded[:-2, :-2] & padded[2:, :-2] & padded[:-2, 2:])
+        h = parent["h"] / 2
+        hierarchy.append({"origin": origin, "h": h, "active": fine_covered & interior, "covered": fine_covered,
+                          "values": prolong(values, parent["origin"], origin, fine_shape),
+                          "source": make_source(level, origin, fine_shape, h), "cache": {}})
+        child = hierarchy[-1]
+        child["values"] = solve_active_region(child["values"], child["active"], h, D, Sigma_a, child["source"])
+
+    # Simpul kasar yang berimpit dengan simpul aktif level halus diisi nilai injeksi dan tidak
+    # diselesaikan lagi di level kasar; pola simpul yang diselesaikan tetap sehingga LU bisa dipakai ulang
+    for level, node in enumerate(hierarchy):
+        node["solve"] = node["active"].copy()
+        node["cache"] = {}
+        if level + 1 < len(hierarchy):
+            child = hierarchy[level + 1]
+            offset = (child["origin"][0] // 2 - node["origin"][0], child["origin"][1] // 2 - node["origin"][1])
+            mask = child["active"][::2, ::2]
+            node["overlap"] = (slice(offset[0], offset[0] + mask.shape[0]), slice(offset[1], offset[1] + mask.shape[1]), mask)
+            node["solve"][node["overlap"][:2]] &= ~mask
+
+    # Siklus komposit: injeksi dari halus ke kasar, lalu selesaikan ulang dari kasar ke halus
+    for _ in range(cycles):
+        for level in range(len(hierarchy) - 2, -1, -1):
+            node, child = hierarchy[level], hierarchy[level + 1]
+            rows, cols, mask = node["overlap"]
+            node["values"][rows, cols][mask] = child["values"][::2, ::2][mask]
+        for level, node in enumerate(hierarchy):
+            if level > 0:
+                parent = hierarchy[level - 1]
+                boundary = prolong(parent["values"], parent["origin"], node["origin"], node["values"].shape)
+                node["values"] = np.where(node["active"], node["values"], boundary)
+            node["values"] = solve_active_region(node["values"], node["solve"], node["h"], D, Sigma_a,
+                                                 node["source"], node["cache"])
+
+    finest = hierarchy[-1]
+    return {
+        "levels": [{"origin": n["origin"], "h": n["h"], "values": n["values"], "active": n["active"]} for n in hierarchy],
+        "peak": finest["values"].max(),
+        "cells": int(sum(np.count_nonzero(n["active"]) for n in hierarchy)),
+    }
+
+# Fungsi untuk membangun hierarki grid multigrid geometrik untuk operator 5 titik
+# -D lap(phi) + Sigma_a phi. Simpul kasar I berimpit dengan simpul halus 2I; bila jumlah
+# interval halus ganjil, batas kasar terakhir terletak satu sel di luar batas halus.
+# Operator kasar didiskretkan ulang dengan spasi 2h dan Sigma_a hasil injeksi, dan level
+# paling kasar diselesaikan langsung dengan faktorisasi LU
+
+def build_multigrid(shape, D, Sigma_a, dx=1.0, coarsest=9):
+    Sigma_a = np.broadcast_to(np.asarray(Sigma_a, dtype=float), shape)
+    levels = []
+    h = dx
+    while True:
+        nx, ny = Sigma_a.shape
+        c = D / h**2
+        levels.append({"shape": (nx, ny), "h": h, "c": c, "diag": 4 * c + Sigma_a, "Sigma_a": Sigma_a})
+        if min(nx, ny) <= coarsest:
+            break
+        mx, my = nx // 2 + 1, ny // 2 + 1
+        injected = Sigma_a[::2, ::2]
+        Sigma_a = np.pad(injected, ((0, mx - injected.shape[0]), (0, my - injected.shape[1])), mode="edge")
+        h *= 2
+    last = levels[-1]
+    if min(last["shape"]) > 2:
+        last["lu"] = splu(assemble_diffusion_operator(np.full(last["shape"], float(D)), last["Sigma_a"], last["h"]))
+    return levels
+
+# Fungsi residu r = f - A phi pada simpul dalam (batas bernilai nol)
+
+def mg_residual(level, phi, f):
+    r = np.zeros_like(phi)
+    r[1:-1, 1:-1] = (f[1:-1, 1:-1] - level["diag"][1:-1, 1:-1] * phi[1:-1, 1:-1]
+                     + level["c"] * (phi[2:, 1:-1] + phi[:-2, 1:-1] + phi[1:-1, 2:] + phi[1:-1, :-2]))
+    return r
+
+# Fungsi penghalus Gauss-Seidel merah-hitam; urutan warna dibalik untuk post-smoothing
+# agar siklus V simetris dan dapat dipakai sebagai prekondisioner CG
+
+def mg_smooth(level, phi, f, sweeps, colors=(0, 1)):
+    nx, ny = phi.shape
+    c, diag = level["c"], level["diag"]
+    for _ in range(sweeps):
+        for color in colors:
+            for r in (1, 2):
+                s = 1 if (r + 1) % 2 == color else 2
+                ki, kj = len(range(r, nx - 1, 2)), len(range(s, ny - 1, 2))
+                if ki == 0 or kj == 0:
+                    continue
+                I, J = slice(r, r + 2 * ki - 1, 2), slice(s, s + 2 * kj - 1, 2)
+                neighbors = (phi[r + 1:r + 2 * ki:2, J] + phi[r - 1:r + 2 * ki - 2:2, J]
+                             + phi[I, s + 1:s + 2 * kj:2] + phi[I, s - 1:s + 2 * kj - 2:2])
+                phi[I, J] = (f[I, J] + c * neighbors) / diag[I, J]
+    return phi
+
+# Fungsi restriksi full weighting dari level halus ke level kasar berikutnya
+
+def mg_restrict(fine, coarse_shape):
+    mx, my = coarse_shape
+    padded = np.zeros((2 * mx - 1, 2 * my - 1))
+    padded[:fine.shape[0], :fine.shape[1]] = fine
+    p = padded
+    coarse = np.zeros(coarse_shape)
+    coarse[1:-1, 1:-1] = (4 * p[2:-2:2, 2:-2:2]
+                          + 2 * (p[1:-3:2, 2:-2:2] + p[3:-1:2, 2:-2:2] + p[2:-2:2, 1:-3:2] + p[2:-2:2, 3:-1:2])
+                          + p[1:-3:2, 1:-3:2] + p[1:-3:2, 3:-1:2] + p[3:-1:2, 1:-3:2] + p[3:-1:2, 3:-1:2]) / 16
+    return coarse
+
+# Fungsi interpolasi bilinear dari level kasar ke level halus (batas halus dibuat nol)
+
+def mg_prolong(coarse, fine_shape):
+    mx, my = coarse.shape
+    padded = np.zeros((2 * mx - 1, 2 * my - 1))
+    padded[::2, ::2] = coarse
+    padded[1::2, ::2] = (coarse[:-1, :] + coarse[1:, :]) / 2
+    padded[:, 1::2] = (padded[:, :-1:2] + padded[:, 2::2]) / 2
+    fine = padded[:fine_shape[0], :fine_shape[1]].copy()
+    fine[0, :] = fine[-1, :] = 0.0
+    fine[:, 0] = fine[:, -1] = 0.0
+    return fine
+
+# Fungsi satu siklus V multigrid (in-place pada phi) mulai dari level `index`
+
+def mg_vcycle(levels, phi, f, index=0, pre=2, post=2):
+    level = levels[index]
+    if index == len(levels) - 1:
+        if "lu" in level:
+            phi[1:-1, 1:-1] = level["lu"].solve(f[1:-1, 1:-1].ravel()).reshape(phi[1:-1, 1:-1].shape)
+        return phi
+    mg_smooth(level, phi, f, pre)
+    coarse_shape = levels[index + 1]["shape"]
+    residual = mg_restrict(mg_residual(level, phi, f), coarse_shape)
+    correction = mg_vcycle(levels, np.zeros(coarse_shape), residual, index + 1, pre, post)
+    phi += mg_prolong(correction, phi.shape)
+    mg_smooth(level, phi, f, post, colors=(1, 0))
+    return phi
+
+# Fungsi full multigrid: solusi level kasar diinterpolasi sebagai tebakan awal (warm start)
+# level yang lebih halus, lalu diperhalus dengan satu siklus V per level
+
+def mg_full(levels, f, pre=2, post=2):
+    sources = [f]
+    for level in levels[1:]:
+        sources.append(mg_restrict(sources[-1], level["shape"]))
+    phi = mg_vcycle(levels, np.zeros(levels[-1]["shape"]), sources[-1], len(levels) - 1)
+    for index in range(len(levels) - 2, -1, -1):
+        phi = mg_prolong(phi, levels[index]["shape"])
+        mg_vcycle(levels, phi, sources[index], index, pre, post)
+    return phi
+
+# Fungsi untuk menghitung flux steady dengan multigrid geometrik
+# method="vcycle": siklus V berulang; "fmg": warm start full multigrid lalu siklus V;
+# "pcg": conjugate gradient dengan satu siklus V sebagai prekondisioner (mulai dari FMG).
+# `initial` dapat berisi solusi sebelumnya sebagai tebakan awal (menggantikan FMG).
+# Toleransi berlaku untuk residu relatif ||S - A phi|| / ||S||
+
+def calculate_flux_multigrid(shape, D, Sigma_a, S, dx=1.0, method="pcg", tol=1e-8, max_iter=100,
+                             initial=None, levels=None):
+    start = time.perf_counter()
+    levels = levels or build_multigrid(shape, D, Sigma_a, dx)
+    f = np.zeros(shape)
+    f[1:-1, 1:-1] = S[1:-1, 1:-1]
+    f_norm = np.linalg.norm(f) or 1.0
+    if initial is not None:
+        phi = np.array(initial, dtype=float)
+        phi[0, :] = phi[-1, :] = 0.0
+        phi[:, 0] = phi[:, -1] = 0.0
+    elif method == "vcycle":
+        phi = np.zeros(shape)
+    else:
+        phi = mg_full(levels, f)
+    r = mg_residual(levels[0], phi, f)
+    residuals = [np.linalg.norm(r) / f_norm]
+    iterations = 0
+
+    if method == "pcg":
+        z = mg_vcycle(levels, np.zeros(shape), r)
+        p = z.copy()
+        rz = np.vdot(r, z)
+    while residuals[-1] > tol and iterations < max_iter:
+        PROFILER.count("steps")
+        if method == "pcg":
+            Ap = -mg_residual(levels[0], p, np.zeros(shape))
+            alpha = rz / np.vdot(p, Ap)
+            phi += alpha * p
+            r -= alpha * Ap
+            with PROFILER.phase("vcycle"):
+                z = mg_vcycle(levels, np.zeros(shape), r)
+            rz_new = np.vdot(r, z)
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+        else:
+            with PROFILER.phase("vcycle"):
+                mg_vcycle(levels, phi, f)
+            r = mg_residual(levels[0], phi, f)
+        iterations += 1
+        residuals.append(np.linalg.norm(r) / f_norm)
+
+    return {
+        "flux": phi,
+        "iterations": iterations,
+        "residuals": residuals,
+        "levels": len(levels),
+        "method": method,
+        "seconds": time.perf_counter() - start,
+    }
+
+# Fungsi untuk mengukur jumlah iterasi multigrid terhadap ukuran grid
+# Jumlah iterasi seharusnya hampir konstan (tidak bergantung ukuran grid)
+
+def benchmark_multigrid(sizes=(50, 100, 200, 500, 1000, 2000, 4000), D=1.0, Sigma_a=0.02, tol=1e-8):
+    results = []
+    for n in sizes:
+        S = np.zeros((n, n))
+        S[n // 2, n // 2] = 1.0
+        for method in ("vcycle", "fmg", "pcg"):
+            out = calculate_flux_multigrid((n, n), D, Sigma_a, S, method=method, tol=tol)
+            results.append({"size": n, "method": method, "iterations": out["iterations"],
+                            "residual": out["residuals"][-1], "seconds": out["seconds"]})
+            print(f"  {n:5d}x{n:<5d} {method:6s}: {out['iterations']:3d} iterasi, "
+                  f"residu {out['residuals'][-1]:.2e}, {out['seconds']:8.3f} s")
+    return results
+
+# Fungsi untuk membandingkan mesh adaptif dengan grid halus seragam (multigrid) untuk sumber titik
+# Puncak flux AMR dibandingkan dengan solusi seragam pada spasi yang sama; jumlah simpul aktif AMR
+# seharusnya tumbuh jauh lebih lambat daripada nx * ny
+
+def benchmark_amr(sizes=(129, 257, 513, 1025), D=1.0, Sigma_a=0.02, levels=3):
+    results = []
+    for n in sizes:
+        start = time.perf_counter()
+        amr = calculate_flux_amr((n, n), D, Sigma_a, levels=levels)
+        amr_seconds = time.perf_counter() - start
+        S = np.zeros((n, n))
+        S[n // 2, n // 2] = 1.0
+        uniform = calculate_flux_multigrid((n, n), D, Sigma_a, S)
+        peak = uniform["flux"].max()
+        results.append({"size": n, "amr_cells": amr["cells"], "amr_seconds": amr_seconds,
+                        "uniform_cells": (n - 2)**2, "uniform_seconds": uniform["seconds"],
+                        "peak_error": abs(amr["peak"] - peak) / peak})
+        print(f"  {n:5d}x{n:<5d} AMR: {amr['cells']:8d} simpul, {amr_seconds:7.3f} s   "
+              f"seragam: {(n - 2)**2:8d} simpul, {uniform['seconds']:7.3f} s   "
+              f"galat puncak {results[-1]['peak_error']:.2e}")
+    return results
+
 # Fungsi untuk animasi
 
 def update(frame, im, flux_list):
-    im.set_array(flux_list[frame])
+    with PROFILER.phase("render"):
+        im.set_array(flux_list[frame])
+    PROFILER.count("frames")
     return [im]
 
 # GUI Utama
@@ -36,10 +619,12 @@ def main():
     S = np.zeros((nx, ny))  # Sumber neutron (neutron/cm^3/s)
     S[nx//2, ny//2] = 1.0  # Sumber di pusat reaktor
 
-    flux = calculate_flux((nx, ny), D, Sigma_a, S)
+    with PROFILER.run("steady", shape=(nx, ny)):
+        solution = calculate_flux_multigrid((nx, ny), D, Sigma_a, S)
+        flux = solution["flux"]
 
-    # List untuk animasi (flux dari iterasi awal hingga akhir)
-    flux_list = [calculate_flux((nx, ny), D, Sigma_a, S, max_iter=i) for i in range(1, 50)]
+        # List untuk animasi (flux dari iterasi awal hingga akhir)
+        flux_list = [calculate_flux((nx, ny), D, Sigma_a, S, max_iter=i) for i in range(1, 50)]
 
     # GUI
     root = tk.Tk()
@@ -70,8 +655,56 @@ def main():
     ttk.Label(frame_params, text=f"Koefisien Difusi (D): {D} cm^2/s").pack(anchor=tk.W)
     ttk.Label(frame_params, text=f"Laju Absorbsi (Sigma_a): {Sigma_a[0, 0]} /cm").pack(anchor=tk.W)
     ttk.Label(frame_params, text=f"Sumber Neutron (S): {S[nx//2, ny//2]} neutron/cm^3/s").pack(anchor=tk.W)
+    ttk.Label(frame_params, text=(
+        f"Multigrid ({solution['method']}): {solution['iterations']} iterasi, "
+        f"residu {solution['residuals'][-1]:.1e}, {solution['seconds']:.3f} s"
+    )).pack(anchor=tk.W)
+
+    # Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+    PROFILER.status_bar(frame_params, pady=(10, 0))
+
+    show_two_group(root, (nx, ny), S)
 
     root.mainloop()
 
+# Jendela perbandingan flux cepat dan termal pada teras heterogen
+
+def show_two_group(root, shape, S):
+    labels, materials = build_core_layout(shape)
+    system = assemble_multigroup(labels, materials)
+    flux_groups = calculate_multigroup_flux(labels, materials, S, system=system)
+
+    window = tk.Toplevel(root)
+    window.title("Flux Dua Grup - Teras U-235 / Pu-239 / Th-232")
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+    for ax, flux_g, title in zip(axes, flux_groups, ["Grup Cepat", "Grup Termal"]):
+        im = ax.imshow(flux_g, cmap="hot", interpolation="nearest", origin="lower")
+        plt.colorbar(im, ax=ax, label="Flux Neutron (1/cm^2/s)")
+        ax.set_title(title)
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    # k-eff hanya dihitung saat diminta (iterasi daya penuh tidak dijalankan saat GUI dibuka)
+    criticality_label = ttk.Label(window, text="k-eff: belum dihitung")
+
+    def show_criticality():
+        criticality = calculate_k_eigenvalue(labels, materials, system=system)
+        # Rasio dominansi None jika iterasi konvergen sebelum rasio bisa diperkirakan
+        ratio = criticality["dominance_ratio"]
+        criticality_label.config(text=(
+            f"k-eff: {criticality['k']:.5f}   "
+            f"Rasio dominansi: {'-' if ratio is None else f'{ratio:.4f}'}   "
+            f"Iterasi luar: {criticality['outer_iterations']}   "
+            f"Waktu: {criticality['seconds']:.2f} s"
+        ))
+
+    ttk.Button(window, text="Hitung k-eff", command=show_criticality).pack(anchor=tk.W, padx=10, pady=(5, 0))
+    criticality_label.pack(anchor=tk.W, padx=10, pady=5)
+
 if __name__ == "__main__":
-    main()
+    if "--multigrid" in sys.argv:
+        benchmark_multigrid()
+    elif "--amr" in sys.argv:
+        benchmark_amr()
+    else:
+        main()
@@ -7,6 +7,8 @@ from matplotlib.animation import FuncAnimation
 import pandas as pd
 from matplotlib.animation import FFMpegWriter
 import os
+from phase_profiler import PROFILER
+from flux_diagnostics import empty_diagnostics, record_diagnostics
 
 # Path ke ffmpeg
 FFMPEG_PATH = r"D:\ace\Downloads\ffmpeg-2024-12-19-git-494c961379-full_build\bin\ffmpeg.exe"
@@ -15,11 +17,14 @@ os.environ["PATH"] += os.pathsep + os.path.dirname(FFMPEG_PATH)
 # Global variables
 flux = None
 flux_history = None
+flux_diagnostics = None  # Array diagnostik per langkah (total, puncak, centroid, kebocoran, perubahan)
 ani = None
 is_running = False
 
 # Fungsi untuk menghitung flux neutron
-def calculate_flux(grid_size, time_steps, D, Sigma_a, S):
+# Jika diagnostics (array dari empty_diagnostics(time_steps)) diberikan, diagnostik tiap langkah
+# diisi langsung setelah langkah dihitung, sehingga flux_history tidak perlu dipindai ulang
+def calculate_flux(grid_size, time_steps, D, Sigma_a, S, diagnostics=None):
     dx = 1.0  # Ukuran grid
     dt = 0.01  # Langkah waktu
     flux_history = []
@@ -27,19 +32,33 @@ def calculate_flux(grid_size, time_steps, D, Sigma_a, S):
     flux[int(grid_size / 2), int(grid_size / 2)] = 1.0  # Sumber neutron awal
 
     for _ in range(time_steps):
-        flux_new = np.copy(flux)
-        for i in range(1, grid_size - 1):
-            for j in range(1, grid_size - 1):
-                laplacian = (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1] - 4 * flux[i, j]) / dx**2
-                flux_new[i, j] += dt * (D * laplacian - Sigma_a * flux[i, j] + S)
-        flux = np.copy(flux_new)
-        flux_history.append(flux.copy())
+        PROFILER.count("steps")
+        with PROFILER.phase("copy"):
+            flux_new = np.copy(flux)
+        with PROFILER.phase("stencil"):
+            for i in range(1, grid_size - 1):
+                for j in range(1, grid_size - 1):
+                    laplacian = (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1] - 4 * flux[i, j]) / dx**2
+                    flux_new[i, j] += dt * (D * laplacian - Sigma_a * flux[i, j] + S)
+        if diagnostics is not None:
+            with PROFILER.phase("diagnostics"):
+                record_diagnostics(diagnostics[len(flux_history)], flux_new, flux, (D, D, D, D))
+        with PROFILER.phase("copy"):
+            flux = np.copy(flux_new)
+            flux_history.append(flux.copy())
     return flux, flux_history
 
 # Fungsi animasi
 def update(frame):
+    with PROFILER.phase("render"):
+        result = render_frame(frame)
+    PROFILER.count("frames")
+    return result
+
+def render_frame(frame):
     global flux_history
-    ax.clear()
+    with PROFILER.phase("clear"):
+        ax.clear()
     ax.set_title(f"Flux Neutron 2D (Frame: {frame})")
     ax.set_xlabel("X")
     ax.set_ylabel("Y")
@@ -71,7 +90,8 @@ def save_animation():
     if filepath:
         try:
             writer = FFMpegWriter(fps=20, metadata=dict(artist='Neutron Flux Simulation'), bitrate=1800)
-            ani.save(filepath, writer=writer)
+            with PROFILER.export("save_animation", filepath):
+                ani.save(filepath, writer=writer)
             messagebox.showinfo("Berhasil", f"Animasi disimpan di {filepath}")
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan animasi: {e}")
@@ -85,19 +105,22 @@ def save_data():
     filepath = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
     if filepath:
         df = pd.DataFrame(flux)
-        df.to_excel(filepath, index=False)
+        with PROFILER.export("save_data", filepath):
+            df.to_excel(filepath, index=False)
         messagebox.showinfo("Berhasil", f"Data disimpan di {filepath}")
 
 # Fungsi untuk menjalankan simulasi
 def run_simulation():
-    global flux, flux_history, grid_size, D, Sigma_a, S, time_steps
+    global flux, flux_history, flux_diagnostics, grid_size, D, Sigma_a, S, time_steps
     grid_size = int(grid_size_entry.get())
     D = float(D_entry.get())
     Sigma_a = float(Sigma_a_entry.get())
     S = float(S_entry.get())
     time_steps = int(time_steps_entry.get())
 
-    flux, flux_history = calculate_flux(grid_size, time_steps, D, Sigma_a, S)
+    with PROFILER.run("run_simulation", grid_size=grid_size, time_steps=time_steps):
+        flux_diagnostics = empty_diagnostics(time_steps)
+        flux, flux_history = calculate_flux(grid_size, time_steps, D, Sigma_a, S, diagnostics=flux_diagnostics)
     start_animation()
 
 # Fungsi untuk membuka GUI kedua
@@ -111,7 +134,7 @@ def plot_gui():
     plot_root.title("Plot Parameter Fisis")
 
     fig, ax = plt.subplots(1, 1, figsize=(6, 4))
-    ax.plot(np.arange(1, len(flux_history)+1), [np.sum(f) for f in flux_history], label="Total Flux")
+    ax.plot(np.arange(1, len(flux_history)+1), flux_diagnostics["total"], label="Total Flux")
     ax.set_title("Total Flux Neutron Seiring Waktu")
     ax.set_xlabel("Waktu (Langkah)")
     ax.set_ylabel("Total Flux")
@@ -168,4 +191,7 @@ fig, ax = plt.subplots(figsize=(6, 6))
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().grid(row=0, column=1)
 
+# Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+PROFILER.status_bar(root, row=1)
+
 root.mainloop()
@@ -2,10 +2,15 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import math
+import sys
+import time
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation, FFMpegWriter
 import random
+from phase_profiler import PROFILER
+from particle_decay import PARTICLE_CMAP, step_particles
 
 # Konstanta untuk bahan radioaktif
 radioactive_data = {
@@ -14,27 +19,25 @@ radioactive_data = {
     "Th-232": {"half_life": 1.41e10 * 365 * 24 * 3600, "mass_to_atoms": 2.40e21},
 }
 
-def decay_animation():
-    """Membuat animasi peluruhan partikel radioaktif dengan pergerakan acak yang lebih luas."""
-    material = material_var.get()
-    mass = float(mass_slider.get())
+def build_decay_figure(material, mass, seed=None):
+    """Membuat figur partikel beserta fungsi ``update`` per frame untuk satu run.
+
+    Tidak menyentuh widget Tk, sehingga update yang sama dipakai animasi GUI dan benchmark.
+    """
     num_particles = int(mass * 100)  # Jumlah partikel sesuai massa (arbitrary scaling)
     
     data = radioactive_data[material]
     half_life = data["half_life"]
     decay_constant = math.log(2) / half_life
     
-    # Posisi awal partikel
-    x_positions = [random.uniform(0, 1) for _ in range(num_particles)]
-    y_positions = [random.uniform(0, 1) for _ in range(num_particles)]
-    alive_status = [1] * num_particles  # 1 jika partikel masih hidup, 0 jika meluruh
-    
-    # Membuat tab animasi
-    for widget in plot_frame.winfo_children():
-        widget.destroy()
-    
-    notebook = ttk.Notebook(plot_frame)
-    notebook.pack(expand=True, fill="both")
+    # Posisi awal partikel dan buffer kerja, dialokasikan sekali
+    rng = np.random.default_rng(seed)
+    positions = rng.random((num_particles, 2))
+    alive = np.ones(num_particles, dtype=bool)  # True jika partikel masih hidup
+    state = np.ones(num_particles)  # Status numerik untuk colormap
+    step_buffer = np.empty((num_particles, 2))
+    draw_buffer = np.empty(num_particles)
+    decayed = np.empty(num_particles, dtype=bool)
     
     fig, ax = plt.subplots(figsize=(5, 5))
     ax.set_xlim(0, 1)
@@ -42,34 +45,38 @@ def decay_animation():
     ax.set_title(f"Animasi Peluruhan - {material}")
     ax.axis("off")
     
-    scatter = ax.scatter(x_positions, y_positions, c="blue", s=10, label="Partikel Aktif")
+    scatter = ax.scatter(positions[:, 0], positions[:, 1], c=state, cmap=PARTICLE_CMAP,
+                         vmin=0, vmax=1, s=10, label="Partikel Aktif")
     legend = ax.legend(loc="upper right")
     
     # Fungsi update untuk animasi
     def update(frame):
-        nonlocal alive_status, x_positions, y_positions
         decay_prob = decay_constant * frame / 200  # Probabilitas peluruhan per frame
-        
-        for i in range(num_particles):
-            if alive_status[i] == 1:
-                # Gerakan acak yang lebih luas untuk partikel aktif
-                x_positions[i] += random.uniform(-0.05, 0.05)
-                y_positions[i] += random.uniform(-0.05, 0.05)
-                
-                # Membatasi gerakan dalam batas (0, 1)
-                x_positions[i] = min(max(x_positions[i], 0), 1)
-                y_positions[i] = min(max(y_positions[i], 0), 1)
-                
-                # Partikel meluruh dengan probabilitas tertentu
-                if random.uniform(0, 1) < decay_prob:
-                    alive_status[i] = 0
-        
-        # Perbarui warna dan posisi partikel
-        colors = ["blue" if status == 1 else "gray" for status in alive_status]
-        scatter.set_offsets(list(zip(x_positions, y_positions)))
-        scatter.set_color(colors)
+        with PROFILER.phase("step"):
+            step_particles(positions, alive, decay_prob, rng, step_buffer, draw_buffer, decayed)
+        PROFILER.count("steps")
+
+        # Perbarui warna dan posisi partikel langsung dari array numerik
+        with PROFILER.phase("render"):
+            np.copyto(state, alive)
+            scatter.set_offsets(positions)
+            scatter.set_array(state)
+        PROFILER.count("frames")
         return scatter,
 
+    return fig, update
+
+def decay_animation():
+    """Membuat animasi peluruhan partikel radioaktif dengan pergerakan acak yang lebih luas."""
+    fig, update = build_decay_figure(material_var.get(), float(mass_slider.get()))
+
+    # Membuat tab animasi
+    for widget in plot_frame.winfo_children():
+        widget.destroy()
+    
+    notebook = ttk.Notebook(plot_frame)
+    notebook.pack(expand=True, fill="both")
+
     # Membuat animasi
     anim = FuncAnimation(fig, update, frames=200, interval=50, blit=True)
     
@@ -82,60 +89,151 @@ def decay_animation():
     
     return anim, fig
 
+def benchmark_update(num_particles=10000, frames=50):
+    """Membandingkan biaya per frame update berbasis list Python dan berbasis array.
+
+    Untuk tiap metode dicetak waktu rata-rata per frame dan rata-rata memori
+    puncak yang dialokasikan selama satu frame (``tracemalloc``, termasuk objek
+    sementara yang sudah dibebaskan di akhir frame). Kedua metode diukur oleh
+    ``measure`` yang sama: ``frames`` frame untuk waktu, lalu ``frames`` frame
+    lagi di bawah ``tracemalloc`` (agar overhead tracing tidak ikut terhitung
+    di waktu), masing-masing mencakup satu update penuh (langkah partikel,
+    penyiapan data, dan pembaruan scatter).
+    """
+    import tracemalloc
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    decay_prob = 0.01
+
+    def measure(frame_update):
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame_update()
+        elapsed = time.perf_counter() - start
+
+        peak_bytes = 0
+        tracemalloc.start()
+        try:
+            for _ in range(frames):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                frame_update()
+                peak_bytes += tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+        return elapsed / frames, peak_bytes / frames
+
+    def run_list():
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        x_positions = [random.uniform(0, 1) for _ in range(num_particles)]
+        y_positions = [random.uniform(0, 1) for _ in range(num_particles)]
+        alive_status = [1] * num_particles
+        scatter = ax.scatter(x_positions, y_positions, c="blue", s=10)
+
+        def frame_update():
+            for i in range(num_particles):
+                if alive_status[i] == 1:
+                    x_positions[i] = min(max(x_positions[i] + random.uniform(-0.05, 0.05), 0), 1)
+                    y_positions[i] = min(max(y_positions[i] + random.uniform(-0.05, 0.05), 0), 1)
+                    if random.uniform(0, 1) < decay_prob:
+                        alive_status[i] = 0
+            scatter.set_offsets(list(zip(x_positions, y_positions)))
+            scatter.set_color(["blue" if status == 1 else "gray" for status in alive_status])
+
+        return measure(frame_update)
+
+    def run_array():
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        rng = np.random.default_rng()
+        positions = rng.random((num_particles, 2))
+        alive = np.ones(num_particles, dtype=bool)
+        state = np.ones(num_particles)
+        step_buffer = np.empty((num_particles, 2))
+        draw_buffer = np.empty(num_particles)
+        decayed = np.empty(num_particles, dtype=bool)
+        scatter = ax.scatter(positions[:, 0], positions[:, 1], c=state, cmap=PARTICLE_CMAP, vmin=0, vmax=1, s=10)
+
+        def frame_update():
+            step_particles(positions, alive, decay_prob, rng, step_buffer, draw_buffer, decayed)
+            np.copyto(state, alive)
+            scatter.set_offsets(positions)
+            scatter.set_array(state)
+
+        return measure(frame_update)
+
+    print(f"Benchmark update peluruhan: {num_particles} partikel, {frames} frame")
+    for name, run in (("list Python", run_list), ("array NumPy", run_array)):
+        per_frame, peak_bytes = run()
+        print(f"{name:>12}: {per_frame * 1e3:8.3f} ms/frame, {peak_bytes / 1024:10.1f} KiB puncak/frame")
+
 def save_video(anim, fig):
     """Menyimpan animasi sebagai video (format MP4)."""
     writer = FFMpegWriter(fps=30, metadata=dict(artist='Matplotlib'), bitrate=1800)
     try:
         video_filename = "decay_animation.mp4"
-        anim.save(video_filename, writer=writer)
+        with PROFILER.export("save_video", video_filename):
+            anim.save(video_filename, writer=writer)
         messagebox.showinfo("Sukses", f"Video berhasil disimpan sebagai {video_filename}")
     except Exception as e:
         messagebox.showerror("Error", f"Gagal menyimpan video: {e}")
 
-# GUI
-root = tk.Tk()
-root.title("Simulasi Geiger-Muller Counter dengan Animasi Peluruhan")
-
-# Dropdown untuk bahan radioaktif
-material_var = tk.StringVar(value="U-235")
-material_label = tk.Label(root, text="Pilih Material Radioaktif:")
-material_label.pack()
-material_dropdown = ttk.Combobox(root, textvariable=material_var, values=list(radioactive_data.keys()))
-material_dropdown.pack()
-
-# Slider untuk massa bahan
-mass_label = tk.Label(root, text="Massa Bahan (gram):")
-mass_label.pack()
-mass_slider = tk.Scale(root, from_=0.1, to=100, resolution=0.1, orient="horizontal")
-mass_slider.pack()
-
-# Tombol untuk animasi
-def on_animation_button_click():
-    """Fungsi untuk memulai animasi dan menyimpan animasi ke dalam global dictionary."""
-    anim, fig = decay_animation()
-    global_animation["anim"] = anim
-    global_animation["fig"] = fig
-
-animation_button = tk.Button(root, text="Tampilkan Animasi Peluruhan", command=on_animation_button_click)
-animation_button.pack()
-
-# Tombol untuk menyimpan video
-def on_save_video_button_click():
-    """Fungsi untuk menyimpan video animasi."""
-    if "anim" in global_animation:
-        save_video(global_animation["anim"], global_animation["fig"])
-    else:
-        messagebox.showerror("Error", "Animasi belum ditampilkan. Silakan buat animasi terlebih dahulu.")
-
-save_video_button = tk.Button(root, text="Simpan Video", command=on_save_video_button_click)
-save_video_button.pack()
-
-# Frame untuk animasi dan plot
-plot_frame = tk.Frame(root)
-plot_frame.pack()
-
-# Global variable untuk menyimpan animasi
-global_animation = {}
-
-# Jalankan aplikasi
-root.mainloop()
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_update()
+        sys.exit()
+
+    # GUI
+    root = tk.Tk()
+    root.title("Simulasi Geiger-Muller Counter dengan Animasi Peluruhan")
+
+    # Dropdown untuk bahan radioaktif
+    material_var = tk.StringVar(value="U-235")
+    material_label = tk.Label(root, text="Pilih Material Radioaktif:")
+    material_label.pack()
+    material_dropdown = ttk.Combobox(root, textvariable=material_var, values=list(radioactive_data.keys()))
+    material_dropdown.pack()
+
+    # Slider untuk massa bahan
+    mass_label = tk.Label(root, text="Massa Bahan (gram):")
+    mass_label.pack()
+    mass_slider = tk.Scale(root, from_=0.1, to=100, resolution=0.1, orient="horizontal")
+    mass_slider.pack()
+
+    # Tombol untuk animasi
+    def on_animation_button_click():
+        """Fungsi untuk memulai animasi dan menyimpan animasi ke dalam global dictionary."""
+        anim, fig = decay_animation()
+        global_animation["anim"] = anim
+        global_animation["fig"] = fig
+
+    animation_button = tk.Button(root, text="Tampilkan Animasi Peluruhan", command=on_animation_button_click)
+    animation_button.pack()
+
+    # Tombol untuk menyimpan video
+    def on_save_video_button_click():
+        """Fungsi untuk menyimpan video animasi."""
+        if "anim" in global_animation:
+            save_video(global_animation["anim"], global_animation["fig"])
+        else:
+            messagebox.showerror("Error", "Animasi belum ditampilkan. Silakan buat animasi terlebih dahulu.")
+
+    save_video_button = tk.Button(root, text="Simpan Video", command=on_save_video_button_click)
+    save_video_button.pack()
+
+    # Frame untuk animasi dan plot
+    plot_frame = tk.Frame(root)
+    plot_frame.pack()
+
+    # Global variable untuk menyimpan animasi
+    global_animation = {}
+
+    # Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+    PROFILER.status_bar(root)
+
+    # Jalankan aplikasi
+    root.mainloop()
@@ -2,11 +2,19 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.animation import FuncAnimation
-import random
-from PIL import Image
+from matplotlib.animation import FuncAnimation, AbstractMovieWriter
+from matplotlib.patches import Rectangle
+from PIL import Image, GifImagePlugin
+from phase_profiler import PROFILER
+from particle_decay import PARTICLE_CMAP, step_particles
 
 # Konstanta untuk bahan radioaktif
 radioactive_data = {
@@ -15,10 +23,271 @@ radioactive_data = {
     "Th-232": {"half_life": 1.41e10 * 365 * 24 * 3600, "mass_to_atoms": 2.40e21, "dose_factor": 0.015},
 }
 
-def decay_animation():
-    """Membuat animasi peluruhan partikel radioaktif dan plotting dosis radiasi serapan."""
-    material = material_var.get()
-    mass = float(mass_slider.get())
+class DetectorIndex:
+    """Indeks grid seragam untuk menghitung partikel di dalam jendela detektor.
+
+    Kotak (0, 1) dibagi menjadi ``cells_per_side`` x ``cells_per_side`` sel.
+    Untuk setiap detektor, sel yang seluruhnya berada di dalam jendela dan sel
+    yang hanya terpotong tepinya dihitung sekali saat konstruksi. Hitungan
+    per sel diperbarui secara inkremental saat partikel berpindah sel, lalu
+    hit per detektor diperoleh dari jumlah sel dalam ditambah uji posisi eksak
+    hanya untuk partikel di sel tepi. Biaya per frame sebanding dengan jumlah
+    partikel ditambah jumlah sel detektor, bukan partikel x detektor.
+
+    Jendela boleh tumpang tindih: partikel di daerah tumpang tindih hanya
+    dihitung oleh detektor pertama (urutan masukan) yang memuatnya, sehingga
+    jumlah hit seluruh detektor menghitung setiap partikel paling banyak sekali.
+    """
+
+    def __init__(self, detectors, cells_per_side=64):
+        self.detectors = np.asarray(detectors, dtype=float).reshape(-1, 4)  # (x0, y0, x1, y1)
+        self.cells_per_side = cells_per_side
+        num_cells = cells_per_side * cells_per_side
+
+        # Detektor yang bersinggungan dengan tiap sel (urut), beserta status "seluruhnya di dalam"
+        touching = [[] for _ in range(num_cells)]
+        for d, (x0, y0, x1, y1) in enumerate(self.detectors):
+            ix0, ix1 = self._cell_range(x0, x1)
+            iy0, iy1 = self._cell_range(y0, y1)
+            fx0, fx1 = int(np.ceil(x0 * cells_per_side)), int(np.floor(x1 * cells_per_side))
+            fy0, fy1 = int(np.ceil(y0 * cells_per_side)), int(np.floor(y1 * cells_per_side))
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    touching[ix * cells_per_side + iy].append((d, fx0 <= ix < fx1 and fy0 <= iy < fy1))
+
+        # Sel yang detektor pertamanya memuat sel seluruhnya menjadi milik detektor itu;
+        # sel lain menjadi sel tepi dengan daftar kandidat sampai detektor penuh pertama
+        full_of_detector = [[] for _ in range(len(self.detectors))]
+        boundary_of_cell = [[] for _ in range(num_cells)]
+        for cell, candidates in enumerate(touching):
+            if not candidates:
+                continue
+            if candidates[0][1]:
+                full_of_detector[candidates[0][0]].append(cell)
+                continue
+            for d, full in candidates:
+                boundary_of_cell[cell].append(d)
+                if full:
+                    break
+        full_ptr = np.concatenate(([0], np.cumsum([len(cells) for cells in full_of_detector])))
+        self._full_cells = np.array([cell for cells in full_of_detector for cell in cells], dtype=np.intp)
+        self._full_ptr = np.array(full_ptr, dtype=np.intp)
+        self._boundary_ptr = np.concatenate(([0], np.cumsum([len(b) for b in boundary_of_cell]))).astype(np.intp)
+        self._boundary_detectors = np.array([d for b in boundary_of_cell for d in b], dtype=np.intp)
+        self._is_boundary = np.diff(self._boundary_ptr) > 0
+
+        self.cells = None
+        self.occupancy = np.zeros(num_cells, dtype=np.int64)  # Partikel aktif per sel
+
+    def _cell_range(self, lo, hi):
+        n = self.cells_per_side
+        return max(int(np.floor(lo * n)), 0), min(int(np.ceil(hi * n)) - 1, n - 1)
+
+    def _cell_of(self, positions):
+        ij = np.minimum((positions * self.cells_per_side).astype(np.intp), self.cells_per_side - 1)
+        return ij[:, 0] * self.cells_per_side + ij[:, 1]
+
+    def bind(self, positions, alive):
+        """Membangun indeks awal untuk posisi dan status partikel."""
+        self.cells = self._cell_of(positions)
+        self.occupancy[:] = np.bincount(self.cells[alive], minlength=len(self.occupancy))
+
+    def update(self, positions, alive, decayed):
+        """Memperbarui indeks setelah satu langkah dan mengembalikan hit per detektor.
+
+        ``alive`` dan ``decayed`` adalah status sesudah langkah; partikel yang
+        meluruh pada langkah ini dihitung sebagai hit pada posisi barunya.
+        """
+        num_cells = len(self.occupancy)
+        new_cells = self._cell_of(positions)
+        moved = (new_cells != self.cells) & (alive | decayed)
+        self.occupancy += np.bincount(new_cells[moved], minlength=num_cells)
+        self.occupancy -= np.bincount(self.cells[moved], minlength=num_cells)
+        self.occupancy -= np.bincount(new_cells[decayed], minlength=num_cells)
+        self.cells = new_cells
+
+        decayed_index = np.flatnonzero(decayed)
+        per_cell = np.bincount(new_cells[decayed_index], minlength=num_cells)
+        return self._count(per_cell, positions, decayed_index)
+
+    def counts(self, positions, alive):
+        """Jumlah partikel aktif di dalam setiap detektor."""
+        return self._count(self.occupancy, positions, np.flatnonzero(alive))
+
+    def _count(self, per_cell, positions, index):
+        # Kontribusi sel yang seluruhnya di dalam detektor
+        cumulative = np.concatenate(([0], np.cumsum(per_cell[self._full_cells])))
+        totals = cumulative[self._full_ptr[1:]] - cumulative[self._full_ptr[:-1]]
+
+        # Uji eksak hanya untuk partikel di sel tepi
+        index = index[self._is_boundary[self.cells[index]]]
+        if len(index):
+            cells = self.cells[index]
+            starts = self._boundary_ptr[cells]
+            lengths = self._boundary_ptr[cells + 1] - starts
+            particle = np.repeat(index, lengths)
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            detector = self._boundary_detectors[np.repeat(starts, lengths) + offsets]
+            x, y = positions[particle, 0], positions[particle, 1]
+            box = self.detectors[detector]
+            # Jendela setengah terbuka [x0, x1), kecuali tepi atas 1 yang ikut dihitung
+            inside = np.flatnonzero((x >= box[:, 0]) & ((x < box[:, 2]) | (box[:, 2] >= 1))
+                                    & (y >= box[:, 1]) & ((y < box[:, 3]) | (box[:, 3] >= 1)))
+            # Pasangan terurut per partikel lalu per detektor: ambil detektor pertama yang memuatnya
+            first = np.ones(len(inside), dtype=bool)
+            first[1:] = particle[inside[1:]] != particle[inside[:-1]]
+            totals = totals + np.bincount(detector[inside[first]], minlength=len(self.detectors))
+        return totals
+
+def parse_detectors(text):
+    """Membaca jendela detektor dari teks "x0,y0,x1,y1; ..." (default: seluruh kotak)."""
+    detectors = [[float(v) for v in part.split(",")] for part in text.split(";") if part.strip()]
+    if not detectors:
+        return [[0.0, 0.0, 1.0, 1.0]]
+    for x0, y0, x1, y1 in detectors:
+        if not (0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1):
+            raise ValueError(f"Jendela detektor tidak valid: {x0}, {y0}, {x1}, {y1}")
+    return detectors
+
+class DoseSeries:
+    """Deret waktu dosis kumulatif dengan tampilan terdesimasi per kolom piksel.
+
+    Data mentah disimpan di array prealokasi yang kapasitasnya digandakan
+    saat penuh. Untuk plotting, data juga diringkas secara inkremental ke
+    bucket min/max; bila jumlah bucket melebihi dua kali lebar plot dalam
+    piksel, bucket digabung berpasangan. Jumlah titik yang digambar tetap
+    terbatas sehingga biaya per frame konstan berapa pun panjang simulasinya.
+    """
+
+    def __init__(self, max_columns=500, capacity=1024):
+        self.max_columns = max_columns
+        self.size = 0
+        self._times = np.empty(capacity)
+        self._doses = np.empty(capacity)
+
+        max_buckets = 2 * max_columns + 1
+        self._bucket_size = 1
+        self._bucket_count = 0
+        self._bucket_fill = 0
+        self._min_t = np.empty(max_buckets)
+        self._min_y = np.empty(max_buckets)
+        self._max_t = np.empty(max_buckets)
+        self._max_y = np.empty(max_buckets)
+        self._plot_t = np.empty(2 * max_buckets)
+        self._plot_y = np.empty(2 * max_buckets)
+
+    @property
+    def times(self):
+        return self._times[:self.size]
+
+    @property
+    def doses(self):
+        return self._doses[:self.size]
+
+    @property
+    def last(self):
+        return self._doses[self.size - 1] if self.size else 0.0
+
+    def append(self, t, dose):
+        if self.size == len(self._times):
+            self._times = np.resize(self._times, 2 * self.size)
+            self._doses = np.resize(self._doses, 2 * self.size)
+        self._times[self.size] = t
+        self._doses[self.size] = dose
+        self.size += 1
+
+        if self._bucket_count == 0 or self._bucket_fill == self._bucket_size:
+            # Mulai bucket baru
+            b = self._bucket_count
+            self._min_t[b] = self._max_t[b] = t
+            self._min_y[b] = self._max_y[b] = dose
+            self._bucket_count += 1
+            self._bucket_fill = 1
+            if self._bucket_count == len(self._min_t):
+                self._merge_buckets()
+        else:
+            b = self._bucket_count - 1
+            if dose < self._min_y[b]:
+                self._min_t[b], self._min_y[b] = t, dose
+            if dose > self._max_y[b]:
+                self._max_t[b], self._max_y[b] = t, dose
+            self._bucket_fill += 1
+
+    def _merge_buckets(self):
+        """Menggabungkan bucket penuh berpasangan dan menggandakan ukuran bucket."""
+        n = self._bucket_count - 1  # Bucket terakhir baru berisi satu sampel
+        half = n // 2
+        for t_arr, y_arr, pick in ((self._min_t, self._min_y, np.less_equal),
+                                   (self._max_t, self._max_y, np.greater_equal)):
+            left_y, right_y = y_arr[0:n:2], y_arr[1:n:2]
+            take_left = pick(left_y, right_y)
+            t_arr[:half] = np.where(take_left, t_arr[0:n:2], t_arr[1:n:2])
+            y_arr[:half] = np.where(take_left, left_y, right_y)
+            t_arr[half] = t_arr[n]
+            y_arr[half] = y_arr[n]
+        self._bucket_count = half + 1
+        self._bucket_size *= 2
+
+    def plot_data(self):
+        """Mengembalikan titik (waktu, dosis) terdesimasi, urut waktu, untuk plotting."""
+        b = self._bucket_count
+        min_first = self._min_t[:b] <= self._max_t[:b]
+        self._plot_t[0:2 * b:2] = np.where(min_first, self._min_t[:b], self._max_t[:b])
+        self._plot_t[1:2 * b:2] = np.where(min_first, self._max_t[:b], self._min_t[:b])
+        self._plot_y[0:2 * b:2] = np.where(min_first, self._min_y[:b], self._max_y[:b])
+        self._plot_y[1:2 * b:2] = np.where(min_first, self._max_y[:b], self._min_y[:b])
+        return self._plot_t[:2 * b], self._plot_y[:2 * b]
+
+class StreamingGifWriter(AbstractMovieWriter):
+    """Writer GIF yang menulis frame satu per satu langsung ke file.
+
+    Setiap frame diambil dari buffer RGBA kanvas tanpa disalin, dikuantisasi
+    ke palet adaptif miliknya sendiri (tabel warna lokal GIF), lalu langsung
+    dikodekan ke file. Tidak ada frame yang disimpan di memori, sehingga
+    pemakaian memori tetap konstan berapa pun panjang animasinya.
+    """
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi)
+        self._file = open(outfile, "wb")
+        self._header_written = False
+        self._duration = int(round(1000 / self.fps))
+
+    def grab_frame(self, **savefig_kwargs):
+        canvas = self.fig.canvas
+        canvas.draw()
+        # View tanpa salinan ke buffer RGBA milik kanvas
+        buffer = canvas.buffer_rgba()
+        width, height = canvas.get_width_height(physical=True)
+        rgba = Image.frombuffer("RGBA", (width, height), buffer, "raw", "RGBA", 0, 1)
+        # Palet adaptif per frame: warna yang baru muncul di frame berikutnya tidak
+        # dipaksa ke palet frame pertama
+        frame = rgba.convert("RGB").quantize(colors=256)
+
+        if not self._header_written:
+            # Header GIF (ukuran layar dan palet global) ditulis dari frame pertama
+            header, _ = GifImagePlugin.getheader(frame, frame.palette.palette, {"loop": 0, "duration": self._duration})
+            for chunk in header:
+                self._file.write(chunk)
+            self._header_written = True
+
+        for chunk in GifImagePlugin.getdata(frame, duration=self._duration, include_color_table=True):
+            self._file.write(chunk)
+
+    def finish(self):
+        self._file.write(b";")  # Trailer GIF
+        self._file.close()
+
+DECAY_FRAMES = 200  # Jumlah frame animasi peluruhan (juga panjang GIF)
+ENSEMBLE_POLL_MS = 100  # Interval pemeriksaan ensemble yang berjalan di thread latar
+
+def build_decay_figures(material, mass, detectors, seed):
+    """Membuat figur partikel dan dosis beserta fungsi ``update`` untuk satu run.
+
+    State run (posisi, status, detektor, dosis) dibuat baru dari ``seed``, sehingga
+    memanggil fungsi ini lagi dengan seed yang sama menghasilkan run yang identik
+    tanpa menyentuh state animasi yang sedang tampil (dipakai untuk ekspor GIF).
+    """
     num_particles = int(mass * 100)  # Jumlah partikel sesuai massa (arbitrary scaling)
     
     data = radioactive_data[material]
@@ -26,20 +295,18 @@ def decay_animation():
     decay_constant = math.log(2) / half_life
     dose_factor = data["dose_factor"]  # Faktor dosis berdasarkan material
     
-    # Posisi awal partikel
-    x_positions = [random.uniform(0, 1) for _ in range(num_particles)]
-    y_positions = [random.uniform(0, 1) for _ in range(num_particles)]
-    alive_status = [1] * num_particles  # 1 jika partikel masih hidup, 0 jika meluruh
-    
-    cumulative_doses = [0]  # List untuk dosis serapan sepanjang waktu
-    time_steps = [0]  # List untuk waktu (dalam detik)
+    # Posisi awal partikel dan buffer kerja, dialokasikan sekali
+    rng = np.random.default_rng(seed)
+    positions = rng.random((num_particles, 2))
+    alive = np.ones(num_particles, dtype=bool)  # True jika partikel masih hidup
+    state = np.ones(num_particles)  # Status numerik untuk colormap
+    step_buffer = np.empty((num_particles, 2))
+    draw_buffer = np.empty(num_particles)
+    decayed = np.empty(num_particles, dtype=bool)
 
-    # Membuat tab animasi
-    for widget in plot_frame.winfo_children():
-        widget.destroy()
-    
-    notebook = ttk.Notebook(plot_frame)
-    notebook.pack(expand=True, fill="both")
+    # Hanya peluruhan di dalam jendela detektor yang dihitung sebagai dosis
+    detector_index = DetectorIndex(detectors)
+    detector_index.bind(positions, alive)
     
     # Plot animasi peluruhan
     fig, ax = plt.subplots(figsize=(5, 5))
@@ -48,8 +315,11 @@ def decay_animation():
     ax.set_title(f"Animasi Peluruhan - {material}")
     ax.axis("off")
     
-    scatter = ax.scatter(x_positions, y_positions, c="blue", s=10, label="Partikel Aktif")
+    scatter = ax.scatter(positions[:, 0], positions[:, 1], c=state, cmap=PARTICLE_CMAP,
+                         vmin=0, vmax=1, s=10, label="Partikel Aktif")
     legend = ax.legend(loc="upper right")
+    for x0, y0, x1, y1 in detectors:
+        ax.add_patch(Rectangle((x0, y0), x1 - x0, y1 - y0, fill=False, edgecolor="green", linestyle="--"))
     
     # Plot dosis radiasi serapan
     dose_fig, dose_ax = plt.subplots(figsize=(5, 4))
@@ -59,53 +329,69 @@ def decay_animation():
     
     dose_line, = dose_ax.plot([], [], label="Dosis Serapan", color="red")
     dose_ax.legend(loc="upper right")
-    
-    # Menyimpan setiap frame untuk membuat GIF
-    frames = []
+
+    # Dosis serapan sepanjang waktu (detik), didesimasi sesuai lebar plot
+    dose_series = DoseSeries(max_columns=int(dose_fig.get_figwidth() * dose_fig.dpi))
+    dose_series.append(0, 0.0)
+    dose_limits = [1.0, 1e-9]  # Batas sumbu x dan y yang sedang dipakai
 
     def update(frame):
-        nonlocal alive_status, x_positions, y_positions, cumulative_doses, time_steps
-        
         decay_prob = decay_constant * frame / 200  # Probabilitas peluruhan per frame
         
         # Menghitung dosis yang diterima manusia berdasarkan peluruhan partikel
-        dose_increment = 0
-        for i in range(num_particles):
-            if alive_status[i] == 1:
-                # Gerakan acak yang lebih luas untuk partikel aktif
-                x_positions[i] += random.uniform(-0.05, 0.05)
-                y_positions[i] += random.uniform(-0.05, 0.05)
-                
-                # Membatasi gerakan dalam batas (0, 1)
-                x_positions[i] = min(max(x_positions[i], 0), 1)
-                y_positions[i] = min(max(y_positions[i], 0), 1)
-                
-                # Partikel meluruh dengan probabilitas tertentu
-                if random.uniform(0, 1) < decay_prob:
-                    alive_status[i] = 0
-                    dose_increment += dose_factor * mass * 0.01
-
-        cumulative_doses.append(cumulative_doses[-1] + dose_increment)
-        time_steps.append(frame)
-
-        # Perbarui warna dan posisi partikel
-        colors = ["blue" if status == 1 else "gray" for status in alive_status]
-        scatter.set_offsets(list(zip(x_positions, y_positions)))
-        scatter.set_color(colors)
-        
-        # Update dosis serapan radiasi di plot
-        dose_line.set_data(time_steps, cumulative_doses)
-        dose_ax.relim()
-        dose_ax.autoscale_view()
+        with PROFILER.phase("step"):
+            step_particles(positions, alive, decay_prob, rng, step_buffer, draw_buffer, decayed)
+        with PROFILER.phase("detector"):
+            hits = detector_index.update(positions, alive, decayed)
+        PROFILER.count("steps")
+        dose_increment = hits.sum() * dose_factor * mass * 0.01
+
+        dose_series.append(frame, dose_series.last + dose_increment)
+
+        # Perbarui warna dan posisi partikel langsung dari array numerik
+        with PROFILER.phase("render"):
+            np.copyto(state, alive)
+            scatter.set_offsets(positions)
+            scatter.set_array(state)
 
-        # Simpan frame untuk GIF
-        fig.canvas.draw()
-        image = Image.frombytes("RGB", fig.canvas.get_width_height(), fig.canvas.tostring_rgb())
-        frames.append(image)
+            # Update dosis serapan radiasi di plot
+            dose_line.set_data(*dose_series.plot_data())
+        PROFILER.count("frames")
+
+        # Batas sumbu hanya diperbarui saat data melewatinya (digandakan),
+        # sehingga biayanya teramortisasi
+        if frame > dose_limits[0]:
+            dose_limits[0] = 2 * frame
+            dose_ax.set_xlim(0, dose_limits[0])
+        if dose_series.last > dose_limits[1]:
+            dose_limits[1] = 2 * dose_series.last
+            dose_ax.set_ylim(0, dose_limits[1])
+        dose_fig.canvas.draw_idle()
 
         return scatter, dose_line,
 
-    anim = FuncAnimation(fig, update, frames=200, interval=50, blit=True)
+    return fig, dose_fig, update
+
+def decay_animation():
+    """Membuat animasi peluruhan partikel radioaktif dan plotting dosis radiasi serapan.
+
+    Mengembalikan animasi, figurnya, dan ``replay()`` yang membangun salinan run yang
+    sama (seed sama) pada figur baru untuk ekspor.
+    """
+    material = material_var.get()
+    mass = float(mass_slider.get())
+    detectors = parse_detectors(detector_entry.get())
+    seed = np.random.SeedSequence()
+    fig, dose_fig, update = build_decay_figures(material, mass, detectors, seed)
+
+    # Membuat tab animasi
+    for widget in plot_frame.winfo_children():
+        widget.destroy()
+    
+    notebook = ttk.Notebook(plot_frame)
+    notebook.pack(expand=True, fill="both")
+
+    anim = FuncAnimation(fig, update, frames=DECAY_FRAMES, interval=50, blit=True)
 
     # Menambahkan ke GUI
     animation_tab = ttk.Frame(notebook)
@@ -120,57 +406,231 @@ def decay_animation():
     dose_canvas.draw()
     notebook.add(dose_tab, text="Dosis Serapan Radiasi")
 
-    return anim, frames
+    return anim, fig, lambda: build_decay_figures(material, mass, detectors, seed)
+
+def simulate_replica(material, mass, frames, seed_sequence, detectors=None):
+    """Menjalankan satu replika peluruhan tanpa GUI dengan aliran RNG sendiri.
+
+    Mengembalikan array per frame: fraksi partikel yang bertahan, jumlah
+    peluruhan, dan dosis kumulatif (dari hit detektor bila ``detectors`` diberikan).
+    """
+    num_particles = int(mass * 100)
+    data = radioactive_data[material]
+    decay_constant = math.log(2) / data["half_life"]
+    dose_per_decay = data["dose_factor"] * mass * 0.01
+
+    rng = np.random.default_rng(seed_sequence)
+    positions = rng.random((num_particles, 2))
+    alive = np.ones(num_particles, dtype=bool)
+    step_buffer = np.empty((num_particles, 2))
+    draw_buffer = np.empty(num_particles)
+    decayed = np.empty(num_particles, dtype=bool)
+
+    detector_index = None
+    if detectors is not None:
+        detector_index = DetectorIndex(detectors)
+        detector_index.bind(positions, alive)
+
+    surviving = np.empty(frames)
+    counts = np.empty(frames)
+    hits = np.empty(frames)
+    for frame in range(frames):
+        decay_prob = decay_constant * frame / 200
+        counts[frame] = step_particles(positions, alive, decay_prob, rng, step_buffer, draw_buffer, decayed)
+        surviving[frame] = np.count_nonzero(alive) / num_particles
+        if detector_index is not None:
+            hits[frame] = detector_index.update(positions, alive, decayed).sum()
+        else:
+            hits[frame] = counts[frame]
+    doses = np.cumsum(hits) * dose_per_decay
+    return surviving, counts, doses
+
+def _run_replica_batch(material, mass, frames, seed_sequences, detectors):
+    """Menjalankan sekumpulan replika di satu proses worker dan mencatat waktunya."""
+    start = time.perf_counter()
+    results = [simulate_replica(material, mass, frames, seq, detectors) for seq in seed_sequences]
+    return os.getpid(), time.perf_counter() - start, results
+
+def run_ensemble(material, mass, num_replicas=32, frames=200, num_workers=None, seed=None, confidence=0.95,
+                 detectors=None):
+    """Menjalankan ensemble Monte Carlo peluruhan secara paralel.
+
+    Setiap replika mendapat aliran RNG independen hasil ``SeedSequence.spawn``,
+    sehingga hasilnya identik bit demi bit untuk seed yang sama, berapa pun
+    jumlah worker. Replika direduksi menjadi rata-rata dan pita kepercayaan
+    per frame untuk fraksi bertahan, jumlah peluruhan, dan dosis kumulatif.
+    """
+    root_sequence = np.random.SeedSequence(seed)
+    children = root_sequence.spawn(num_replicas)
+    num_workers = min(num_workers or os.cpu_count() or 1, num_replicas)
+    batches = [children[i::num_workers] for i in range(num_workers)]
 
-def save_gif(frames):
-    """Menyimpan animasi sebagai GIF."""
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(_run_replica_batch, material, mass, frames, batch, detectors) for batch in batches]
+        outputs = [future.result() for future in futures]
+
+    # Susun ulang replika sesuai urutan spawn agar hasil tidak bergantung pada jumlah worker
+    replicas = [None] * num_replicas
+    for worker_index, (_, _, results) in enumerate(outputs):
+        for offset, result in enumerate(results):
+            replicas[worker_index + offset * num_workers] = result
+    stacked = np.array(replicas)  # (replika, besaran, frame)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    summary = {
+        "time": np.arange(frames),
+        "seed": root_sequence.entropy,
+        "num_replicas": num_replicas,
+        "confidence": confidence,
+        "worker_timing": [
+            {"pid": pid, "seconds": seconds, "replicas": len(results)}
+            for pid, seconds, results in outputs
+        ],
+    }
+    for index, name in enumerate(("surviving_fraction", "counts", "cumulative_dose")):
+        values = stacked[:, index, :]
+        mean = values.mean(axis=0)
+        std = values.std(axis=0, ddof=1) if num_replicas > 1 else np.zeros(frames)
+        half_width = z * std / np.sqrt(num_replicas)
+        summary[name] = {"mean": mean, "std": std, "lower": mean - half_width, "upper": mean + half_width}
+    return summary
+
+def show_ensemble(summary, material):
+    """Menampilkan rata-rata dan pita kepercayaan ensemble di jendela terpisah."""
+    window = tk.Toplevel(root)
+    window.title(f"Ensemble Monte Carlo - {material}")
+
+    fig, axes = plt.subplots(3, 1, figsize=(6, 8), sharex=True)
+    labels = {
+        "surviving_fraction": "Fraksi Bertahan",
+        "counts": "Jumlah Peluruhan",
+        "cumulative_dose": "Dosis Kumulatif (mSv)",
+    }
+    t = summary["time"]
+    for ax, (name, label) in zip(axes, labels.items()):
+        stats = summary[name]
+        ax.plot(t, stats["mean"], color="red", label="Rata-rata")
+        ax.fill_between(t, stats["lower"], stats["upper"], color="red", alpha=0.3,
+                        label=f"Selang kepercayaan {summary['confidence']:.0%}")
+        ax.set_ylabel(label)
+    axes[0].legend(loc="upper right")
+    axes[-1].set_xlabel("Waktu (detik)")
+    fig.tight_layout()
+
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    canvas.draw()
+
+    timing = ", ".join(f"PID {w['pid']}: {w['seconds']:.2f} s ({w['replicas']} replika)" for w in summary["worker_timing"])
+    tk.Label(window, text=f"{summary['num_replicas']} replika, seed {summary['seed']}\n{timing}",
+             wraplength=500, justify="left").pack()
+
+def save_gif(replay):
+    """Menyimpan animasi sebagai GIF.
+
+    ``replay()`` membangun ulang run yang tampil dari seed yang sama pada figur
+    terpisah, jadi ekspor tidak memajukan atau mengubah state animasi di layar.
+    Frame hanya ditangkap selama ekspor dan dialirkan langsung ke encoder GIF,
+    sehingga animasi yang hanya ditampilkan tidak menumpuk frame di memori.
+    """
     try:
         gif_filename = "decay_animation.gif"
-        frames[0].save(
-            gif_filename,
-            save_all=True,
-            append_images=frames[1:],
-            optimize=False,
-            duration=100,
-            loop=0
-        )
+        fig, dose_fig, update = replay()
+        try:
+            with PROFILER.export("save_gif", gif_filename):
+                FuncAnimation(fig, update, frames=DECAY_FRAMES).save(gif_filename, writer=StreamingGifWriter(fps=10))
+        finally:
+            plt.close(fig)
+            plt.close(dose_fig)
         messagebox.showinfo("Sukses", f"Animasi berhasil disimpan sebagai {gif_filename}")
     except Exception as e:
         messagebox.showerror("Error", f"Gagal menyimpan animasi: {e}")
 
-# GUI
-root = tk.Tk()
-root.title("Simulasi Geiger-Muller Counter dengan Animasi Peluruhan")
+if __name__ == "__main__":
+    # GUI
+    root = tk.Tk()
+    root.title("Simulasi Geiger-Muller Counter dengan Animasi Peluruhan")
+
+    material_var = tk.StringVar(value="U-235")
+    material_label = tk.Label(root, text="Pilih Material Radioaktif:")
+    material_label.pack()
+    material_dropdown = ttk.Combobox(root, textvariable=material_var, values=list(radioactive_data.keys()))
+    material_dropdown.pack()
+
+    mass_label = tk.Label(root, text="Massa Bahan (gram):")
+    mass_label.pack()
+    mass_slider = tk.Scale(root, from_=0.1, to=100, resolution=0.1, orient="horizontal")
+    mass_slider.pack()
+
+    detector_label = tk.Label(root, text="Jendela Detektor (x0,y0,x1,y1; ...), kosong = seluruh area:")
+    detector_label.pack()
+    detector_entry = ttk.Entry(root, width=40)
+    detector_entry.pack()
+
+    def on_animation_button_click():
+        global_animation["anim"], global_animation["fig"], global_animation["replay"] = decay_animation()
+
+    animation_button = tk.Button(root, text="Tampilkan Animasi Peluruhan", command=on_animation_button_click)
+    animation_button.pack()
+
+    def on_save_gif_button_click():
+        if "anim" in global_animation:
+            save_gif(global_animation["replay"])
+        else:
+            messagebox.showerror("Error", "Animasi belum dibuat.")
+
+    save_gif_button = tk.Button(root, text="Simpan Animasi (GIF)", command=on_save_gif_button_click)
+    save_gif_button.pack()
+
+    replicas_label = tk.Label(root, text="Jumlah Replika Ensemble:")
+    replicas_label.pack()
+    replicas_entry = ttk.Entry(root)
+    replicas_entry.insert(0, "32")
+    replicas_entry.pack()
 
-material_var = tk.StringVar(value="U-235")
-material_label = tk.Label(root, text="Pilih Material Radioaktif:")
-material_label.pack()
-material_dropdown = ttk.Combobox(root, textvariable=material_var, values=list(radioactive_data.keys()))
-material_dropdown.pack()
+    # Ensemble dijalankan di thread latar agar GUI tetap responsif; hasilnya diambil
+    # oleh poll() di thread Tk melalui root.after
+    def on_ensemble_button_click():
+        material = material_var.get()
+        try:
+            num_replicas = int(replicas_entry.get())
+            mass = float(mass_slider.get())
+            detectors = parse_detectors(detector_entry.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Input tidak valid: {e}")
+            return
+        outcome = {}
 
-mass_label = tk.Label(root, text="Massa Bahan (gram):")
-mass_label.pack()
-mass_slider = tk.Scale(root, from_=0.1, to=100, resolution=0.1, orient="horizontal")
-mass_slider.pack()
+        def produce():
+            try:
+                outcome["summary"] = run_ensemble(material, mass, num_replicas=num_replicas, detectors=detectors)
+            except Exception as e:
+                outcome["error"] = e
 
-def on_animation_button_click():
-    global_animation["anim"], global_animation["frames"] = decay_animation()
+        def poll():
+            if ensemble_thread.is_alive():
+                root.after(ENSEMBLE_POLL_MS, poll)
+                return
+            ensemble_button.config(state="normal", text="Jalankan Ensemble Monte Carlo")
+            if "error" in outcome:
+                messagebox.showerror("Error", f"Gagal menjalankan ensemble: {outcome['error']}")
+            else:
+                show_ensemble(outcome["summary"], material)
 
-animation_button = tk.Button(root, text="Tampilkan Animasi Peluruhan", command=on_animation_button_click)
-animation_button.pack()
+        ensemble_button.config(state="disabled", text=f"Ensemble berjalan ({num_replicas} replika)...")
+        ensemble_thread = threading.Thread(target=produce, daemon=True)
+        ensemble_thread.start()
+        root.after(ENSEMBLE_POLL_MS, poll)
 
-def on_save_gif_button_click():
-    if "frames" in global_animation:
-        save_gif(global_animation["frames"])
-    else:
-        messagebox.showerror("Error", "Animasi belum dibuat.")
+    ensemble_button = tk.Button(root, text="Jalankan Ensemble Monte Carlo", command=on_ensemble_button_click)
+    ensemble_button.pack()
 
-save_gif_button = tk.Button(root, text="Simpan Animasi (GIF)", command=on_save_gif_button_click)
-save_gif_button.pack()
+    plot_frame = tk.Frame(root)
+    plot_frame.pack()
 
-plot_frame = tk.Frame(root)
-plot_frame.pack()
+    global_animation = {}
 
-global_animation = {}
+    # Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+    PROFILER.status_bar(root)
 
-root.mainloop()
+    root.mainloop()
@@ -6,6 +6,9 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation, FFMpegWriter
 import pandas as pd
 import os
+from phase_profiler import PROFILER
+from flux_diagnostics import empty_diagnostics, record_diagnostics
+from virtual_table import VirtualTable
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 
@@ -16,6 +19,7 @@ os.environ["PATH"] += os.pathsep + os.path.dirname(FFMPEG_PATH)
 # Global variables
 flux = None
 flux_history = None
+flux_diagnostics = None  # Array diagnostik per langkah (total, puncak, centroid, kebocoran, perubahan)
 ani = None
 is_running = False
 regression_model = None
@@ -24,7 +28,9 @@ accuracy_value = None
 colorbar = None
 
 # Fungsi untuk menghitung flux neutron
-def calculate_flux(grid_size, time_steps, D, Sigma_a, S):
+# Jika diagnostics (array dari empty_diagnostics(time_steps)) diberikan, diagnostik tiap langkah
+# diisi langsung setelah langkah dihitung, sehingga flux_history tidak perlu dipindai ulang
+def calculate_flux(grid_size, time_steps, D, Sigma_a, S, diagnostics=None):
     dx = 1.0  # Ukuran grid
     dt = 0.01  # Langkah waktu
     flux_history = []
@@ -32,24 +38,38 @@ def calculate_flux(grid_size, time_steps, D, Sigma_a, S):
     flux[int(grid_size / 2), int(grid_size / 2)] = 1.0  # Sumber neutron awal
 
     for _ in range(time_steps):
-        flux_new = np.copy(flux)
-        for i in range(1, grid_size - 1):
-            for j in range(1, grid_size - 1):
-                laplacian = (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1] - 4 * flux[i, j]) / dx**2
-                flux_new[i, j] += dt * (D * laplacian - Sigma_a * flux[i, j] + S)
-        flux = np.copy(flux_new)
-        flux_history.append(flux.copy())
+        PROFILER.count("steps")
+        with PROFILER.phase("copy"):
+            flux_new = np.copy(flux)
+        with PROFILER.phase("stencil"):
+            for i in range(1, grid_size - 1):
+                for j in range(1, grid_size - 1):
+                    laplacian = (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1] - 4 * flux[i, j]) / dx**2
+                    flux_new[i, j] += dt * (D * laplacian - Sigma_a * flux[i, j] + S)
+        if diagnostics is not None:
+            with PROFILER.phase("diagnostics"):
+                record_diagnostics(diagnostics[len(flux_history)], flux_new, flux, (D, D, D, D))
+        with PROFILER.phase("copy"):
+            flux = np.copy(flux_new)
+            flux_history.append(flux.copy())
     return flux, flux_history
 
 # Fungsi untuk memperbarui tampilan animasi
 def update_animation(frame):
+    with PROFILER.phase("render"):
+        result = render_frame(frame)
+    PROFILER.count("frames")
+    return result
+
+def render_frame(frame):
     global colorbar
-    ax.clear()
+    with PROFILER.phase("clear"):
+        ax.clear()
     im = ax.imshow(flux_history[frame], cmap='viridis', origin='lower', interpolation='none')
     ax.set_title(f"Flux Neutron pada Langkah Waktu {frame + 1}")
     ax.set_xlabel("Posisi X")
     ax.set_ylabel("Posisi Y")
-    im.set_clim(vmin=0, vmax=np.max(flux_history[frame]))  # Update batas warna
+    im.set_clim(vmin=0, vmax=flux_diagnostics["peak"][frame])  # Update batas warna
     if colorbar is None:
         cbar_ax = fig.add_axes([0.92, 0.1, 0.03, 0.8])  # Posisi colorbar
         colorbar = plt.colorbar(im, cax=cbar_ax)
@@ -81,7 +101,8 @@ def save_animation():
     if filepath:
         try:
             writer = FFMpegWriter(fps=20, metadata=dict(artist='Neutron Flux Simulation'), bitrate=1800)
-            ani.save(filepath, writer=writer)
+            with PROFILER.export("save_animation", filepath):
+                ani.save(filepath, writer=writer)
             messagebox.showinfo("Berhasil", f"Animasi disimpan di {filepath}")
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan animasi: {e}")
@@ -95,19 +116,22 @@ def save_data():
     filepath = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
     if filepath:
         df = pd.DataFrame(flux)
-        df.to_excel(filepath, index=False)
+        with PROFILER.export("save_data", filepath):
+            df.to_excel(filepath, index=False)
         messagebox.showinfo("Berhasil", f"Data disimpan di {filepath}")
 
 # Fungsi untuk menjalankan simulasi
 def run_simulation():
-    global flux, flux_history, grid_size, D, Sigma_a, S, time_steps
+    global flux, flux_history, flux_diagnostics, grid_size, D, Sigma_a, S, time_steps
     grid_size = int(grid_size_entry.get())
     D = float(D_entry.get())
     Sigma_a = float(Sigma_a_entry.get())
     S = float(S_entry.get())
     time_steps = int(time_steps_entry.get())
 
-    flux, flux_history = calculate_flux(grid_size, time_steps, D, Sigma_a, S)
+    with PROFILER.run("run_simulation", grid_size=grid_size, time_steps=time_steps):
+        flux_diagnostics = empty_diagnostics(time_steps)
+        flux, flux_history = calculate_flux(grid_size, time_steps, D, Sigma_a, S, diagnostics=flux_diagnostics)
     start_animation()
 
 # Fungsi untuk melatih model regresi linear dan menampilkan GUI tambahan
@@ -118,12 +142,13 @@ def train_regression_model():
         return
 
     # Menyiapkan data untuk regresi
-    total_flux = [np.sum(frame) for frame in flux_history]
+    total_flux = flux_diagnostics["total"]
     time_steps = np.arange(len(total_flux)).reshape(-1, 1)
     
     # Membuat model regresi linear
     regression_model = LinearRegression()
-    regression_model.fit(time_steps, total_flux)
+    with PROFILER.phase("regression"):
+        regression_model.fit(time_steps, total_flux)
 
     # Prediksi menggunakan model
     flux_predictions = regression_model.predict(time_steps)
@@ -152,20 +177,10 @@ def display_results(total_flux, flux_predictions, mse, accuracy):
     canvas_result = FigureCanvasTkAgg(fig_result, master=result_window)
     canvas_result.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
 
-    # Tabel
-    table_frame = ttk.Frame(result_window)
-    table_frame.grid(row=0, column=1, padx=10, pady=10)
-
-    columns = ["Waktu", "Flux Aktual", "Flux Prediksi"]
-    table = ttk.Treeview(table_frame, columns=columns, show="headings")
-    for col in columns:
-        table.heading(col, text=col)
-        table.column(col, width=100, anchor="center")
-
-    for i, (actual, predicted) in enumerate(zip(total_flux, flux_predictions)):
-        table.insert("", "end", values=(i, f"{actual:.2f}", f"{predicted:.2f}"))
-
-    table.grid(row=0, column=0)
+    # Tabel tervirtualisasi: hanya baris yang terlihat diformat dari array
+    table = VirtualTable(result_window, {"Waktu": np.arange(len(total_flux)), "Flux Aktual": total_flux,
+                                         "Flux Prediksi": flux_predictions}, ["{:d}", "{:.2f}", "{:.2f}"])
+    table.grid(row=0, column=1, padx=10, pady=10)
 
     # Menampilkan MSE dan akurasi
     stats_frame = ttk.Frame(result_window)
@@ -220,4 +235,7 @@ fig, ax = plt.subplots(figsize=(6, 6))
 canvas = FigureCanvasTkAgg(fig, master=root)
 canvas.get_tk_widget().grid(row=0, column=1)
 
+# Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+PROFILER.status_bar(root, row=1)
+
 root.mainloop()
@@ -6,8 +6,21 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation, FFMpegWriter
 import pandas as pd
 import os
+import sys
+import math
+import shutil
+import tempfile
+import time
+import queue
+import threading
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
+from phase_profiler import PROFILER
+from flux_diagnostics import DIAGNOSTIC_DTYPE, empty_diagnostics, boundary_weights, record_diagnostics, ProbeSet
+from frame_pyramid import FramePyramid
+from virtual_table import VirtualTable
+from flux_surrogate import RunDatabase, FluxSurrogate, sweep_parameters
+from core_materials import material_data, build_core_layout, material_properties, face_coefficients
 
 # Path ke ffmpeg
 FFMPEG_PATH = r"D:\ace\Downloads\ffmpeg-2024-12-19-git-494c961379-full_build\bin\ffmpeg.exe"
@@ -16,76 +29,714 @@ os.environ["PATH"] += os.pathsep + os.path.dirname(FFMPEG_PATH)
 # Global variables
 flux = None
 flux_history = None
-ani = None
-is_running = False
+flux_diagnostics = None  # Array diagnostik per langkah (flux_diagnostics.DIAGNOSTIC_DTYPE)
+flux_probes = None  # ProbeSet: deret waktu titik detektor dan integral zona
+history_steps = None  # Indeks baris flux_diagnostics untuk tiap frame flux_history
+step_offset = 0  # Langkah absolut baris pertama flux_diagnostics (> 0 setelah resume tanpa riwayat disk)
+simulation_thread = None  # Thread produsen run live yang sedang berjalan
+playback = None  # PlaybackController untuk flux_history
+frame_pyramid = None  # FramePyramid: level resolusi rendah flux_history untuk scrubbing dan thumbnail
+temp_history_path = None  # File memmap riwayat sementara milik run saat ini (dihapus saat riwayat dilepas)
+run_database = None  # RunDatabase hasil run untuk surrogate (dimuat saat pertama dipakai)
+surrogate = None  # FluxSurrogate terlatih untuk prediksi what-if
 regression_model = None
 mse_value = None
 accuracy_value = None
 colorbar = None
 
+# Fungsi untuk membuat probe bawaan GUI: titik pusat dan titik seperempat grid, ditambah
+# integral tiap zona bahan bakar pada teras heterogen atau persegi tengah pada grid seragam
+def default_probes(grid_size, material_map=None):
+    center = grid_size // 2
+    probes = {"Titik Pusat": (center, center), "Titik Seperempat": (grid_size // 4, grid_size // 4)}
+    if material_map is not None:
+        labels, materials = material_map
+        for index, name in enumerate(materials[2:], start=2):
+            if np.any(labels == index):
+                probes[f"Zona {name}"] = labels == index
+    else:
+        quarter = grid_size // 4
+        probes["Persegi Tengah"] = (quarter, grid_size - quarter, quarter, grid_size - quarter)
+    return probes
+
+# Fungsi untuk menghitung koefisien stencil heterogen sekali per layout
+# Koefisien difusi di tiap muka sel memakai rata-rata harmonik D kedua sel, lalu
+# seluruh faktor dt/dx^2, suku diagonal, dan sumber digabung ke array siap pakai
+def precompute_coefficients(labels, materials, dt, dx, table=material_data):
+    props = material_properties(labels, materials, table)
+    coeffs = {key: dt * value for key, value in face_coefficients(props["D"], dx).items()}
+    coeffs["diag"] = (1 - dt * props["Sigma_a"][1:-1, 1:-1]
+                      - (coeffs["ip"] + coeffs["im"] + coeffs["jp"] + coeffs["jm"]))
+    coeffs["src"] = dt * props["S"][1:-1, 1:-1]
+    return coeffs
+
+# Fungsi untuk satu langkah stencil difusi pada baris [row_start, row_stop) bagian dalam grid
+def stencil_rows(flux, flux_new, row_start, row_stop, D, Sigma_a, S, dt, dx):
+    center = flux[row_start:row_stop, 1:-1]
+    laplacian = (flux[row_start+1:row_stop+1, 1:-1] + flux[row_start-1:row_stop-1, 1:-1]
+                 + flux[row_start:row_stop, 2:] + flux[row_start:row_stop, :-2] - 4 * center) / dx**2
+    flux_new[row_start:row_stop, 1:-1] = center + dt * (D * laplacian - Sigma_a * center + S)
+
+# Fungsi untuk satu langkah stencil heterogen dengan koefisien yang sudah dihitung
+def stencil_rows_material(flux, flux_new, row_start, row_stop, coeffs):
+    rows = slice(row_start - 1, row_stop - 1)  # Koefisien hanya mencakup sel bagian dalam
+    flux_new[row_start:row_stop, 1:-1] = (
+        coeffs["diag"][rows] * flux[row_start:row_stop, 1:-1]
+        + coeffs["ip"][rows] * flux[row_start+1:row_stop+1, 1:-1]
+        + coeffs["im"][rows] * flux[row_start-1:row_stop-1, 1:-1]
+        + coeffs["jp"][rows] * flux[row_start:row_stop, 2:]
+        + coeffs["jm"][rows] * flux[row_start:row_stop, :-2]
+        + coeffs["src"][rows]
+    )
+
+# Fungsi untuk menjalankan stencil secara paralel pada tile baris
+# Setiap thread memiliki satu tile baris dan membaca baris halo tetangganya langsung dari
+# buffer bersama; satu barrier per langkah waktu menjamin halo sudah lengkap sebelum dibaca.
+# Operasi NumPy melepas GIL sehingga tile dihitung di core yang berbeda.
+def run_tiled_stencil(buffers, time_steps, kernel, num_workers, on_step=None):
+    grid_size = buffers[0].shape[0]
+    tiles = [(int(rows[0]), int(rows[-1]) + 1)
+             for rows in np.array_split(np.arange(1, grid_size - 1), num_workers) if len(rows)]
+    step = [0]
+
+    def finish_step():
+        step[0] += 1
+        if on_step is not None:
+            on_step(buffers[step[0] % 2], buffers[(step[0] + 1) % 2])
+
+    barrier = threading.Barrier(len(tiles), action=finish_step)
+
+    def worker(row_start, row_stop):
+        for n in range(time_steps):
+            with PROFILER.phase("stencil"):
+                kernel(buffers[n % 2], buffers[(n + 1) % 2], row_start, row_stop)
+            with PROFILER.phase("barrier"):
+                barrier.wait()
+
+    threads = [threading.Thread(target=worker, args=tile) for tile in tiles]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return buffers[time_steps % 2]
+
+# Fungsi untuk membuat kernel stencil dengan presisi dtype (float64 atau float32)
+# Parameter skalar dan koefisien material dikonversi ke dtype agar seluruh stencil
+# berjalan pada presisi tersebut
+def make_kernel(D, Sigma_a, S, dt, dx, material_map=None, dtype=np.float64):
+    if material_map is not None:
+        coeffs = {key: value.astype(dtype) for key, value in precompute_coefficients(*material_map, dt, dx).items()}
+        return lambda f, f_new, r0, r1: stencil_rows_material(f, f_new, r0, r1, coeffs)
+    D, Sigma_a, S, dt, dx = (dtype(value) for value in (D, Sigma_a, S, dt, dx))
+    return lambda f, f_new, r0, r1: stencil_rows(f, f_new, r0, r1, D, Sigma_a, S, dt, dx)
+
+# Fungsi untuk menyimpan checkpoint solver (flux saat ini, indeks langkah, parameter) ke file .npz
+# Penulisan atomik: data ditulis ke file sementara di folder yang sama, di-fsync, lalu
+# os.replace menggantikan checkpoint lama sehingga file tidak pernah tertinggal setengah jadi
+def save_checkpoint(path, flux, step, params):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        np.savez_compressed(f, flux=flux, step=step, **params)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+# Fungsi untuk membaca checkpoint; mengembalikan (flux, step, params)
+def load_checkpoint(path):
+    with np.load(path) as data:
+        params = {key: data[key] for key in data.files if key not in ("flux", "step")}
+        return data["flux"], int(data["step"]), params
+
+SHADOW_WINDOW = 10  # Langkah maksimum yang dijalankan ulang dalam float64 per cek bayangan
+# Pilihan presisi GUI: (dtype, cek bayangan float64); cek bayangan hanya jika dipilih pengguna
+PRECISIONS = {"float64": (np.float64, False), "float32": (np.float32, False),
+              "float32 (cek f64)": (np.float32, True)}
+
+# Fungsi untuk memilih jarak antar cek bayangan: sekitar 20 cek per run
+def shadow_interval(time_steps):
+    return max(time_steps // 20, 1)
+
+# Fungsi untuk panjang jendela re-run float64: paling banyak 1/10 jarak antar cek
+def shadow_window(shadow_every):
+    return max(min(SHADOW_WINDOW, shadow_every // 10), 1)
+
+# Fungsi untuk membuka (atau membuat) riwayat flux di disk sebagai memmap .npy berukuran
+# (time_steps, grid_size, grid_size). Riwayat yang sudah ada dipakai ulang; jika panjangnya tidak
+# sama dengan time_steps, keep_steps langkah pertamanya disalin ke file baru sepanjang time_steps
+# (via os.replace), sehingga riwayat selalu sepanjang diagnostik dan probe run ini
+def open_history(path, time_steps, grid_size, dtype, keep_steps=0):
+    shape = (time_steps, grid_size, grid_size)
+    if keep_steps and os.path.exists(path):
+        history = np.lib.format.open_memmap(path, mode="r+")
+        if history.shape[1:] != shape[1:] or history.dtype != np.dtype(dtype):
+            raise ValueError("Riwayat di disk tidak cocok dengan parameter simulasi.")
+        if history.shape[0] == time_steps:
+            return history
+        temp_path = path + ".tmp.npy"
+        resized = np.lib.format.open_memmap(temp_path, mode="w+", dtype=dtype, shape=shape)
+        keep_steps = min(keep_steps, time_steps)
+        resized[:keep_steps] = history[:keep_steps]
+        resized.flush()
+        del resized, history
+        os.replace(temp_path, path)
+        return np.lib.format.open_memmap(path, mode="r+")
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
 # Fungsi untuk menghitung flux neutron
-def calculate_flux(grid_size, time_steps, D, Sigma_a, S):
+# Jika material_map (labels, materials) diberikan, D, Sigma_a, dan S skalar diabaikan
+# dan sifat tiap sel diambil dari material_data.
+# dtype=np.float32 menjalankan stencil dan menyimpan riwayat dalam float32 (setengah memori).
+# Jika shadow_every > 0, setiap shadow_every langkah dijalankan ulang beberapa langkah terakhir
+# (shadow_window(shadow_every)) dalam float64 dari state float32 awal jendela itu; galat relatif
+# maksimum max|flux - bayangan| / max|bayangan| ditambahkan ke shadow_log sebagai pasangan
+# (langkah, galat). Biaya float64 paling banyak 1/10 simulasi penuh, bukan satu simulasi kedua.
+# Jika checkpoint_path dan checkpoint_every > 0 diberikan, state solver disimpan setiap
+# checkpoint_every langkah dan di langkah terakhir. history_path menyimpan riwayat sebagai memmap
+# .npy di disk (bukan list di memori). resume=True melanjutkan dari checkpoint terakhir dan
+# menulis langkah berikutnya tepat setelah langkah yang sudah ada di riwayat disk; tanpa
+# history_path, riwayat yang dikembalikan hanya memuat langkah setelah resume.
+# Jika diagnostics (array dari empty_diagnostics(time_steps)) diberikan, baris ke-n diisi
+# total, puncak, centroid, kebocoran batas, dan norma perubahan setelah langkah n+1
+# (akumulasi float64), sehingga konsumen tidak perlu memindai ulang flux_history
+# Jika probes (flux_diagnostics.ProbeSet) diberikan, titik dan daerah probe dicatat tiap langkah.
+# store_history=False tidak menyimpan field per langkah sama sekali (flux_history = None);
+# bersama diagnostics/probes, run ribuan langkah di grid besar hanya menghasilkan beberapa KB.
+# history_every=k > 1 (desimasi, hanya untuk riwayat di memori) menyimpan langkah ke-k, 2k, ...
+# on_frame(n, field) dipanggil setelah diagnostik/probe langkah n (indeks baris) terisi; field
+# adalah buffer solver yang akan ditimpa, jadi harus disalin jika disimpan
+def calculate_flux(grid_size, time_steps, D, Sigma_a, S, num_workers=1, material_map=None,
+                   dtype=np.float64, shadow_every=0, shadow_log=None,
+                   checkpoint_path=None, checkpoint_every=0, history_path=None, resume=False,
+                   diagnostics=None, probes=None, store_history=True, history_every=1, on_frame=None):
     dx = 1.0  # Ukuran grid
     dt = 0.01  # Langkah waktu
-    flux_history = []
-    flux = np.zeros((grid_size, grid_size))
-    flux[int(grid_size / 2), int(grid_size / 2)] = 1.0  # Sumber neutron awal
-
-    for _ in range(time_steps):
-        flux_new = np.copy(flux)
-        for i in range(1, grid_size - 1):
-            for j in range(1, grid_size - 1):
-                laplacian = (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1] - 4 * flux[i, j]) / dx**2
-                flux_new[i, j] += dt * (D * laplacian - Sigma_a * flux[i, j] + S)
-        flux = np.copy(flux_new)
-        flux_history.append(flux.copy())
+    params = {"grid_size": grid_size, "D": D, "Sigma_a": Sigma_a, "S": S, "dt": dt, "dx": dx,
+              "dtype": np.dtype(dtype).name,
+              "labels": material_map[0] if material_map is not None else np.zeros(0, dtype=np.intp),
+              "materials": np.array(material_map[1] if material_map is not None else [], dtype=str)}
+    start_step = 0
+    if resume:
+        flux, start_step, saved = load_checkpoint(checkpoint_path)
+        if any(not np.array_equal(saved[key], np.asarray(value)) for key, value in params.items()):
+            raise ValueError("Checkpoint tidak cocok dengan parameter simulasi.")
+        flux = flux.astype(dtype)
+    else:
+        flux = np.zeros((grid_size, grid_size), dtype=dtype)
+        flux[int(grid_size / 2), int(grid_size / 2)] = 1.0  # Sumber neutron awal
+    flux_new = np.copy(flux)
+    kernel = make_kernel(D, Sigma_a, S, dt, dx, material_map, dtype)
+    remaining = max(time_steps - start_step, 0)
+
+    if not store_history:
+        if history_path is not None:
+            raise ValueError("history_path tidak bisa dipakai bersama store_history=False.")
+        flux_history = None
+    elif history_path is not None:
+        if history_every != 1:
+            raise ValueError("Desimasi riwayat (history_every > 1) hanya untuk riwayat di memori.")
+        flux_history = open_history(history_path, time_steps, grid_size, dtype, keep_steps=start_step)
+    else:
+        flux_history = []
+    if diagnostics is not None:
+        coeffs = precompute_coefficients(*material_map, dt, dx) if material_map is not None else None
+        weights = boundary_weights(D, coeffs, dt, dx)
+    if start_step and history_path is not None and (diagnostics is not None or probes is not None):
+        # Langkah yang sudah ada di riwayat disk dihitung sekali saat resume
+        previous = np.zeros((grid_size, grid_size), dtype=dtype)
+        previous[int(grid_size / 2), int(grid_size / 2)] = 1.0
+        for n in range(start_step):
+            if diagnostics is not None:
+                record_diagnostics(diagnostics[n], flux_history[n], previous, weights)
+            if probes is not None:
+                probes.record(n, flux_history[n])
+            previous = flux_history[n]
+    shadow = {}
+    if shadow_every > 0:
+        shadow_kernel = make_kernel(D, Sigma_a, S, dt, dx, material_map)
+        window = shadow_window(shadow_every)
+        shadow_log = shadow_log if shadow_log is not None else []
+
+    def shadow_check(field, n):
+        # Galat jendela yang berakhir di langkah n, lalu state awal jendela berikutnya disalin
+        if n % shadow_every == 0 and "start" in shadow:
+            with PROFILER.phase("shadow"):
+                start = shadow.pop("start")
+                reference = run_tiled_stencil([start, start.copy()], window, shadow_kernel, num_workers)
+                error = np.max(np.abs(field - reference)) / (np.max(np.abs(reference)) or 1.0)
+                shadow_log.append((n, float(error)))
+        if (n + window) % shadow_every == 0:
+            shadow["start"] = field.astype(np.float64)
+
+    if shadow_every > 0:
+        shadow_check(flux, start_step)
+    step = [start_step]
+
+    def on_step(current, previous):
+        step[0] += 1
+        PROFILER.count("steps")
+        if diagnostics is not None:
+            with PROFILER.phase("diagnostics"):
+                record_diagnostics(diagnostics[step[0] - 1], current, previous, weights)
+        if probes is not None:
+            with PROFILER.phase("probes"):
+                probes.record(step[0] - 1, current)
+        if on_frame is not None:
+            on_frame(step[0] - 1, current)
+        if store_history and step[0] % history_every == 0:
+            with PROFILER.phase("copy"):
+                if history_path is not None:
+                    flux_history[step[0] - 1] = current
+                else:
+                    flux_history.append(current.copy())
+        if shadow_every > 0:
+            shadow_check(current, step[0])
+        if checkpoint_path is not None and checkpoint_every > 0 and (
+                step[0] % checkpoint_every == 0 or step[0] == time_steps):
+            if history_path is not None:
+                flux_history.flush()  # Riwayat harus sudah di disk sebelum checkpoint mengklaimnya
+            with PROFILER.phase("checkpoint"):
+                save_checkpoint(checkpoint_path, current, step[0], params)
+
+    if num_workers > 1:
+        flux = run_tiled_stencil([flux, flux_new], remaining, kernel, num_workers, on_step=on_step)
+    else:
+        for _ in range(remaining):
+            with PROFILER.phase("stencil"):
+                kernel(flux, flux_new, 1, grid_size - 1)
+            flux, flux_new = flux_new, flux
+            on_step(flux, flux_new)
+    if history_path is not None:
+        flux_history.flush()
     return flux, flux_history
 
+# Fungsi untuk mengukur strong dan weak scaling solver paralel
+def benchmark_scaling(grid_size=2000, time_steps=20, max_workers=None, D=1.0, Sigma_a=0.1, S=1.0):
+    max_workers = max_workers or os.cpu_count() or 1
+    dt, dx = 0.01, 1.0
+    results = {"strong": [], "weak": []}
+
+    kernel = lambda f, f_new, r0, r1: stencil_rows(f, f_new, r0, r1, D, Sigma_a, S, dt, dx)
+
+    def timed_run(size, workers):
+        buffers = [np.zeros((size, size)), np.zeros((size, size))]
+        buffers[0][size // 2, size // 2] = 1.0
+        start = time.perf_counter()
+        if workers > 1:
+            run_tiled_stencil(buffers, time_steps, kernel, workers)
+        else:
+            for n in range(time_steps):
+                kernel(buffers[n % 2], buffers[(n + 1) % 2], 1, size - 1)
+        return time.perf_counter() - start
+
+    print(f"Strong scaling: grid {grid_size}x{grid_size}, {time_steps} langkah")
+    for workers in range(1, max_workers + 1):
+        elapsed = timed_run(grid_size, workers)
+        base = results["strong"][0]["seconds"] if results["strong"] else elapsed
+        entry = {"workers": workers, "grid_size": grid_size, "seconds": elapsed,
+                 "speedup": base / elapsed, "efficiency": base / elapsed / workers}
+        results["strong"].append(entry)
+        print(f"  {workers:3d} worker: {elapsed:8.3f} s, speedup {entry['speedup']:5.2f}, efisiensi {entry['efficiency']:5.2f}")
+
+    print(f"Weak scaling: grid {grid_size}x{grid_size} per worker, {time_steps} langkah")
+    for workers in range(1, max_workers + 1):
+        size = int(round(grid_size * np.sqrt(workers)))
+        elapsed = timed_run(size, workers)
+        base = results["weak"][0]["seconds"] if results["weak"] else elapsed
+        entry = {"workers": workers, "grid_size": size, "seconds": elapsed, "efficiency": base / elapsed}
+        results["weak"].append(entry)
+        print(f"  {workers:3d} worker (grid {size}): {elapsed:8.3f} s, efisiensi {entry['efficiency']:5.2f}")
+    return results
+
+# Fungsi untuk membaca memori fisik yang tersedia (byte); None jika tidak bisa ditentukan
+def available_memory():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if sys.platform == "win32":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong)] + [
+                (name, ctypes.c_ulonglong) for name in ("ullTotalPhys", "ullAvailPhys", "ullTotalPageFile",
+                                                        "ullAvailPageFile", "ullTotalVirtual", "ullAvailVirtual",
+                                                        "ullAvailExtendedVirtual")]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+calibration_cache = {}
+
+# Fungsi kalibrasi singkat: detik per sel per langkah untuk stencil (grid 512 dengan worker,
+# dtype, dan layout yang sama) dan untuk salinan field ke riwayat. Hasil disimpan per konfigurasi
+def calibrate_step_cost(num_workers=1, dtype=np.float64, heterogeneous=False, size=512, steps=10):
+    key = (num_workers, np.dtype(dtype).name, heterogeneous)
+    if key not in calibration_cache:
+        material_map = build_core_layout((size, size)) if heterogeneous else None
+        start = time.perf_counter()
+        calculate_flux(size, steps, 1.0, 0.1, 1.0, num_workers=num_workers, material_map=material_map,
+                       dtype=dtype, store_history=False)
+        stencil = (time.perf_counter() - start) / (steps * size**2)
+        field = np.ones((4 * size, 4 * size), dtype=dtype)  # Lebih besar dari cache, seperti field asli
+        start = time.perf_counter()
+        for _ in range(steps):
+            field.copy()
+        copy = (time.perf_counter() - start) / (steps * field.size)
+        calibration_cache[key] = {"stencil": stencil, "copy": copy}
+    return calibration_cache[key]
+
+MAX_HISTORY_STRIDE = 10  # Desimasi terjarang yang masih layak dianimasikan
+XLSX_BYTES_PER_CELL = 10  # Perkiraan ukuran sel numerik di file .xlsx (terkompresi)
+VIDEO_BYTES_PER_FRAME = 1800e3 / 8 / 20  # Bitrate 1800 kbps pada 20 fps (save_animation)
+PYRAMID_CACHE_BYTES = 256 * 1024**2  # Batas cache LRU piramida frame
+
+# Fungsi perencana run: memperkirakan memori puncak, waktu, dan ukuran ekspor, lalu memilih
+# strategi riwayat: "memori" (semua langkah di RAM), "desimasi" (tiap history_every langkah),
+# "memmap" (riwayat .npy di disk), atau "probe" (hanya diagnostik dan probe).
+# memory_budget bawaan = setengah memori tersedia (2 GiB jika tidak terbaca); require_disk=True
+# (dipakai checkpoint) hanya mengizinkan memmap atau probe
+def plan_run(grid_size, time_steps, num_workers=1, dtype=np.float64, heterogeneous=False, n_probes=0,
+             shadow=False, require_disk=False, history_dir=None, memory_budget=None, calibration=None):
+    cells = grid_size**2
+    field_bytes = cells * np.dtype(dtype).itemsize
+    working = 2 * field_bytes + time_steps * (DIAGNOSTIC_DTYPE.itemsize + 8 * n_probes)
+    if shadow:
+        working += 3 * cells * 8  # State awal jendela + dua buffer re-run float64
+    if heterogeneous:
+        working += 6 * (grid_size - 2)**2 * np.dtype(dtype).itemsize + 4 * cells * 8
+    if memory_budget is None:
+        available = available_memory()
+        memory_budget = available // 2 if available else 2 * 1024**3
+    history_dir = history_dir or tempfile.gettempdir()
+    disk_free = shutil.disk_usage(history_dir).free
+
+    plan = {"strategy": "probe", "history_every": 1, "frames": 0, "budget_bytes": memory_budget,
+            "working_bytes": working, "disk_bytes": 0, "disk_free_bytes": disk_free}
+    history = time_steps * field_bytes
+    stride = math.ceil(history / (memory_budget - working)) if memory_budget > working else None
+    if not require_disk and stride == 1:
+        plan.update(strategy="memori", frames=time_steps)
+    elif not require_disk and stride is not None and stride <= min(MAX_HISTORY_STRIDE, time_steps):
+        plan.update(strategy="desimasi", history_every=stride, frames=time_steps // stride)
+    elif history <= 0.9 * disk_free:
+        plan.update(strategy="memmap", frames=time_steps, disk_bytes=history)
+    plan["memory_bytes"] = working + (plan["frames"] * field_bytes if plan["strategy"] in ("memori", "desimasi") else 0)
+    if FramePyramid((grid_size, grid_size)).levels:
+        # Level piramida float32 berukuran total ~1/3 field penuh per frame
+        plan["memory_bytes"] += min(PYRAMID_CACHE_BYTES, plan["frames"] * cells * 4 // 3)
+
+    cost = calibration or calibrate_step_cost(num_workers, dtype, heterogeneous)
+    stencil = cost["stencil"]
+    if shadow:  # Re-run float64 satu jendela per shadow_every langkah
+        stencil += (calibrate_step_cost(num_workers, np.float64, heterogeneous)["stencil"]
+                    * shadow_window(shadow_interval(time_steps)) / shadow_interval(time_steps))
+    plan["seconds"] = time_steps * cells * stencil + plan["frames"] * cells * cost["copy"]
+    # save_data menulis heatmap akhir, perubahan flux, diagnostik, dan probe; animasi satu frame per riwayat
+    table_cells = cells + time_steps * (3 + len(DIAGNOSTIC_DTYPE.names) + n_probes)
+    plan["export_bytes"] = {"excel": table_cells * XLSX_BYTES_PER_CELL,
+                            "video": max(plan["frames"], 1) * VIDEO_BYTES_PER_FRAME}
+    return plan
+
+# Fungsi untuk menampilkan rencana run sebagai teks singkat
+def format_plan(plan):
+    strategies = {"memori": "riwayat penuh di memori",
+                  "desimasi": f"riwayat tiap {plan['history_every']} langkah di memori",
+                  "memmap": "riwayat di disk (memmap)",
+                  "probe": "tanpa riwayat field (hanya diagnostik dan probe)"}
+    lines = [f"Strategi: {strategies[plan['strategy']]}",
+             f"Memori puncak: {plan['memory_bytes'] / 1e6:,.0f} MB (batas {plan['budget_bytes'] / 1e6:,.0f} MB)",
+             f"Perkiraan waktu: {plan['seconds']:,.1f} s",
+             f"Ekspor: Excel ~{plan['export_bytes']['excel'] / 1e6:,.1f} MB, "
+             f"video ~{plan['export_bytes']['video'] / 1e6:,.1f} MB"]
+    if plan["disk_bytes"]:
+        lines.insert(2, f"Disk: {plan['disk_bytes'] / 1e6:,.0f} MB (bebas {plan['disk_free_bytes'] / 1e6:,.0f} MB)")
+    if plan["working_bytes"] > plan["budget_bytes"]:
+        lines.append("Peringatan: buffer kerja saja melebihi batas memori")
+    return "\n".join(lines)
+
 # Fungsi untuk memperbarui tampilan animasi
 def update_animation(frame):
+    with PROFILER.phase("render"):
+        render_frame(frame)
+    PROFILER.count("frames")
+
+def render_frame(frame):
+    draw_field(flux_history[frame], history_steps[frame])
+
+# Fungsi untuk menggambar satu field flux untuk baris diagnostik row (langkah row + 1)
+# Jika full_shape diberikan dan field adalah level piramida yang lebih kasar, gambar direntangkan
+# ke koordinat grid penuh dan batas warna memakai maksimum level itu (rata-rata blok menurunkan puncak)
+def draw_field(field, row, full_shape=None):
     global colorbar
-    ax.clear()
-    im = ax.imshow(flux_history[frame], cmap='viridis', origin='lower', interpolation='none')
-    ax.set_title(f"Flux Neutron pada Langkah Waktu {frame + 1}")
-    ax.set_xlabel("Posisi X")
-    ax.set_ylabel("Posisi Y")
-    im.set_clim(vmin=0, vmax=np.max(flux_history[frame]))  # Update batas warna
-    if colorbar is None:
-        cbar_ax = fig.add_axes([0.92, 0.1, 0.03, 0.8])  # Posisi colorbar
-        colorbar = plt.colorbar(im, cax=cbar_ax)
+    coarse = full_shape is not None and field.shape != tuple(full_shape)
+    with PROFILER.phase("clear"):
+        ax.clear()
+    with PROFILER.phase("imshow"):
+        im = ax.imshow(field, cmap='viridis', origin='lower', interpolation='none',
+                       extent=(-0.5, full_shape[1] - 0.5, -0.5, full_shape[0] - 0.5) if coarse else None)
+        ax.set_title(f"Flux Neutron pada Langkah Waktu {row + step_offset + 1}")
+        ax.set_xlabel("Posisi X")
+        ax.set_ylabel("Posisi Y")
+        im.set_clim(vmin=0, vmax=field.max() if coarse else flux_diagnostics["peak"][row])  # Update batas warna
+    with PROFILER.phase("colorbar"):
+        if colorbar is None:
+            cbar_ax = fig.add_axes([0.92, 0.1, 0.03, 0.8])  # Posisi colorbar
+            colorbar = plt.colorbar(im, cax=cbar_ax)
+        else:
+            colorbar.update_normal(im)  # Update colorbar sesuai data
+
+PLAYBACK_FPS = 20  # Target frame per detik pemutaran (sama dengan fps video ekspor)
+SCRUB_REFINE_MS = 250  # Jeda diam setelah scrub/jeda sebelum frame dirender ulang resolusi penuh
+DISPLAY_PIXELS = 512  # Perkiraan sisi gambar di kanvas; level piramida saat playback tidak lebih kasar
+
+# Pengendali pemutaran riwayat flux berbasis jam dinding
+class PlaybackController:
+    """Memutar riwayat flux dengan memetakan waktu dinding ke langkah simulasi.
+
+    Langkah target = langkah saat ``play`` + (detik sejak ``play``) x ``speed`` (langkah/detik).
+    Setiap tick (target ``fps``) hanya merender frame untuk langkah target; frame yang
+    terlewati karena render lebih lambat dari target dilompati dan dihitung di ``dropped``.
+    ``seek`` menjeda pemutaran dan merender tepat satu frame (untuk slider timeline); beberapa
+    seek beruntun saat slider digeser digabung menjadi satu render.
+
+    ``render(frame, mode)`` menerima mode "play" (resolusi tampilan), "preview" (level
+    terkasar, saat scrub), atau "full". Setelah scrub atau jeda, frame yang tampil dirender
+    ulang "full" jika tidak ada aksi lain selama ``SCRUB_REFINE_MS``.
+    """
+
+    def __init__(self, widget, render, on_position=None, fps=PLAYBACK_FPS):
+        self.widget = widget
+        self.render = render
+        self.on_position = on_position
+        self.fps = fps
+        self.steps = np.zeros(0, dtype=np.int64)
+        self.frame = 0
+        self.speed = float(fps)
+        self.playing = False
+        self.dropped = 0
+        self._anchor = None
+        self._job = None
+        self._pending = None
+        self._refine = None
+
+    def load(self, steps):
+        """Memuat indeks langkah tiap frame (``history_steps``) dan kembali ke frame pertama."""
+        self.pause()
+        self.steps = np.asarray(steps)
+        self.frame = 0
+        self.dropped = 0
+
+    def play(self, speed=None):
+        if not len(self.steps):
+            return
+        self.pause()
+        if speed is not None:
+            self.speed = speed
+        if self.frame >= len(self.steps) - 1:
+            self.frame = 0
+        self._anchor = (time.perf_counter(), self.steps[self.frame])
+        self.playing = True
+        self._show(self.frame, "play")
+        self._job = self.widget.after(int(1000 / self.fps), self._tick)
+
+    def pause(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+        self._cancel_refine()
+        if self.playing:
+            self._refine = self.widget.after(SCRUB_REFINE_MS, self._show_full)
+        self.playing = False
+
+    def _cancel_refine(self):
+        if self._refine is not None:
+            self.widget.after_cancel(self._refine)
+            self._refine = None
+
+    def _show_full(self):
+        self._refine = None
+        if len(self.steps):
+            self._show(self.frame, "full")
+
+    def seek(self, frame):
+        if not len(self.steps):
+            return
+        self.pause()
+        if self._pending is None:
+            self.widget.after_idle(self._show_pending)
+        self._pending = min(max(int(frame), 0), len(self.steps) - 1)
+
+    def _show_pending(self):
+        frame, self._pending = self._pending, None
+        if frame is not None:
+            self._show(frame, "preview")
+            self._cancel_refine()
+            self._refine = self.widget.after(SCRUB_REFINE_MS, self._show_full)
+
+    def _show(self, frame, mode):
+        self.frame = frame
+        self.render(frame, mode)
+        if self.on_position is not None:
+            self.on_position(frame)
+
+    def _tick(self):
+        start = time.perf_counter()
+        anchor_time, anchor_step = self._anchor
+        target = anchor_step + (start - anchor_time) * self.speed
+        frame = max(int(np.searchsorted(self.steps, target, side="right")) - 1, 0)
+        if frame > self.frame:
+            skipped = frame - self.frame - 1
+            self.dropped += skipped
+            PROFILER.count("playback_dropped", skipped)
+            self._show(frame, "play")
+        elif self.frame == len(self.steps) - 1:
+            # Frame terakhir sudah tampil satu tick; ulangi dari awal seperti animasi sebelumnya
+            self._anchor = (start, self.steps[0])
+            self._show(0, "play")
+        delay = 1 / self.fps - (time.perf_counter() - start)
+        self._job = self.widget.after(max(int(delay * 1000), 1), self._tick)
+
+# Fungsi untuk merender frame playback ke kanvas (mode: "play", "preview", atau "full")
+def render_playback(frame, mode="full"):
+    if mode == "full" or frame_pyramid is None:
+        update_animation(frame)
     else:
-        colorbar.update_normal(im)  # Update colorbar sesuai data
+        level = frame_pyramid.levels if mode == "preview" else frame_pyramid.level_for(DISPLAY_PIXELS)
+        with PROFILER.phase("render"):
+            draw_field(frame_pyramid.get(frame, level), history_steps[frame], full_shape=frame_pyramid.shape)
+    canvas.draw()
+
+# Fungsi untuk memperbarui slider timeline dan label posisi playback
+def show_position(frame):
+    timeline_var.set(frame)
+    timeline_label.config(text=f"Langkah {history_steps[frame] + step_offset + 1} / {history_steps[-1] + step_offset + 1}"
+                               f"   frame dilewati: {playback.dropped}")
+
+# Fungsi untuk memuat riwayat hasil run ke playback dan slider timeline
+def load_playback():
+    playback.load(history_steps)
+    timeline.config(to=max(len(flux_history) - 1, 0))
 
 # Fungsi untuk memulai animasi
 def start_animation():
-    global ani, is_running
-    if ani is None or not is_running:
-        ani = FuncAnimation(fig, update_animation, frames=len(flux_history), interval=50, blit=False)
-        is_running = True
-        canvas.draw()
+    if simulation_busy() or flux_history is None:
+        return
+    try:
+        speed = float(speed_entry.get())
+        if speed <= 0:
+            raise ValueError
+    except ValueError:
+        messagebox.showerror("Error", "Kecepatan putar harus bilangan positif (langkah/detik).")
+        return
+    playback.play(speed)
+
+LIVE_QUEUE_SIZE = 4  # Frame live maksimum yang menunggu dirender
+LIVE_POLL_MS = 50  # Interval thread Tk memeriksa antrean frame
+
+# Fungsi untuk menjalankan perhitungan di thread produsen sambil menampilkan frame secara live.
+# compute(on_frame) berjalan di thread terpisah; on_frame menyalin field ke antrean berukuran
+# tetap hanya jika masih ada tempat, sehingga solver tidak pernah menunggu GUI dan frame yang
+# tidak sempat dirender dilewati (riwayat lengkap tetap disimpan solver). Thread Tk mengambil
+# frame terbaru tiap LIVE_POLL_MS, lalu memanggil finish(hasil) di thread Tk setelah selesai.
+# record(n, field), jika diberikan, dipanggil untuk setiap langkah di thread produsen
+def start_live_run(compute, finish, error_message, record=None):
+    global simulation_thread
+    frames = queue.Queue(maxsize=LIVE_QUEUE_SIZE)
+    outcome = {}
+
+    def on_frame(row, field):
+        if record is not None:
+            record(row, field)
+        if not frames.full():  # Hanya satu produsen, jadi put_nowait setelah cek ini tidak gagal
+            frames.put_nowait((field.copy(), row))
+        else:
+            PROFILER.count("live_dropped")
+
+    def produce():
+        try:
+            outcome["result"] = compute(on_frame)
+        except Exception as e:
+            outcome["error"] = e
+
+    def consume():
+        latest = None
+        while not frames.empty():
+            latest = frames.get_nowait()
+        if latest is not None:
+            with PROFILER.phase("render"):
+                draw_field(*latest)
+            canvas.draw_idle()
+        if simulation_thread.is_alive():
+            root.after(LIVE_POLL_MS, consume)
+        elif "error" in outcome:
+            messagebox.showerror("Error", f"{error_message}: {outcome['error']}")
+        else:
+            finish(outcome["result"])
+
+    playback.load(())  # Riwayat lama dilepas; slider tidak aktif sampai run selesai
+    simulation_thread = threading.Thread(target=produce, daemon=True)
+    simulation_thread.start()
+    root.after(LIVE_POLL_MS, consume)
+
+# Fungsi untuk memeriksa apakah run live masih berjalan (dan memberi tahu pengguna)
+def simulation_busy():
+    if simulation_thread is not None and simulation_thread.is_alive():
+        messagebox.showerror("Error", "Simulasi masih berjalan.")
+        return True
+    return False
 
 # Fungsi untuk menghentikan animasi
 def stop_animation():
-    global ani, is_running
-    if ani is not None and is_running:
-        ani.event_source.stop()
-        is_running = False
+    playback.pause()
 
 # Fungsi untuk menyimpan animasi
+# Video tetap memuat setiap frame riwayat; playback dijeda agar tidak menggambar ke figure yang sama
 def save_animation():
-    global ani
-    if ani is None:
+    if simulation_busy():
+        return
+    if flux_history is None:
         messagebox.showerror("Error", "Tidak ada animasi untuk disimpan.")
         return
     filepath = filedialog.asksaveasfilename(defaultextension=".mp4", filetypes=[("MP4 files", "*.mp4")])
     if filepath:
         try:
-            writer = FFMpegWriter(fps=20, metadata=dict(artist='Neutron Flux Simulation'), bitrate=1800)
-            ani.save(filepath, writer=writer)
+            stop_animation()
+            ani = FuncAnimation(fig, update_animation, frames=len(flux_history), blit=False)
+            writer = FFMpegWriter(fps=PLAYBACK_FPS, metadata=dict(artist='Neutron Flux Simulation'), bitrate=1800)
+            with PROFILER.export("save_animation", filepath):
+                ani.save(filepath, writer=writer)
+            ani.pause()
             messagebox.showinfo("Berhasil", f"Animasi disimpan di {filepath}")
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan animasi: {e}")
 
+THUMBNAIL_COUNT = 10  # Jumlah frame berjarak sama pada strip thumbnail
+
+# Fungsi untuk menyimpan strip thumbnail riwayat flux sebagai gambar PNG
+# Tile diambil dari level terkasar piramida, jadi frame penuh hanya dibaca jika levelnya sudah tergusur
+def save_thumbnails():
+    if flux_history is None or frame_pyramid is None or frame_pyramid.source is None:
+        messagebox.showerror("Error", "Tidak ada riwayat flux untuk thumbnail.")
+        return
+    filepath = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png")])
+    if filepath:
+        try:
+            frames = np.unique(np.linspace(0, len(flux_history) - 1, THUMBNAIL_COUNT).astype(int))
+            with PROFILER.export("save_thumbnails", filepath):
+                plt.imsave(filepath, frame_pyramid.thumbnail_strip(frames), cmap='viridis', origin='lower')
+            messagebox.showinfo("Berhasil", f"Thumbnail disimpan di {filepath}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Gagal menyimpan thumbnail: {e}")
+
 # Fungsi untuk menyimpan data ke Excel
 def save_data():
     global flux, flux_history, regression_model
@@ -100,8 +751,8 @@ def save_data():
             df_heatmap = pd.DataFrame(flux)
 
             # Data untuk sheet kedua (perubahan flux seiring waktu)
-            time_steps = np.arange(len(flux_history))
-            total_flux = [np.sum(frame) for frame in flux_history]
+            time_steps = np.arange(len(flux_diagnostics)) + step_offset
+            total_flux = flux_diagnostics["total"]
 
             # Jika model regresi sudah dilatih, tambahkan prediksi
             if regression_model is not None:
@@ -117,25 +768,201 @@ def save_data():
             })
 
             # Menulis ke Excel
-            with pd.ExcelWriter(filepath, engine="xlsxwriter") as writer:
-                df_heatmap.to_excel(writer, sheet_name="Heatmap Akhir", index=False)
-                df_changes.to_excel(writer, sheet_name="Perubahan Flux", index=False)
+            with PROFILER.export("save_data", filepath):
+                with pd.ExcelWriter(filepath, engine="xlsxwriter") as writer:
+                    df_heatmap.to_excel(writer, sheet_name="Heatmap Akhir", index=False)
+                    df_changes.to_excel(writer, sheet_name="Perubahan Flux", index=False)
+                    pd.DataFrame(flux_diagnostics).to_excel(writer, sheet_name="Diagnostik", index=False)
+                    if flux_probes is not None:
+                        pd.DataFrame(flux_probes.as_dict()).to_excel(writer, sheet_name="Probe", index=False)
 
             messagebox.showinfo("Berhasil", f"Data disimpan di {filepath}")
         except Exception as e:
             messagebox.showerror("Error", f"Gagal menyimpan data: {e}")
 
+# Fungsi untuk membuat rencana run dari isian GUI
+def plan_from_inputs():
+    grid_size = int(grid_size_entry.get())
+    heterogeneous = layout_var.get() == "Teras Heterogen"
+    return plan_run(grid_size, int(time_steps_entry.get()), num_workers=int(workers_entry.get()),
+                    dtype=PRECISIONS[precision_var.get()][0],
+                    heterogeneous=heterogeneous,
+                    n_probes=len(default_probes(grid_size, build_core_layout((grid_size, grid_size)) if heterogeneous else None)),
+                    shadow=PRECISIONS[precision_var.get()][1], require_disk=int(checkpoint_entry.get()) > 0)
+
+# Fungsi untuk menampilkan rencana run di GUI tanpa menjalankan simulasi
+def estimate_run():
+    try:
+        plan_label.config(text=format_plan(plan_from_inputs()))
+    except Exception as e:
+        messagebox.showerror("Error", f"Gagal membuat rencana run: {e}")
+
+# Fungsi untuk melepas riwayat flux run sebelumnya; file memmap sementara ikut dihapus.
+# Piramida juga dilepas karena source-nya memegang referensi ke memmap
+def release_history():
+    global flux, flux_history, frame_pyramid, temp_history_path
+    flux = flux_history = frame_pyramid = None
+    if temp_history_path is not None:
+        try:
+            os.remove(temp_history_path)
+        except OSError:
+            pass  # Misalnya masih dipetakan oleh thread solver di Windows
+        temp_history_path = None
+
+# Fungsi untuk membuat file riwayat memmap sementara yang unik (dihapus oleh release_history)
+def new_temp_history():
+    global temp_history_path
+    fd, temp_history_path = tempfile.mkstemp(prefix="flux_history_", suffix=".npy")
+    os.close(fd)
+    return temp_history_path
+
+# Fungsi untuk menutup jendela utama: riwayat sementara di disk dihapus lebih dulu
+def on_close():
+    release_history()
+    root.destroy()
+
+# Fungsi untuk menonaktifkan isian D, Sigma_a, dan S pada teras heterogen, karena
+# sifat tiap sel saat itu diambil dari material_data dan isian tersebut diabaikan
+def update_material_entries(*_):
+    heterogeneous = layout_var.get() == "Teras Heterogen"
+    for entry in (D_entry, Sigma_a_entry, S_entry):
+        entry.config(state="disabled" if heterogeneous else "normal")
+    material_hint.config(text="D, Sigma_a, S dari tabel material" if heterogeneous else "")
+
 # Fungsi untuk menjalankan simulasi
 def run_simulation():
-    global flux, flux_history, grid_size, D, Sigma_a, S, time_steps
+    global flux, flux_history, flux_diagnostics, flux_probes, frame_pyramid, history_steps, step_offset
+    global grid_size, D, Sigma_a, S, time_steps
+    if simulation_busy():
+        return
     grid_size = int(grid_size_entry.get())
     D = float(D_entry.get())
     Sigma_a = float(Sigma_a_entry.get())
     S = float(S_entry.get())
     time_steps = int(time_steps_entry.get())
+    num_workers = int(workers_entry.get())
+    material_map = build_core_layout((grid_size, grid_size)) if layout_var.get() == "Teras Heterogen" else None
+    dtype, shadow = PRECISIONS[precision_var.get()]
+    checkpoint_every = int(checkpoint_entry.get())
+    shadow_log = []
+
+    # Rencana run ditampilkan lebih dulu; selain riwayat penuh di memori, pengguna diminta konfirmasi
+    plan = plan_from_inputs()
+    plan_label.config(text=format_plan(plan))
+    if plan["strategy"] != "memori" and not messagebox.askokcancel("Rencana Run", format_plan(plan) + "\n\nLanjutkan?"):
+        return
+
+    checkpoint_path = history_path = None
+    if checkpoint_every > 0:
+        checkpoint_path = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("Checkpoint", "*.npz")])
+        if not checkpoint_path:
+            return
+        if plan["strategy"] == "memmap":
+            history_path = os.path.splitext(checkpoint_path)[0] + "_history.npy"
+    release_history()  # Melepas riwayat (dan memmap) run sebelumnya sebelum alokasi baru
+    if checkpoint_every <= 0 and plan["strategy"] == "memmap":
+        history_path = new_temp_history()
+    flux_diagnostics = empty_diagnostics(time_steps)
+    step_offset = 0
+    flux_probes = ProbeSet((grid_size, grid_size), time_steps, default_probes(grid_size, material_map))
+    # Level piramida dibangun saat frame diproduksi (hanya langkah yang masuk riwayat)
+    frame_pyramid = pyramid = FramePyramid((grid_size, grid_size), max_bytes=PYRAMID_CACHE_BYTES)
+    history_every = plan["history_every"]
+    precision_label.config(text="Simulasi berjalan...")
+
+    def record(row, field):
+        if plan["strategy"] != "probe" and (row + 1) % history_every == 0:
+            with PROFILER.phase("pyramid"):
+                pyramid.add((row + 1) // history_every - 1, field)
+
+    def compute(on_frame):
+        with PROFILER.run("run_simulation", grid_size=grid_size, time_steps=time_steps, workers=num_workers,
+                          dtype=np.dtype(dtype).name, layout=layout_var.get()):
+            return calculate_flux(grid_size, time_steps, D, Sigma_a, S, num_workers=num_workers,
+                                  material_map=material_map, dtype=dtype,
+                                  shadow_every=shadow_interval(time_steps) if shadow else 0,
+                                  shadow_log=shadow_log, checkpoint_path=checkpoint_path,
+                                  checkpoint_every=checkpoint_every, history_path=history_path,
+                                  diagnostics=flux_diagnostics, probes=flux_probes,
+                                  store_history=plan["strategy"] != "probe",
+                                  history_every=plan["history_every"], on_frame=on_frame)
+
+    def finish(result):
+        global flux, flux_history, history_steps
+        flux, flux_history = result
+        if flux_history is None:
+            # Tanpa riwayat, animasi hanya menampilkan field akhir
+            flux_history, history_steps = [flux], np.array([time_steps - 1])
+        else:
+            history_steps = np.arange(1, len(flux_history) + 1) * history_every - 1
+        pyramid.source = flux_history.__getitem__
+        record_surrogate_run({"D": D, "Sigma_a": Sigma_a, "S": S, "grid_size": grid_size,
+                              "heterogeneous": material_map is not None}, flux_diagnostics["total"], flux)
+        if shadow_log:
+            precision_label.config(text=f"Galat relatif maks float32: {max(e for _, e in shadow_log):.2e}")
+        else:
+            precision_label.config(text="")
+        load_playback()
+        start_animation()
+
+    start_live_run(compute, finish, "Gagal menjalankan simulasi", record=record)
+
+# Fungsi untuk melanjutkan simulasi dari checkpoint
+# Parameter fisik diambil dari checkpoint; Time Steps dari input (boleh lebih panjang dari run awal)
+def resume_simulation():
+    global flux, flux_history, flux_diagnostics, flux_probes, frame_pyramid, history_steps, step_offset
+    global grid_size, D, Sigma_a, S, time_steps
+    if simulation_busy():
+        return
+    checkpoint_path = filedialog.askopenfilename(filetypes=[("Checkpoint", "*.npz")])
+    if not checkpoint_path:
+        return
+    try:
+        _, step, params = load_checkpoint(checkpoint_path)
+        grid_size = int(params["grid_size"])
+        D, Sigma_a, S = float(params["D"]), float(params["Sigma_a"]), float(params["S"])
+        time_steps = int(time_steps_entry.get())
+        material_map = (params["labels"], list(params["materials"])) if params["labels"].size else None
+        history_path = os.path.splitext(checkpoint_path)[0] + "_history.npy"
+        if not os.path.exists(history_path):
+            history_path = None
+        num_workers, checkpoint_every = int(workers_entry.get()), max(int(checkpoint_entry.get()), 0)
+    except Exception as e:
+        messagebox.showerror("Error", f"Gagal melanjutkan simulasi: {e}")
+        return
+    release_history()
+    # Selama run live, frame memakai indeks langkah absolut terhadap diagnostik penuh
+    diagnostics = flux_diagnostics = empty_diagnostics(time_steps)
+    step_offset = 0
+    probes = ProbeSet((grid_size, grid_size), time_steps, default_probes(grid_size, material_map))
+    # Riwayat resume baru dikenal setelah run selesai; level piramida dibangun saat diminta
+    frame_pyramid = pyramid = FramePyramid((grid_size, grid_size), max_bytes=PYRAMID_CACHE_BYTES)
+    precision_label.config(text=f"Melanjutkan dari langkah {step}...")
+
+    def compute(on_frame):
+        return calculate_flux(grid_size, time_steps, D, Sigma_a, S,
+                              num_workers=num_workers, material_map=material_map,
+                              dtype=np.dtype(str(params["dtype"])).type,
+                              checkpoint_path=checkpoint_path, checkpoint_every=checkpoint_every,
+                              history_path=history_path,
+                              resume=True, diagnostics=diagnostics, probes=probes, on_frame=on_frame)
 
-    flux, flux_history = calculate_flux(grid_size, time_steps, D, Sigma_a, S)
-    start_animation()
+    def finish(result):
+        global flux, flux_history, flux_diagnostics, flux_probes, history_steps, step_offset
+        flux, flux_history = result
+        # Riwayat disk mencakup semua langkah (diagnostik awal dihitung ulang dari disk); tanpa
+        # riwayat disk, frame dan diagnostik hanya mencakup langkah step+1 ... time_steps
+        step_offset = 0 if history_path is not None else step
+        flux_diagnostics = diagnostics[step_offset:]
+        probes.values = probes.values[step_offset:]
+        flux_probes = probes
+        history_steps = np.arange(len(flux_history))
+        pyramid.source = flux_history.__getitem__
+        precision_label.config(text=f"Dilanjutkan dari langkah {step}")
+        load_playback()
+        start_animation()
+
+    start_live_run(compute, finish, "Gagal melanjutkan simulasi")
 
 # Fungsi untuk melatih model regresi linear dan menampilkan GUI tambahan
 def train_regression_model():
@@ -144,33 +971,35 @@ def train_regression_model():
         messagebox.showerror("Error", "Tidak ada data flux untuk model.")
         return
 
-    # Menyiapkan data untuk regresi
-    total_flux = [np.sum(frame) for frame in flux_history]
-    time_steps = np.arange(len(total_flux)).reshape(-1, 1)
-    
-    # Membuat model regresi linear
-    regression_model = LinearRegression()
-    regression_model.fit(time_steps, total_flux)
+    with PROFILER.phase("regression"):
+        # Menyiapkan data untuk regresi
+        total_flux = flux_diagnostics["total"]
+        time_steps = (np.arange(len(total_flux)) + step_offset).reshape(-1, 1)
+
+        # Membuat model regresi linear
+        regression_model = LinearRegression()
+        regression_model.fit(time_steps, total_flux)
 
-    # Prediksi menggunakan model
-    flux_predictions = regression_model.predict(time_steps)
+        # Prediksi menggunakan model
+        flux_predictions = regression_model.predict(time_steps)
 
-    # Menghitung MSE dan R2 Score (akurasi)
-    mse_value = mean_squared_error(total_flux, flux_predictions)
-    accuracy_value = r2_score(total_flux, flux_predictions)
+        # Menghitung MSE dan R2 Score (akurasi)
+        mse_value = mean_squared_error(total_flux, flux_predictions)
+        accuracy_value = r2_score(total_flux, flux_predictions)
 
     # Membuka GUI tambahan
-    display_results(total_flux, flux_predictions, mse_value, accuracy_value)
+    display_results(total_flux, flux_predictions, mse_value, accuracy_value, steps=time_steps.ravel())
 
 # Fungsi untuk menampilkan GUI tambahan dengan plotting dan tabel
-def display_results(total_flux, flux_predictions, mse, accuracy):
+def display_results(total_flux, flux_predictions, mse, accuracy, steps=None):
+    steps = np.arange(len(total_flux)) if steps is None else steps
     result_window = tk.Toplevel(root)
     result_window.title("Hasil Model Regresi Linear")
     
     # Plotting
     fig_result, ax_result = plt.subplots(figsize=(6, 4))
-    ax_result.plot(range(len(total_flux)), total_flux, label="Data Aktual", marker='o')
-    ax_result.plot(range(len(flux_predictions)), flux_predictions, label="Prediksi", linestyle='--')
+    ax_result.plot(steps, total_flux, label="Data Aktual", marker='o')
+    ax_result.plot(steps, flux_predictions, label="Prediksi", linestyle='--')
     ax_result.set_title("Hasil Regresi Linear")
     ax_result.set_xlabel("Langkah Waktu")
     ax_result.set_ylabel("Total Flux")
@@ -179,20 +1008,10 @@ def display_results(total_flux, flux_predictions, mse, accuracy):
     canvas_result = FigureCanvasTkAgg(fig_result, master=result_window)
     canvas_result.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
 
-    # Tabel
-    table_frame = ttk.Frame(result_window)
-    table_frame.grid(row=0, column=1, padx=10, pady=10)
-
-    columns = ["Waktu", "Flux Aktual", "Flux Prediksi"]
-    table = ttk.Treeview(table_frame, columns=columns, show="headings")
-    for col in columns:
-        table.heading(col, text=col)
-        table.column(col, width=100, anchor="center")
-
-    for i, (actual, predicted) in enumerate(zip(total_flux, flux_predictions)):
-        table.insert("", "end", values=(i, f"{actual:.2f}", f"{predicted:.2f}"))
-
-    table.grid(row=0, column=0)
+    # Tabel tervirtualisasi: hanya baris yang terlihat diformat dari array
+    table = VirtualTable(result_window, {"Waktu": steps, "Flux Aktual": total_flux,
+                                         "Flux Prediksi": flux_predictions}, ["{:d}", "{:.2f}", "{:.2f}"])
+    table.grid(row=0, column=1, padx=10, pady=10)
 
     # Menampilkan MSE dan akurasi
     stats_frame = ttk.Frame(result_window)
@@ -201,50 +1020,405 @@ def display_results(total_flux, flux_predictions, mse, accuracy):
     ttk.Label(stats_frame, text=f"MSE: {mse:.4f}").grid(row=0, column=0, sticky="w")
     ttk.Label(stats_frame, text=f"Akurasi (R²): {accuracy:.4f}").grid(row=1, column=0, sticky="w")
 
-# GUI utama
-root = tk.Tk()
-root.title("Simulasi Flux Neutron 2D")
-
-frame = ttk.Frame(root)
-frame.grid(row=0, column=0, padx=10, pady=10)
-
-# Input parameter
-ttk.Label(frame, text="Grid Size:").grid(row=0, column=0, sticky="w")
-grid_size_entry = ttk.Entry(frame)
-grid_size_entry.grid(row=0, column=1)
-grid_size_entry.insert(0, "50")
-
-ttk.Label(frame, text="D (Difusi):").grid(row=1, column=0, sticky="w")
-D_entry = ttk.Entry(frame)
-D_entry.grid(row=1, column=1)
-D_entry.insert(0, "1.0")
-
-ttk.Label(frame, text="Sigma_a (Absorpsi):").grid(row=2, column=0, sticky="w")
-Sigma_a_entry = ttk.Entry(frame)
-Sigma_a_entry.grid(row=2, column=1)
-Sigma_a_entry.insert(0, "0.1")
-
-ttk.Label(frame, text="S (Sumber):").grid(row=3, column=0, sticky="w")
-S_entry = ttk.Entry(frame)
-S_entry.grid(row=3, column=1)
-S_entry.insert(0, "1.0")
-
-ttk.Label(frame, text="Time Steps:").grid(row=4, column=0, sticky="w")
-time_steps_entry = ttk.Entry(frame)
-time_steps_entry.grid(row=4, column=1)
-time_steps_entry.insert(0, "300")
-
-# Tombol kontrol
-ttk.Button(frame, text="Run Simulation", command=run_simulation).grid(row=5, column=0, pady=5, columnspan=2)
-ttk.Button(frame, text="Start Animation", command=start_animation).grid(row=6, column=0, pady=5, columnspan=2)
-ttk.Button(frame, text="Stop Animation", command=stop_animation).grid(row=7, column=0, pady=5, columnspan=2)
-ttk.Button(frame, text="Save Animation", command=save_animation).grid(row=8, column=0, pady=5, columnspan=2)
-ttk.Button(frame, text="Save Data", command=save_data).grid(row=9, column=0, pady=5, columnspan=2)
-ttk.Button(frame, text="Train Regression Model", command=train_regression_model).grid(row=10, column=0, pady=5, columnspan=2)
-
-# Matplotlib Figure
-fig, ax = plt.subplots(figsize=(6, 6))
-canvas = FigureCanvasTkAgg(fig, master=root)
-canvas.get_tk_widget().grid(row=0, column=1)
-
-root.mainloop()
+FIELD_BASES = {"Linear": "linear", "Polinomial": "poly", "Eksponensial": "exp"}
+FIELD_HOLDOUT = 0.1  # Fraksi frame terakhir yang ditahan untuk galat ekstrapolasi
+REGRESSION_CHUNK_BYTES = 64 * 1024**2  # Ukuran blok riwayat (T x baris x kolom) per solve
+
+# Fungsi untuk membangun matriks desain bersama dari langkah waktu ternormalisasi tau (0..1)
+# "linear": [1, tau], "poly": [1, tau, ..., tau^degree], "exp": [1, exp(-rate * tau)]
+def field_design(tau, basis, degree=2, rate=1.0):
+    tau = np.asarray(tau, dtype=np.float64)
+    if basis in ("linear", "poly"):
+        return np.vander(tau, 2 if basis == "linear" else degree + 1, increasing=True)
+    if basis == "exp":
+        return np.column_stack([np.ones_like(tau), np.exp(-rate * tau)])
+    raise ValueError(f"Basis regresi tidak dikenal: {basis}")
+
+# Fungsi untuk memilih laju eksponensial (dalam satuan tau) dengan residual terkecil pada
+# deret skalar (misalnya total flux); pencarian grid atas kandidat laju, bukan atas sel
+def estimate_decay_rate(tau, series, rates=np.geomspace(0.01, 100, 400)):
+    series = np.asarray(series, dtype=np.float64)
+    residuals = []
+    for rate in rates:
+        X = field_design(tau, "exp", rate=rate)
+        coef = np.linalg.lstsq(X, series, rcond=None)[0]
+        residuals.append(np.linalg.norm(X @ coef - series))
+    return float(rates[int(np.argmin(residuals))])
+
+# Fungsi regresi field penuh: deret waktu setiap sel difit sekaligus terhadap matriks desain
+# bersama. Faktorisasi QR desain dihitung sekali; riwayat diproses per blok baris grid
+# (REGRESSION_CHUNK_BYTES) sehingga memmap tidak pernah dimuat utuh dan tidak ada loop per sel.
+# steps adalah nomor langkah tiap frame riwayat. holdout > 0 menahan frame terakhir: model
+# difit pada sisanya dan galat ekstrapolasi per sel dilaporkan di "holdout_rmse"
+def fit_field_regression(history, steps, basis="linear", degree=2, rate=None, total=None, holdout=0.0):
+    steps = np.asarray(steps, dtype=np.float64)
+    n_frames = len(steps)
+    n_train = n_frames - int(round(holdout * n_frames))
+    scale = steps[-1]
+    tau = steps / scale
+    if basis == "exp" and rate is None:
+        series = total if total is not None else [np.sum(frame, dtype=np.float64) for frame in history]
+        rate = estimate_decay_rate(tau[:n_train], np.asarray(series)[:n_train])
+    X = field_design(tau, basis, degree, rate)
+    if n_train <= X.shape[1]:
+        raise ValueError(f"Butuh lebih dari {X.shape[1]} frame latih untuk basis ini (ada {n_train}).")
+    Q, R = np.linalg.qr(X[:n_train])
+    solver = np.linalg.solve(R, Q.T)  # Pseudo-invers desain latih (p x n_train)
+
+    rows, cols = history[0].shape
+    coef = np.empty((X.shape[1], rows, cols))
+    rmse = np.empty((rows, cols))
+    holdout_rmse = np.empty((rows, cols)) if n_train < n_frames else None
+    chunk = max(1, REGRESSION_CHUNK_BYTES // (n_frames * cols * 8))
+    for r0 in range(0, rows, chunk):
+        r1 = min(r0 + chunk, rows)
+        if isinstance(history, np.ndarray):
+            block = history[:n_frames, r0:r1]
+        else:
+            block = np.stack([frame[r0:r1] for frame in history])
+        Y = block.reshape(n_frames, -1).astype(np.float64, copy=False)
+        B = solver @ Y[:n_train]
+        residual = X @ B - Y
+        coef[:, r0:r1] = B.reshape(-1, r1 - r0, cols)
+        rmse[r0:r1] = np.sqrt(np.mean(residual[:n_train]**2, axis=0)).reshape(r1 - r0, cols)
+        if holdout_rmse is not None:
+            holdout_rmse[r0:r1] = np.sqrt(np.mean(residual[n_train:]**2, axis=0)).reshape(r1 - r0, cols)
+    return {"basis": basis, "degree": degree, "rate": rate, "scale": scale, "coef": coef,
+            "rmse": rmse, "holdout_rmse": holdout_rmse, "train_frames": n_train}
+
+# Fungsi untuk memprediksi peta flux pada satu atau beberapa langkah (boleh di luar riwayat)
+def predict_field(model, step):
+    x = field_design(np.atleast_1d(step) / model["scale"], model["basis"], model["degree"], model["rate"])
+    maps = np.tensordot(x, model["coef"], axes=1)
+    return maps[0] if np.ndim(step) == 0 else maps
+
+# Fungsi untuk melatih regresi field penuh dari riwayat run dan menampilkan petanya
+def train_field_model():
+    if simulation_busy():
+        return
+    if flux_history is None:
+        messagebox.showerror("Error", "Tidak ada riwayat flux untuk model field.")
+        return
+    try:
+        basis = FIELD_BASES[field_basis_var.get()]
+        target_step = int(target_step_entry.get())
+        start = time.perf_counter()
+        with PROFILER.run("train_field_model", basis=basis, frames=len(history_steps)), \
+                PROFILER.phase("field_regression"):
+            model = fit_field_regression(flux_history, history_steps + step_offset + 1, basis,
+                                         total=flux_diagnostics["total"][history_steps], holdout=FIELD_HOLDOUT)
+            prediction = predict_field(model, target_step)
+        seconds = time.perf_counter() - start
+    except Exception as e:
+        messagebox.showerror("Error", f"Gagal melatih model field: {e}")
+        return
+    display_field_results(model, prediction, target_step, seconds)
+
+# Fungsi untuk menampilkan peta prediksi dan peta galat per sel model field
+def display_field_results(model, prediction, target_step, seconds):
+    result_window = tk.Toplevel(root)
+    result_window.title("Hasil Regresi Field Flux")
+
+    maps = [(prediction, f"Prediksi Langkah {target_step}"), (model["rmse"], "RMSE Fit per Sel")]
+    if model["holdout_rmse"] is not None:
+        maps.append((model["holdout_rmse"], "RMSE Ekstrapolasi (holdout)"))
+    fig_result, axes = plt.subplots(1, len(maps), figsize=(4.5 * len(maps), 4))
+    for ax_map, (values, title) in zip(np.atleast_1d(axes), maps):
+        im = ax_map.imshow(values, cmap='viridis', origin='lower', interpolation='none')
+        ax_map.set_title(title)
+        fig_result.colorbar(im, ax=ax_map, fraction=0.046)
+    fig_result.tight_layout()
+
+    canvas_result = FigureCanvasTkAgg(fig_result, master=result_window)
+    canvas_result.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
+
+    stats_frame = ttk.Frame(result_window)
+    stats_frame.grid(row=1, column=0, padx=10, pady=10)
+    basis = model["basis"] + (f" (laju {model['rate']:.3g})" if model["basis"] == "exp" else "")
+    ttk.Label(stats_frame, text=f"Basis: {basis}, {model['train_frames']} frame latih, {seconds:.2f} s").grid(
+        row=0, column=0, sticky="w")
+    ttk.Label(stats_frame, text=f"RMSE fit rata-rata: {model['rmse'].mean():.4e}").grid(row=1, column=0, sticky="w")
+    if model["holdout_rmse"] is not None:
+        ttk.Label(stats_frame, text=f"RMSE ekstrapolasi rata-rata: {model['holdout_rmse'].mean():.4e}").grid(
+            row=2, column=0, sticky="w")
+
+SURROGATE_RUNS = 40  # Jumlah run sweep untuk membangun surrogate
+SURROGATE_MAX_GRID = 64  # Grid sweep dibatasi agar sweep selesai dalam hitungan detik
+SURROGATE_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "surrogate_runs.npz")
+
+# Fungsi untuk memuat database run surrogate (sekali, saat pertama dibutuhkan)
+def surrogate_database():
+    global run_database
+    if run_database is None:
+        run_database = RunDatabase(SURROGATE_DB_PATH)
+    return run_database
+
+# Fungsi untuk menyimpan hasil run baru ke database surrogate; kegagalan tidak membatalkan run
+# dan hanya dilaporkan di label surrogate
+def record_surrogate_run(params, total, final_field):
+    try:
+        database = surrogate_database()
+        database.add(params, total, final_field)
+        database.save()
+    except Exception as e:
+        surrogate_label.config(text=f"Gagal menyimpan run ke database surrogate: {e}")
+
+# Fungsi untuk membaca parameter what-if dari isian GUI
+def surrogate_params():
+    return {"D": float(D_entry.get()), "Sigma_a": float(Sigma_a_entry.get()), "S": float(S_entry.get()),
+            "grid_size": int(grid_size_entry.get()), "heterogeneous": layout_var.get() == "Teras Heterogen"}
+
+# Solver asli untuk surrogate: hanya kurva total flux dan field akhir (tanpa riwayat)
+def surrogate_solver(params, time_steps):
+    grid = int(params["grid_size"])
+    diagnostics = empty_diagnostics(time_steps)
+    final, _ = calculate_flux(grid, time_steps, params["D"], params["Sigma_a"], params["S"],
+                              material_map=build_core_layout((grid, grid)) if params["heterogeneous"] else None,
+                              diagnostics=diagnostics, store_history=False)
+    return diagnostics["total"], final
+
+# Fungsi untuk membangun surrogate: sweep Latin hypercube di sekitar isian GUI (grid dibatasi
+# SURROGATE_MAX_GRID) di thread terpisah, lalu melatih GP dari seluruh database run
+def build_surrogate():
+    global simulation_thread
+    if simulation_busy():
+        return
+    try:
+        params = surrogate_params()
+        horizon = int(time_steps_entry.get())
+    except ValueError as e:
+        messagebox.showerror("Error", f"Input tidak valid: {e}")
+        return
+    grid = min(params["grid_size"], SURROGATE_MAX_GRID)
+    runs = sweep_parameters(params, SURROGATE_RUNS, grid_range=(max(grid // 2, 10), min(2 * grid, SURROGATE_MAX_GRID)))
+    database = surrogate_database()
+    progress, outcome = [0], {}
+
+    def produce():
+        try:
+            with PROFILER.run("build_surrogate", runs=len(runs), time_steps=horizon):
+                with PROFILER.phase("sweep"):
+                    for run in runs:
+                        database.add(run, *surrogate_solver(run, horizon))
+                        progress[0] += 1
+                database.save()
+                with PROFILER.phase("surrogate_fit"):
+                    outcome["result"] = FluxSurrogate(horizon).fit(database)
+        except Exception as e:
+            outcome["error"] = e
+
+    def poll():
+        global surrogate
+        if simulation_thread.is_alive():
+            surrogate_label.config(text=f"Sweep surrogate: {progress[0]}/{len(runs)} run")
+            root.after(LIVE_POLL_MS, poll)
+        elif "error" in outcome:
+            surrogate_label.config(text="")
+            messagebox.showerror("Error", f"Gagal membangun surrogate: {outcome['error']}")
+        else:
+            surrogate = outcome["result"]
+            validation = surrogate.validation
+            surrogate_label.config(text=(
+                f"Surrogate: {surrogate.n_runs} run, {len(surrogate.model['modes'])} mode POD\n"
+                f"Galat total (CV): {validation['total_rel_rmse']:.2%}, field: {validation['field_rel_error']:.2%}\n"
+                f"Cakupan 2 sigma: {validation['coverage_2sigma']:.0%}"))
+
+    simulation_thread = threading.Thread(target=produce, daemon=True)
+    simulation_thread.start()
+    root.after(LIVE_POLL_MS, poll)
+
+# Fungsi untuk prediksi what-if instan dari surrogate (fallback ke solver asli jika perlu)
+def predict_surrogate():
+    global simulation_thread
+    if surrogate is None:
+        messagebox.showerror("Error", "Surrogate belum dibangun.")
+        return
+    if simulation_busy():
+        return
+    try:
+        params = surrogate_params()
+        target_step = int(target_step_entry.get())
+    except ValueError as e:
+        messagebox.showerror("Error", f"Input tidak valid: {e}")
+        return
+    database = surrogate_database()
+    outcome = {}
+    summary = surrogate_label.cget("text")  # Ringkasan validasi surrogate, dipulihkan setelah query
+
+    # Query di thread terpisah: di luar domain latih query jatuh ke solver asli (calculate_flux
+    # penuh) yang tidak boleh membekukan GUI; di dalam domain jawabannya tetap dalam milidetik
+    def produce():
+        try:
+            with PROFILER.run("predict_surrogate", grid_size=params["grid_size"], step=target_step):
+                outcome["result"] = surrogate.query(params, target_step, solver=surrogate_solver, database=database)
+            if outcome["result"]["source"] == "solver":
+                database.save()
+        except Exception as e:
+            outcome["error"] = e
+
+    def poll():
+        if simulation_thread.is_alive():
+            surrogate_label.config(text="Prediksi surrogate: menjalankan solver asli...")
+            root.after(LIVE_POLL_MS, poll)
+            return
+        surrogate_label.config(text=summary)
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Gagal memprediksi dengan surrogate: {outcome['error']}")
+        else:
+            display_surrogate_results(outcome["result"], target_step)
+
+    simulation_thread = threading.Thread(target=produce, daemon=True)
+    simulation_thread.start()
+    root.after(LIVE_POLL_MS, poll)
+
+# Fungsi untuk menampilkan kurva total flux (pita 2 sigma) dan field akhir hasil surrogate
+def display_surrogate_results(result, target_step):
+    result_window = tk.Toplevel(root)
+    result_window.title("Prediksi Surrogate Flux")
+
+    fig_result, (ax_curve, ax_map) = plt.subplots(1, 2, figsize=(10, 4))
+    steps = np.arange(1, len(result["total"]) + 1)
+    ax_curve.plot(steps, result["total"], label="Total Flux")
+    band = np.exp(2 * result["total_rel_std"])
+    ax_curve.fill_between(steps, result["total"] / band, result["total"] * band, alpha=0.3, label="2 sigma")
+    ax_curve.axvline(target_step, color="gray", linestyle="--")
+    ax_curve.set_xlabel("Langkah Waktu")
+    ax_curve.set_ylabel("Total Flux")
+    ax_curve.legend()
+    im = ax_map.imshow(result["final_field"], cmap='viridis', origin='lower', interpolation='none')
+    ax_map.set_title(f"Field Akhir (Langkah {len(result['total'])})")
+    fig_result.colorbar(im, ax=ax_map, fraction=0.046)
+    fig_result.tight_layout()
+
+    canvas_result = FigureCanvasTkAgg(fig_result, master=result_window)
+    canvas_result.get_tk_widget().grid(row=0, column=0, padx=10, pady=10)
+
+    stats_frame = ttk.Frame(result_window)
+    stats_frame.grid(row=1, column=0, padx=10, pady=10)
+    source = "surrogate" if result["source"] == "surrogate" else f"solver ({result['reason']})"
+    ttk.Label(stats_frame, text=f"Sumber: {source}, {result['seconds'] * 1e3:.2f} ms").grid(row=0, column=0, sticky="w")
+    ttk.Label(stats_frame, text=(f"Total flux langkah {target_step}: {result['total_at_step']:.4e} "
+                                 f"± {result['rel_std_at_step']:.2%}")).grid(row=1, column=0, sticky="w")
+
+if __name__ == "__main__":
+    if "--scaling" in sys.argv:
+        benchmark_scaling()
+        sys.exit()
+
+    # GUI utama
+    root = tk.Tk()
+    root.title("Simulasi Flux Neutron 2D")
+
+    frame = ttk.Frame(root)
+    frame.grid(row=0, column=0, padx=10, pady=10)
+
+    # Input parameter
+    ttk.Label(frame, text="Grid Size:").grid(row=0, column=0, sticky="w")
+    grid_size_entry = ttk.Entry(frame)
+    grid_size_entry.grid(row=0, column=1)
+    grid_size_entry.insert(0, "50")
+
+    ttk.Label(frame, text="D (Difusi):").grid(row=1, column=0, sticky="w")
+    D_entry = ttk.Entry(frame)
+    D_entry.grid(row=1, column=1)
+    D_entry.insert(0, "1.0")
+
+    ttk.Label(frame, text="Sigma_a (Absorpsi):").grid(row=2, column=0, sticky="w")
+    Sigma_a_entry = ttk.Entry(frame)
+    Sigma_a_entry.grid(row=2, column=1)
+    Sigma_a_entry.insert(0, "0.1")
+
+    ttk.Label(frame, text="S (Sumber):").grid(row=3, column=0, sticky="w")
+    S_entry = ttk.Entry(frame)
+    S_entry.grid(row=3, column=1)
+    S_entry.insert(0, "1.0")
+
+    ttk.Label(frame, text="Time Steps:").grid(row=4, column=0, sticky="w")
+    time_steps_entry = ttk.Entry(frame)
+    time_steps_entry.grid(row=4, column=1)
+    time_steps_entry.insert(0, "300")
+
+    ttk.Label(frame, text="Workers (Core):").grid(row=5, column=0, sticky="w")
+    workers_entry = ttk.Entry(frame)
+    workers_entry.grid(row=5, column=1)
+    workers_entry.insert(0, str(os.cpu_count() or 1))
+
+    ttk.Label(frame, text="Layout Material:").grid(row=6, column=0, sticky="w")
+    layout_var = tk.StringVar(value="Seragam")
+    ttk.Combobox(frame, textvariable=layout_var, values=["Seragam", "Teras Heterogen"],
+                 state="readonly", width=17).grid(row=6, column=1)
+    material_hint = ttk.Label(frame, text="")
+    material_hint.grid(row=6, column=2, sticky="w")
+    layout_var.trace_add("write", update_material_entries)
+
+    ttk.Label(frame, text="Presisi:").grid(row=7, column=0, sticky="w")
+    precision_var = tk.StringVar(value="float64")
+    ttk.Combobox(frame, textvariable=precision_var, values=list(PRECISIONS),
+                 state="readonly", width=17).grid(row=7, column=1)
+
+    ttk.Label(frame, text="Checkpoint Tiap (langkah, 0 = mati):").grid(row=8, column=0, sticky="w")
+    checkpoint_entry = ttk.Entry(frame)
+    checkpoint_entry.grid(row=8, column=1)
+    checkpoint_entry.insert(0, "0")
+
+    ttk.Label(frame, text="Kecepatan Putar (langkah/s):").grid(row=9, column=0, sticky="w")
+    speed_entry = ttk.Entry(frame)
+    speed_entry.grid(row=9, column=1)
+    speed_entry.insert(0, str(PLAYBACK_FPS))
+
+    ttk.Label(frame, text="Basis Regresi Field:").grid(row=10, column=0, sticky="w")
+    field_basis_var = tk.StringVar(value="Eksponensial")
+    ttk.Combobox(frame, textvariable=field_basis_var, values=list(FIELD_BASES),
+                 state="readonly", width=17).grid(row=10, column=1)
+
+    ttk.Label(frame, text="Prediksi Langkah:").grid(row=11, column=0, sticky="w")
+    target_step_entry = ttk.Entry(frame)
+    target_step_entry.grid(row=11, column=1)
+    target_step_entry.insert(0, "600")
+
+    # Tombol kontrol
+    ttk.Button(frame, text="Estimate Run", command=estimate_run).grid(row=12, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Run Simulation", command=run_simulation).grid(row=13, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Resume from Checkpoint", command=resume_simulation).grid(row=14, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Start Animation", command=start_animation).grid(row=15, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Stop Animation", command=stop_animation).grid(row=16, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Save Animation", command=save_animation).grid(row=17, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Save Thumbnails", command=save_thumbnails).grid(row=18, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Save Data", command=save_data).grid(row=19, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Train Regression Model", command=train_regression_model).grid(row=20, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Train Field Model", command=train_field_model).grid(row=21, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Build Surrogate", command=build_surrogate).grid(row=22, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Predict (Surrogate)", command=predict_surrogate).grid(row=23, column=0, pady=5, columnspan=2)
+
+    precision_label = ttk.Label(frame, text="")
+    precision_label.grid(row=24, column=0, columnspan=2, sticky="w")
+
+    # Rencana run (strategi riwayat, memori, waktu, ukuran ekspor)
+    plan_label = ttk.Label(frame, text="", justify="left")
+    plan_label.grid(row=25, column=0, columnspan=2, sticky="w")
+
+    # Ringkasan validasi surrogate
+    surrogate_label = ttk.Label(frame, text="", justify="left")
+    surrogate_label.grid(row=26, column=0, columnspan=2, sticky="w")
+
+    # Matplotlib Figure
+    fig, ax = plt.subplots(figsize=(6, 6))
+    canvas = FigureCanvasTkAgg(fig, master=root)
+    canvas.get_tk_widget().grid(row=0, column=1)
+
+    # Timeline: slider hanya memicu seek saat digeser pengguna (variabel diperbarui oleh playback)
+    timeline_frame = ttk.Frame(root)
+    timeline_frame.grid(row=1, column=1, sticky="we", padx=10)
+    timeline_var = tk.DoubleVar(value=0)
+    timeline = ttk.Scale(timeline_frame, from_=0, to=0, orient="horizontal", variable=timeline_var,
+                         command=lambda value: playback.seek(round(float(value))))
+    timeline.pack(fill="x")
+    timeline_label = ttk.Label(timeline_frame, text="", anchor="w")
+    timeline_label.pack(fill="x")
+    playback = PlaybackController(root, render_playback, on_position=show_position)
+
+    # Status bar profiling (aktif dengan --profile atau FLUX_PROFILE=1)
+    PROFILER.status_bar(root, row=2)
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.mainloop()
@@ -0,0 +1,309 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import os
+import time
+import threading
+from phase_profiler import PROFILER
+
+# Global variables
+flux = None
+outputs = None
+
+# Batas waktu tunggu barrier per langkah (detik); worker yang mati tidak lagi membuat semua proses menggantung
+BARRIER_TIMEOUT = 60.0
+
+# Fungsi untuk satu langkah stencil 7 titik transien pada bidang z [z_start, z_stop)
+def stencil_planes(flux, flux_new, z_start, z_stop, D, Sigma_a, S, dt, dx):
+    center = flux[z_start:z_stop, 1:-1, 1:-1]
+    laplacian = (flux[z_start+1:z_stop+1, 1:-1, 1:-1] + flux[z_start-1:z_stop-1, 1:-1, 1:-1]
+                 + flux[z_start:z_stop, 2:, 1:-1] + flux[z_start:z_stop, :-2, 1:-1]
+                 + flux[z_start:z_stop, 1:-1, 2:] + flux[z_start:z_stop, 1:-1, :-2] - 6 * center) / dx**2
+    flux_new[z_start:z_stop, 1:-1, 1:-1] = center + dt * (D * laplacian - Sigma_a * center + S)
+
+# Fungsi untuk satu iterasi Jacobi steady-state 7 titik pada bidang z [z_start, z_stop)
+# Sumber titik sebesar S berada di pusat reaktor, seperti pada solver steady 2D
+def jacobi_planes(flux, flux_new, z_start, z_stop, D, Sigma_a, S, dx):
+    neighbors = (flux[z_start+1:z_stop+1, 1:-1, 1:-1] + flux[z_start-1:z_stop-1, 1:-1, 1:-1]
+                 + flux[z_start:z_stop, 2:, 1:-1] + flux[z_start:z_stop, :-2, 1:-1]
+                 + flux[z_start:z_stop, 1:-1, 2:] + flux[z_start:z_stop, 1:-1, :-2])
+    flux_new[z_start:z_stop, 1:-1, 1:-1] = D / dx**2 * neighbors / (6 * D / dx**2 + Sigma_a)
+    center = flux.shape[0] // 2
+    if z_start <= center < z_stop:
+        c = flux.shape[1] // 2
+        flux_new[center, c, c] += S / (6 * D / dx**2 + Sigma_a)
+
+# Fungsi worker: setiap proses memiliki satu slab z dan membaca bidang halo tetangganya
+# langsung dari memori bersama. Barrier per langkah menjamin semua bidang halo sudah
+# diperbarui sebelum dibaca. Perubahan lokal (mode steady) ditulis ke slot residual
+# yang berselang-seling antar langkah agar tidak tertimpa sebelum dibaca.
+# Jika worker gagal, barrier dibatalkan agar proses lain langsung berhenti menunggu
+def slab_worker(names, shape, z_start, z_stop, worker_index, params, barrier, time_steps, mode, tol):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        buffers = [np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks[:2]]
+        residual = np.ndarray((2, params["num_workers"]), dtype=np.float64, buffer=blocks[2].buf)
+        for n in range(time_steps):
+            current, new = buffers[n % 2], buffers[(n + 1) % 2]
+            if mode == "steady":
+                jacobi_planes(current, new, z_start, z_stop, params["D"], params["Sigma_a"], params["S"], params["dx"])
+                residual[n % 2, worker_index] = np.sum((new[z_start:z_stop] - current[z_start:z_stop]) ** 2)
+            else:
+                stencil_planes(current, new, z_start, z_stop, params["D"], params["Sigma_a"], params["S"],
+                               params["dt"], params["dx"])
+            barrier.wait(params["timeout"])
+            if mode == "steady" and np.sqrt(residual[n % 2].sum()) < tol:
+                break
+    except threading.BrokenBarrierError:
+        pass  # Proses lain gagal atau terlambat; proses utama yang melaporkan errornya
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        for block in blocks:
+            block.close()
+
+# Fungsi untuk menyimpan keluaran bertahap: irisan z terpilih dan peta terintegrasi aksial
+class SliceStream:
+    def __init__(self, shape, slices, every, max_outputs, output_path=None, dx=1.0):
+        nz, ny, nx = shape
+        self.slices = list(slices)
+        self.every = every
+        self.dx = dx
+        self.count = 0
+        self.steps = []
+        if output_path is not None:
+            self.slice_data = np.lib.format.open_memmap(f"{output_path}_slices.npy", mode="w+", dtype=np.float64,
+                                                        shape=(max_outputs, len(self.slices), ny, nx))
+            self.axial_data = np.lib.format.open_memmap(f"{output_path}_axial.npy", mode="w+", dtype=np.float64,
+                                                        shape=(max_outputs, ny, nx))
+        else:
+            self.slice_data = np.zeros((max_outputs, len(self.slices), ny, nx))
+            self.axial_data = np.zeros((max_outputs, ny, nx))
+        self.output_path = output_path
+
+    def record(self, step, field):
+        if step % self.every != 0 or self.count >= len(self.axial_data):
+            return
+        self.slice_data[self.count] = field[self.slices]
+        self.axial_data[self.count] = field.sum(axis=0) * self.dx
+        self.steps.append(step)
+        self.count += 1
+
+    def finish(self):
+        if self.output_path is not None:
+            self.slice_data.flush()
+            self.axial_data.flush()
+            np.save(f"{self.output_path}_steps.npy", np.array(self.steps))
+        return {
+            "steps": np.array(self.steps),
+            "slices": self.slice_data[:self.count],
+            "slice_index": self.slices,
+            "axial": self.axial_data[:self.count],
+        }
+
+# Fungsi untuk menghitung flux neutron 3D dengan dekomposisi domain slab z
+# mode="transient" mengikuti calculate_flux 2D transien (pulsa awal di pusat, sumber S seragam);
+# mode="steady" mengikuti solver steady 2D (iterasi Jacobi dengan sumber titik S di pusat)
+# Jika satu langkah melebihi barrier_timeout detik atau ada worker yang mati, semua worker
+# dihentikan, memori bersama dibersihkan, dan RuntimeError dilempar
+def calculate_flux_3d(grid_size, time_steps, D, Sigma_a, S, num_workers=None, mode="transient", tol=1e-5,
+                      output_slices=None, output_every=10, output_path=None, barrier_timeout=BARRIER_TIMEOUT):
+    dx = 1.0  # Ukuran grid
+    dt = 0.01  # Langkah waktu
+    shape = (grid_size, grid_size, grid_size)
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, grid_size - 2))
+    output_slices = output_slices if output_slices is not None else [grid_size // 2]
+    stream = SliceStream(shape, output_slices, output_every, time_steps // output_every + 1, output_path, dx)
+    params = {"D": D, "Sigma_a": Sigma_a, "S": S, "dt": dt, "dx": dx, "num_workers": num_workers,
+              "timeout": barrier_timeout}
+
+    nbytes = int(np.prod(shape)) * 8
+    blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(2)]
+    blocks.append(shared_memory.SharedMemory(create=True, size=2 * num_workers * 8))
+    workers = []
+    try:
+        buffers = [np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks[:2]]
+        residual = np.ndarray((2, num_workers), dtype=np.float64, buffer=blocks[2].buf)
+        for buffer in buffers:
+            buffer.fill(0.0)
+        residual.fill(np.inf)
+        if mode == "transient":
+            buffers[0][grid_size // 2, grid_size // 2, grid_size // 2] = 1.0  # Sumber neutron awal
+        stream.record(0, buffers[0])
+
+        slabs = [(int(z[0]), int(z[-1]) + 1)
+                 for z in np.array_split(np.arange(1, grid_size - 1), num_workers) if len(z)]
+        # Proses utama ikut barrier agar bisa mengalirkan irisan di setiap langkah
+        barrier = mp.Barrier(len(slabs) + 1)
+        names = [block.name for block in blocks]
+        workers = [mp.Process(target=slab_worker, args=(names, shape, z0, z1, index, params, barrier,
+                                                        time_steps, mode, tol))
+                   for index, (z0, z1) in enumerate(slabs)]
+        for worker in workers:
+            worker.start()
+
+        steps_done = 0
+        for n in range(time_steps):
+            # Waktu tunggu barrier proses utama = waktu stencil slab paling lambat
+            with PROFILER.phase("stencil"):
+                try:
+                    barrier.wait(barrier_timeout)
+                except threading.BrokenBarrierError:
+                    for worker in workers:
+                        worker.join(1.0)  # Beri waktu worker yang gagal untuk keluar dan mencatat exitcode
+                    failed = [index for index, worker in enumerate(workers) if worker.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(f"Worker slab {failed} berhenti dengan error pada langkah {n + 1}") from None
+                    raise RuntimeError(f"Langkah {n + 1} melebihi batas waktu {barrier_timeout:g} s") from None
+            steps_done = n + 1
+            PROFILER.count("steps")
+            # Buffer hasil langkah ini baru akan ditimpa setelah barrier berikutnya
+            with PROFILER.phase("output"):
+                stream.record(steps_done, buffers[steps_done % 2])
+            if mode == "steady" and np.sqrt(residual[n % 2].sum()) < tol:
+                break
+        for worker in workers:
+            worker.join()
+        failed = [index for index, worker in enumerate(workers) if worker.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Worker slab {failed} berhenti dengan error")
+
+        flux = buffers[steps_done % 2].copy()
+        if steps_done % output_every != 0:
+            stream.every = 1
+            stream.record(steps_done, flux)
+        result = stream.finish()
+        result["iterations"] = steps_done
+        return flux, result
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+# Fungsi untuk menjalankan simulasi dari GUI
+def run_simulation():
+    global flux, outputs
+    grid_size = int(grid_size_entry.get())
+    time_steps = int(time_steps_entry.get())
+    D = float(D_entry.get())
+    Sigma_a = float(Sigma_a_entry.get())
+    S = float(S_entry.get())
+    num_workers = int(workers_entry.get())
+    mode = "steady" if mode_var.get() == "Steady-State" else "transient"
+    output_path = stream_path_var.get().strip() or None
+
+    start = time.perf_counter()
+    try:
+        with PROFILER.run("run_simulation", grid_size=grid_size, time_steps=time_steps, workers=num_workers, mode=mode):
+            flux, outputs = calculate_flux_3d(grid_size, time_steps, D, Sigma_a, S, num_workers=num_workers, mode=mode,
+                                              output_path=output_path)
+    except Exception as e:
+        messagebox.showerror("Error", f"Gagal menjalankan simulasi: {e}")
+        return
+    elapsed = time.perf_counter() - start
+    status = f"Selesai: {outputs['iterations']} langkah dalam {elapsed:.2f} s"
+    if output_path is not None:
+        status += f"\nIrisan dialirkan ke {output_path}_slices.npy / _axial.npy / _steps.npy"
+    status_label.config(text=status)
+    show_outputs()
+
+# Fungsi untuk memilih prefix file tempat irisan dialirkan langsung ke disk selama run
+# (kosongkan untuk menyimpan keluaran di memori)
+def choose_stream_path():
+    filepath = filedialog.asksaveasfilename(title="Prefix File Irisan", filetypes=[("NumPy files", "*.npy")])
+    if filepath:
+        stream_path_var.set(os.path.splitext(filepath)[0])
+
+# Fungsi untuk menampilkan irisan tengah dan peta terintegrasi aksial terakhir
+def show_outputs():
+    for ax in axes:
+        ax.clear()
+    axes[0].imshow(outputs["slices"][-1][0], cmap="hot", interpolation="nearest", origin="lower")
+    axes[0].set_title(f"Irisan z = {outputs['slice_index'][0]}")
+    axes[1].imshow(outputs["axial"][-1], cmap="hot", interpolation="nearest", origin="lower")
+    axes[1].set_title("Flux Terintegrasi Aksial")
+    canvas.draw()
+
+# Fungsi untuk menyimpan keluaran ke file NumPy
+def save_data():
+    if outputs is None:
+        messagebox.showerror("Error", "Tidak ada data untuk disimpan.")
+        return
+    filepath = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("NumPy files", "*.npz")])
+    if filepath:
+        with PROFILER.export("save_data", filepath):
+            np.savez_compressed(filepath, steps=outputs["steps"], slices=outputs["slices"],
+                                slice_index=outputs["slice_index"], axial=outputs["axial"])
+        messagebox.showinfo("Berhasil", f"Data disimpan di {filepath}")
+
+if __name__ == "__main__":
+    # GUI utama
+    root = tk.Tk()
+    root.title("Simulasi Flux Neutron 3D")
+
+    frame = ttk.Frame(root)
+    frame.grid(row=0, column=0, padx=10, pady=10)
+
+    # Input parameter
+    ttk.Label(frame, text="Grid Size:").grid(row=0, column=0, sticky="w")
+    grid_size_entry = ttk.Entry(frame)
+    grid_size_entry.grid(row=0, column=1)
+    grid_size_entry.insert(0, "64")
+
+    ttk.Label(frame, text="D (Difusi):").grid(row=1, column=0, sticky="w")
+    D_entry = ttk.Entry(frame)
+    D_entry.grid(row=1, column=1)
+    D_entry.insert(0, "1.0")
+
+    ttk.Label(frame, text="Sigma_a (Absorpsi):").grid(row=2, column=0, sticky="w")
+    Sigma_a_entry = ttk.Entry(frame)
+    Sigma_a_entry.grid(row=2, column=1)
+    Sigma_a_entry.insert(0, "0.1")
+
+    ttk.Label(frame, text="S (Sumber):").grid(row=3, column=0, sticky="w")
+    S_entry = ttk.Entry(frame)
+    S_entry.grid(row=3, column=1)
+    S_entry.insert(0, "1.0")
+
+    ttk.Label(frame, text="Time Steps / Iterasi:").grid(row=4, column=0, sticky="w")
+    time_steps_entry = ttk.Entry(frame)
+    time_steps_entry.grid(row=4, column=1)
+    time_steps_entry.insert(0, "300")
+
+    ttk.Label(frame, text="Workers (Proses):").grid(row=5, column=0, sticky="w")
+    workers_entry = ttk.Entry(frame)
+    workers_entry.grid(row=5, column=1)
+    workers_entry.insert(0, str(os.cpu_count() or 1))
+
+    ttk.Label(frame, text="Mode:").grid(row=6, column=0, sticky="w")
+    mode_var = tk.StringVar(value="Transien")
+    ttk.Combobox(frame, textvariable=mode_var, values=["Transien", "Steady-State"],
+                 state="readonly", width=17).grid(row=6, column=1)
+
+    ttk.Label(frame, text="Stream Irisan ke Disk:").grid(row=7, column=0, sticky="w")
+    stream_path_var = tk.StringVar(value="")
+    ttk.Entry(frame, textvariable=stream_path_var).grid(row=7, column=1)
+    ttk.Button(frame, text="Pilih...", command=choose_stream_path).grid(row=7, column=2)
+
+    # Tombol kontrol
+    ttk.Button(frame, text="Run Simulation", command=run_simulation).grid(row=8, column=0, pady=5, columnspan=2)
+    ttk.Button(frame, text="Save Data", command=save_data).grid(row=9, column=0, pady=5, columnspan=2)
+    status_label = ttk.Label(frame, text="")
+    status_label.grid(row=10, column=0, columnspan=2)
+    PROFILER.status_bar(frame, row=11)
+
+    # Matplotlib Figure
+    fig, axes = plt.subplots(1, 2, figsize=(10, 5))
+    canvas = FigureCanvasTkAgg(fig, master=root)
+    canvas.get_tk_widget().grid(row=0, column=1)
+
+    root.mainloop()
@@ -0,0 +1,404 @@
+import argparse
+import ast
+import importlib.util
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Benchmark berjalan tanpa jendela GUI
+import matplotlib.pyplot as plt
+
+from phase_profiler import PROFILER
+
+# Skrip yang diukur, dimuat langsung dari folder repositori
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = {
+    "steady": "1.1 Pemodelan Flux Neutron Radionuklida 2D.py",
+    "reference": "1.2 Pemodelan Flux Neutron Radionuklida 2D.py",
+    "transient": "1.6 Pemodelan dan Prediksi Berbasis Regresi Linear Flux Neutron Radionuklida 2D.py",
+    "flux_3d": "1.7 Pemodelan Flux Neutron Radionuklida 3D.py",
+    "decay": "1.3_SImulasi Peluruhan Radioaktif Bahan Bakar U235 Pu239 Th232 Berbasis Python3.py",
+    "geiger": "1.4_Simulasi Geiger Counter Bahan Bakar U235 Pu239 Th232 Berbasis Python3.py",
+}
+
+# Matriks ukuran bawaan dan versi cepat (--quick)
+MATRIX = {
+    "grid_sizes": [50, 100, 200, 400],
+    "time_steps": [50, 200],
+    "particle_counts": [1000, 10000, 100000],
+}
+QUICK_MATRIX = {
+    "grid_sizes": [50, 100],
+    "time_steps": [20],
+    "particle_counts": [1000, 10000],
+}
+
+# Fungsi untuk memuat skrip repositori sebagai modul (GUI hanya berjalan di bawah __main__)
+def load_script(key):
+    path = os.path.join(SCRIPT_DIR, SCRIPTS[key])
+    spec = importlib.util.spec_from_file_location(f"bench_{key}", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Fungsi untuk mengambil satu fungsi dari skrip tanpa menjalankan GUI tingkat modulnya
+# Dipakai untuk implementasi referensi (loop asli) di skrip yang membuat jendela Tk saat diimpor
+def load_function(key, name):
+    path = os.path.join(SCRIPT_DIR, SCRIPTS[key])
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name]
+    namespace = {"np": np, "PROFILER": PROFILER}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), path, "exec"), namespace)
+    return namespace[name]
+
+# Implementasi referensi solver steady 1.1 (loop Jacobi asli) untuk pemeriksaan golden
+def reference_steady_flux(shape, D, Sigma_a, S, max_iter=500, tol=1e-5):
+    nx, ny = shape
+    flux = np.zeros((nx, ny))
+    for _ in range(max_iter):
+        flux_new = np.copy(flux)
+        for i in range(1, nx - 1):
+            for j in range(1, ny - 1):
+                flux_new[i, j] = (S[i, j] + D * (flux[i+1, j] + flux[i-1, j] + flux[i, j+1] + flux[i, j-1])) / (4 * D + Sigma_a[i, j])
+        if np.linalg.norm(flux_new - flux) < tol:
+            break
+        flux = flux_new
+    return flux
+
+# Implementasi referensi langkah peluruhan per partikel dengan urutan bilangan acak yang sama
+def reference_decay_step(positions, alive, decay_prob, rng):
+    moves = rng.random(positions.shape)
+    draws = rng.random(len(alive))
+    for i in range(len(alive)):
+        if alive[i]:
+            for axis in range(2):
+                positions[i, axis] = min(max(positions[i, axis] + (moves[i, axis] - 0.5) * 0.1, 0), 1)
+            if draws[i] < decay_prob:
+                alive[i] = False
+
+# Fungsi untuk mengukur waktu: fungsi dijalankan `repeat` kali, dicatat minimum dan median
+# Jika `setup` diberikan, hasilnya (dibuat baru tiap pengulangan, di luar waktu) diteruskan ke func
+def measure(func, repeat=3, setup=None):
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return {"seconds": min(timings), "median": float(np.median(timings)), "repeat": repeat}
+
+# Fungsi untuk membuat fungsi pengganti dialog Tk selama benchmark ekspor
+# Dialog simpan mengembalikan `path`; pesan error dicatat agar kegagalan (mis. ffmpeg atau
+# xlsxwriter tidak terpasang) dilaporkan sebagai kasus yang dilewati
+def headless_dialogs(module, path):
+    errors = []
+    module.filedialog = SimpleNamespace(asksaveasfilename=lambda **kwargs: path)
+    module.messagebox = SimpleNamespace(showinfo=lambda *args: None,
+                                        showerror=lambda title, message: errors.append(message))
+    return errors
+
+# Kasus benchmark solver transien, steady, dan 3D
+def bench_solvers(matrix, repeat, workers):
+    transient, steady = load_script("transient"), load_script("steady")
+    results = []
+    for n in matrix["grid_sizes"]:
+        for steps in matrix["time_steps"]:
+            for num_workers, dtype in ((1, np.float64), (workers, np.float64), (1, np.float32)):
+                timing = measure(lambda: transient.calculate_flux(n, steps, 1.0, 0.1, 1.0, num_workers=num_workers,
+                                                                  dtype=dtype), repeat)
+                results.append({"case": "transient.calculate_flux",
+                                "params": {"grid_size": n, "time_steps": steps, "workers": num_workers,
+                                           "dtype": np.dtype(dtype).name}, **timing})
+
+        S = np.zeros((n, n))
+        S[n // 2, n // 2] = 1.0
+        Sigma_a = np.full((n, n), 0.02)
+        timing = measure(lambda: steady.calculate_flux((n, n), 1.0, Sigma_a, S), repeat)
+        results.append({"case": "steady.calculate_flux", "params": {"grid_size": n}, **timing})
+        for method in ("fmg", "pcg"):
+            timing = measure(lambda: steady.calculate_flux_multigrid((n, n), 1.0, Sigma_a, S, method=method), repeat)
+            results.append({"case": "steady.calculate_flux_multigrid", "params": {"grid_size": n, "method": method},
+                            **timing})
+
+    # Solver 3D memakai proses; pada start method selain fork, modul yang dimuat dari path
+    # tidak dapat diimpor ulang oleh proses anak sehingga kasus ini dilewati
+    if mp.get_start_method() == "fork":
+        flux_3d = load_script("flux_3d")
+        for n in matrix["grid_sizes"][:2]:
+            for steps in matrix["time_steps"]:
+                timing = measure(lambda: flux_3d.calculate_flux_3d(min(n, 64), steps, 1.0, 0.1, 1.0,
+                                                                   num_workers=workers), repeat)
+                results.append({"case": "flux_3d.calculate_flux_3d",
+                                "params": {"grid_size": min(n, 64), "time_steps": steps, "workers": workers}, **timing})
+    return results
+
+# Kasus benchmark rendering animasi (update per frame termasuk menggambar kanvas)
+def bench_rendering(matrix, repeat, frames=20):
+    transient, steady = load_script("transient"), load_script("steady")
+    results = []
+    for n in matrix["grid_sizes"]:
+        transient.flux_diagnostics = transient.empty_diagnostics(frames)
+        _, history = transient.calculate_flux(n, frames, 1.0, 0.1, 1.0, diagnostics=transient.flux_diagnostics)
+        transient.fig, transient.ax = plt.subplots(figsize=(6, 6))
+        transient.colorbar = None
+        transient.flux_history = history
+        transient.history_steps = np.arange(frames)
+
+        def render_transient():
+            for frame in range(frames):
+                transient.update_animation(frame)
+                transient.fig.canvas.draw()
+
+        timing = measure(render_transient, repeat)
+        timing["seconds_per_frame"] = timing["seconds"] / frames
+        results.append({"case": "transient.update_animation", "params": {"grid_size": n, "frames": frames}, **timing})
+        plt.close(transient.fig)
+
+        fig, ax = plt.subplots()
+        im = ax.imshow(history[-1], cmap="hot", interpolation="nearest", origin="lower")
+
+        def render_steady():
+            for frame in range(frames):
+                steady.update(frame, im, history)
+                fig.canvas.draw()
+
+        timing = measure(render_steady, repeat)
+        timing["seconds_per_frame"] = timing["seconds"] / frames
+        results.append({"case": "steady.update", "params": {"grid_size": n, "frames": frames}, **timing})
+        plt.close(fig)
+    return results
+
+# Kasus benchmark ekspor (save_data, save_animation) dan pelatihan regresi
+def bench_export(matrix, repeat):
+    from matplotlib.animation import writers
+
+    transient = load_script("transient")
+    results = []
+    folder = tempfile.mkdtemp(prefix="benchmark_")
+    n = matrix["grid_sizes"][0]
+    for steps in matrix["time_steps"]:
+        transient.flux_diagnostics = transient.empty_diagnostics(steps)
+        transient.flux, transient.flux_history = transient.calculate_flux(n, steps, 1.0, 0.1, 1.0,
+                                                                          diagnostics=transient.flux_diagnostics)
+        transient.history_steps = np.arange(steps)
+        transient.regression_model = None
+        params = {"grid_size": n, "time_steps": steps}
+
+        errors = headless_dialogs(transient, os.path.join(folder, "data.xlsx"))
+        timing = measure(transient.save_data, repeat)
+        status = {"status": "skipped", "reason": errors[0]} if errors else {"status": "ok"}
+        results.append({"case": "transient.save_data", "params": params, **timing, **status})
+
+        # Jendela hasil tidak dibuka; yang diukur hanya pelatihan dan evaluasi model
+        transient.display_results = lambda *args, **kwargs: None
+        timing = measure(transient.train_regression_model, repeat)
+        results.append({"case": "transient.train_regression_model", "params": params, **timing, "status": "ok"})
+
+        if not writers.is_available("ffmpeg"):
+            results.append({"case": "transient.save_animation", "params": params, "status": "skipped",
+                            "reason": "ffmpeg tidak tersedia"})
+            continue
+        transient.fig, transient.ax = plt.subplots(figsize=(6, 6))
+        transient.colorbar = None
+        transient.playback = transient.PlaybackController(None, None)  # Tanpa Tk; hanya dijeda save_animation
+        errors = headless_dialogs(transient, os.path.join(folder, "animation.mp4"))
+        timing = measure(transient.save_animation, 1)
+        status = {"status": "skipped", "reason": errors[0]} if errors else {"status": "ok"}
+        results.append({"case": "transient.save_animation", "params": params, **timing, **status})
+        plt.close(transient.fig)
+    return results
+
+# Jendela detektor benchmark Geiger: dua jendela yang tumpang tindih, agar jalur sel tepi ikut terukur
+DECAY_DETECTORS = [[0.1, 0.1, 0.6, 0.6], [0.4, 0.4, 0.9, 0.9]]
+
+# Kasus benchmark mesin peluruhan: fungsi update animasi asli tiap skrip (langkah partikel,
+# scatter, dan pada Geiger juga DetectorIndex, DoseSeries, dan draw_idle figur dosis), serta replika Geiger
+def bench_decay(matrix, repeat, frames=50):
+    decay, geiger = load_script("decay"), load_script("geiger")
+    material = "U-235"
+    results = []
+    for num_particles in matrix["particle_counts"]:
+        mass = num_particles / 100
+        builders = {
+            "decay": lambda: decay.build_decay_figure(material, mass, seed=0),
+            "geiger": lambda: geiger.build_decay_figures(material, mass, DECAY_DETECTORS, np.random.SeedSequence(0)),
+        }
+        for key, build in builders.items():
+            opened = []
+
+            def setup():
+                *figures, update = build()
+                opened.extend(figures)
+                return update
+
+            def run_frames(update):
+                for frame in range(frames):
+                    update(frame)
+
+            timing = measure(run_frames, repeat, setup=setup)
+            for fig in opened:
+                plt.close(fig)
+            timing["seconds_per_frame"] = timing["seconds"] / frames
+            results.append({"case": f"{key}.update", "params": {"particles": num_particles, "frames": frames}, **timing})
+
+        seed = np.random.SeedSequence(0)
+        timing = measure(lambda: geiger.simulate_replica(material, mass, 200, seed, DECAY_DETECTORS), repeat)
+        results.append({"case": "geiger.simulate_replica", "params": {"particles": num_particles, "frames": 200},
+                        **timing})
+    return results
+
+# Pemeriksaan golden: jalur yang dioptimasi harus cocok dengan numerik referensi
+def golden_checks(workers):
+    transient, steady, decay, geiger = (load_script(key) for key in ("transient", "steady", "decay", "geiger"))
+    reference_transient = load_function("reference", "calculate_flux")
+    checks = []
+
+    def record(name, expected, actual, tolerance=0.0):
+        error = float(np.max(np.abs(np.asarray(actual, dtype=float) - np.asarray(expected, dtype=float))))
+        scale = float(np.max(np.abs(expected))) or 1.0
+        checks.append({"check": name, "max_error": error, "relative_error": error / scale,
+                       "tolerance": tolerance, "passed": error / scale <= tolerance})
+
+    # Transien 2D: hasil harus identik bit demi bit dengan loop asli
+    expected, expected_history = reference_transient(40, 30, 1.0, 0.1, 1.0)
+    for num_workers in (1, workers):
+        flux, history = transient.calculate_flux(40, 30, 1.0, 0.1, 1.0, num_workers=num_workers)
+        record(f"transient.calculate_flux workers={num_workers}", np.array(expected_history), np.array(history))
+    flux, _ = transient.calculate_flux(40, 30, 1.0, 0.1, 1.0, dtype=np.float32)
+    record("transient.calculate_flux float32", expected, flux, tolerance=1e-5)
+
+    # Diagnostik per langkah harus sama dengan pemindaian ulang riwayat referensi
+    diagnostics = transient.empty_diagnostics(30)
+    transient.calculate_flux(40, 30, 1.0, 0.1, 1.0, num_workers=workers, diagnostics=diagnostics)
+    record("transient diagnostics total", [np.sum(frame) for frame in expected_history], diagnostics["total"],
+           tolerance=1e-12)
+    record("transient diagnostics peak", [np.max(frame) for frame in expected_history], diagnostics["peak"])
+
+    # Steady 2D: Jacobi tervektorisasi identik dengan loop asli; multigrid cocok dengan solusi langsung
+    n = 30
+    S = np.zeros((n, n))
+    S[n // 2, n // 2] = 1.0
+    Sigma_a = np.full((n, n), 0.02)
+    record("steady.calculate_flux", reference_steady_flux((n, n), 1.0, Sigma_a, S),
+           steady.calculate_flux((n, n), 1.0, Sigma_a, S))
+    from scipy.sparse.linalg import spsolve
+    operator = steady.assemble_diffusion_operator(np.ones((n, n)), Sigma_a)
+    direct = np.zeros((n, n))
+    direct[1:-1, 1:-1] = spsolve(operator, S[1:-1, 1:-1].ravel()).reshape(n - 2, n - 2)
+    for method in ("vcycle", "fmg", "pcg"):
+        solution = steady.calculate_flux_multigrid((n, n), 1.0, Sigma_a, S, method=method, tol=1e-10)
+        record(f"steady.calculate_flux_multigrid {method}", direct, solution["flux"], tolerance=1e-8)
+
+    # 3D: solver multi-proses identik dengan stencil serial
+    if mp.get_start_method() == "fork":
+        flux_3d = load_script("flux_3d")
+        n, steps = 16, 10
+        serial = [np.zeros((n, n, n)), np.zeros((n, n, n))]
+        serial[0][n // 2, n // 2, n // 2] = 1.0
+        for step in range(steps):
+            flux_3d.stencil_planes(serial[step % 2], serial[(step + 1) % 2], 1, n - 1, 1.0, 0.1, 1.0, 0.01, 1.0)
+        flux, _ = flux_3d.calculate_flux_3d(n, steps, 1.0, 0.1, 1.0, num_workers=workers)
+        record("flux_3d.calculate_flux_3d", serial[steps % 2], flux)
+
+    # Peluruhan: langkah array identik dengan loop per partikel pada aliran acak yang sama
+    for key, module in (("decay", decay), ("geiger", geiger)):
+        num_particles = 500
+        rng, rng_ref = np.random.default_rng(1), np.random.default_rng(1)
+        positions = rng.random((num_particles, 2))
+        positions_ref = rng_ref.random((num_particles, 2))
+        alive = np.ones(num_particles, dtype=bool)
+        alive_ref = alive.copy()
+        buffers = (np.empty((num_particles, 2)), np.empty(num_particles), np.empty(num_particles, dtype=bool))
+        for _ in range(20):
+            module.step_particles(positions, alive, 0.05, rng, *buffers)
+            reference_decay_step(positions_ref, alive_ref, 0.05, rng_ref)
+        record(f"{key}.step_particles positions", positions_ref, positions)
+        record(f"{key}.step_particles alive", alive_ref, alive)
+    return checks
+
+# Fungsi untuk membandingkan hasil dengan baseline JSON; kasus dicocokkan lewat nama dan parameter
+def compare_baseline(results, baseline, tolerance):
+    def key(entry):
+        return entry["case"], json.dumps(entry["params"], sort_keys=True)
+
+    previous = {key(entry): entry for entry in baseline["results"] if "seconds" in entry}
+    comparison = []
+    for entry in results:
+        old = previous.get(key(entry))
+        if old is None or "seconds" not in entry or entry.get("status", "ok") != "ok":
+            continue
+        ratio = entry["seconds"] / old["seconds"]
+        comparison.append({"case": entry["case"], "params": entry["params"], "baseline": old["seconds"],
+                           "seconds": entry["seconds"], "ratio": ratio, "regression": ratio > 1 + tolerance})
+    return comparison
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark performa simulasi flux neutron dan peluruhan")
+    parser.add_argument("--quick", action="store_true", help="matriks ukuran kecil")
+    parser.add_argument("--only", nargs="+", choices=["solvers", "rendering", "export", "decay"],
+                        help="hanya jalankan kelompok tertentu")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="file JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="batas perlambatan relatif (0.10 = 10%%)")
+    parser.add_argument("--profile", action="store_true", help="catat fase tiap kelompok ke log JSON-lines")
+    parser.add_argument("--profile-sampling", action="store_true", help="tambahkan dump profiler sampling")
+    args = parser.parse_args()
+
+    matrix = QUICK_MATRIX if args.quick else MATRIX
+    groups = {"solvers": lambda: bench_solvers(matrix, args.repeat, args.workers),
+              "rendering": lambda: bench_rendering(matrix, args.repeat),
+              "export": lambda: bench_export(matrix, args.repeat),
+              "decay": lambda: bench_decay(matrix, args.repeat)}
+
+    report = {
+        "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "numpy": np.__version__, "platform": platform.platform(), "cpu_count": os.cpu_count(),
+                 "workers": args.workers, "matrix": matrix, "repeat": args.repeat},
+        "golden": golden_checks(args.workers),
+        "results": [],
+    }
+    for check in report["golden"]:
+        print(f"[{'OK' if check['passed'] else 'GAGAL'}] {check['check']}: galat relatif {check['relative_error']:.2e}")
+
+    for name in args.only or groups:
+        print(f"== {name}")
+        with PROFILER.run(f"benchmark_{name}"):
+            entries = groups[name]()
+        for entry in entries:
+            report["results"].append(entry)
+            if "seconds" in entry:
+                print(f"  {entry['case']:36s} {json.dumps(entry['params'])}: {entry['seconds']:.4f} s"
+                      + (f" ({entry['status']})" if entry.get("status", "ok") != "ok" else ""))
+            else:
+                print(f"  {entry['case']:36s} {json.dumps(entry['params'])}: {entry['status']} ({entry['reason']})")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare_baseline(report["results"], json.load(f), args.tolerance)
+        print("== Perbandingan dengan baseline")
+        for entry in report["comparison"]:
+            flag = "LAMBAT" if entry["regression"] else ""
+            print(f"  {entry['case']:36s} {json.dumps(entry['params'])}: {entry['ratio']:5.2f}x {flag}")
+        regressions = [entry for entry in report["comparison"] if entry["regression"]]
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan di {args.output}")
+
+    failed = [check for check in report["golden"] if not check["passed"]]
+    return 1 if failed or regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Tabel material dan layout teras bersama untuk solver flux neutron 2D.
+
+``material_data`` memuat sifat satu grup (D, Sigma_a, S) per zona teras dan
+``build_core_layout`` membuat peta label material. Solver steady multigrup (1.1) dan
+transient (1.6) sama-sama memakai ``face_coefficients`` untuk koefisien muka sel;
+masing-masing hanya menambahkan suku diagonal dan faktor skemanya sendiri.
+
+Asal konstanta ``material_data``: nilai satu grup ilustratif dalam orde besaran teras
+termal (D ~ 1 cm, Sigma_a ~ 0.1 /cm untuk bahan bakar, moderator dan reflektor dengan
+absorpsi jauh lebih kecil dan tanpa sumber), bukan data nuklir terevaluasi. Urutan relatif
+antarbahan bakar mengikuti sifatnya: Pu-239 (fisil, penampang termal terbesar) > U-235 >
+Th-232 (fertil, sumber kecil). Zona bahan bakar memakai nama nuklida ``radioactive_data``
+pada skrip peluruhan (1.3_/1.4_), tetapi S sengaja tidak diturunkan dari data peluruhannya:
+aktivitas spesifik ln2 / waktu paruh x atom per massa mengukur peluruhan spontan, bukan
+sumber neutron teras, dan akan membuat S Pu-239 ~2.9e4 kali U-235 (Th-232 ~0.05 kali),
+sehingga satu zona mendominasi seluruh medan flux.
+"""
+import numpy as np
+
+# Sifat material per zona teras: koefisien difusi D (cm), absorpsi Sigma_a (/cm), sumber S
+# (nilai ilustratif, lihat docstring modul)
+material_data = {
+    "U-235": {"D": 1.0, "Sigma_a": 0.10, "S": 1.0},
+    "Pu-239": {"D": 1.0, "Sigma_a": 0.12, "S": 1.3},
+    "Th-232": {"D": 1.0, "Sigma_a": 0.08, "S": 0.4},
+    "Moderator": {"D": 1.5, "Sigma_a": 0.01, "S": 0.0},
+    "Reflector": {"D": 0.9, "Sigma_a": 0.005, "S": 0.0},
+}
+
+
+def build_core_layout(shape, fuels=("U-235", "Pu-239", "Th-232")):
+    """Peta material teras ``shape`` = (nx, ny): reflektor di tepi, moderator di dalamnya,
+    dan zona bahan bakar ``fuels`` berdampingan di tengah teras.
+
+    Mengembalikan (labels, materials): array indeks material per sel dan daftar nama material.
+    """
+    nx, ny = shape
+    materials = ["Reflector", "Moderator"] + list(fuels)
+    labels = np.zeros((nx, ny), dtype=np.intp)
+    rx, ry = max(nx // 10, 1), max(ny // 10, 1)
+    labels[rx:-rx, ry:-ry] = 1
+    core_rows = slice(nx // 5, nx - nx // 5)
+    bands = np.array_split(np.arange(ny // 5, ny - ny // 5), len(fuels))
+    for index, columns in enumerate(bands):
+        if len(columns):
+            labels[core_rows, columns[0]:columns[-1] + 1] = 2 + index
+    return labels, materials
+
+
+def material_properties(labels, materials, table=material_data):
+    """Peta D, Sigma_a, dan S per sel dari layout (dict nama -> array seukuran ``labels``)."""
+    return {key: np.array([table[name][key] for name in materials], dtype=float)[labels]
+            for key in ("D", "Sigma_a", "S")}
+
+
+def face_coefficients(D_map, dx=1.0):
+    """Koefisien muka sel bagian dalam, D_muka / dx^2, dengan D_muka rata-rata harmonik kedua sel."""
+    center = D_map[1:-1, 1:-1]
+
+    def face(neighbor):
+        return 2 * center * neighbor / (center + neighbor) / dx**2
+
+    return {
+        "ip": face(D_map[2:, 1:-1]),
+        "im": face(D_map[:-2, 1:-1]),
+        "jp": face(D_map[1:-1, 2:]),
+        "jm": face(D_map[1:-1, :-2]),
+    }
@@ -0,0 +1,124 @@
+"""Diagnostik per langkah waktu untuk solver flux neutron 2D.
+
+Solver mengisi satu baris array terstruktur ``DIAGNOSTIC_DTYPE`` setiap langkah,
+langsung setelah stencil selesai (saat field masih hangat di cache). Konsumen
+(plot total flux, regresi, ekspor Excel, batas warna animasi) membaca array
+kecil ini, bukan memindai ulang seluruh ``flux_history``.
+
+Kolom:
+- ``total``: jumlah flux di seluruh grid (akumulator float64)
+- ``peak``, ``peak_i``, ``peak_j``: nilai dan lokasi flux maksimum
+- ``centroid_i``, ``centroid_j``: pusat massa distribusi flux (indeks grid)
+- ``leakage``: laju kebocoran neto melewati batas, sum D_muka * (phi_dalam - phi_batas)
+- ``change``: norma L2 perubahan field terhadap langkah sebelumnya
+
+``ProbeSet`` mencatat deret waktu flux di titik detektor dan integral daerah (persegi
+atau mask, misalnya zona bahan bakar) tanpa perlu menyimpan ``flux_history`` penuh.
+"""
+import numpy as np
+
+DIAGNOSTIC_DTYPE = np.dtype([
+    ("total", np.float64),
+    ("peak", np.float64),
+    ("peak_i", np.int64),
+    ("peak_j", np.int64),
+    ("centroid_i", np.float64),
+    ("centroid_j", np.float64),
+    ("leakage", np.float64),
+    ("change", np.float64),
+])
+
+
+def empty_diagnostics(time_steps):
+    """Mengalokasikan array diagnostik kosong untuk ``time_steps`` langkah."""
+    return np.zeros(time_steps, dtype=DIAGNOSTIC_DTYPE)
+
+
+def boundary_weights(D, coeffs=None, dt=None, dx=1.0):
+    """Koefisien difusi muka batas (atas, bawah, kiri, kanan) untuk menghitung kebocoran.
+
+    Tanpa ``coeffs`` dipakai D skalar. Dengan koefisien stencil heterogen
+    (``dt * D_muka / dx^2``), D muka dihitung kembali dari koefisien baris/kolom tepi.
+    """
+    if coeffs is None:
+        return (D, D, D, D)
+    scale = dx**2 / dt
+    return (coeffs["im"][0, :] * scale, coeffs["ip"][-1, :] * scale,
+            coeffs["jm"][:, 0] * scale, coeffs["jp"][:, -1] * scale)
+
+
+def record_diagnostics(row, current, previous, weights=(1.0, 1.0, 1.0, 1.0)):
+    """Mengisi satu baris diagnostik (``row`` = elemen array ``DIAGNOSTIC_DTYPE``) dari field saat ini."""
+    rows = current.sum(axis=1, dtype=np.float64)
+    cols = current.sum(axis=0, dtype=np.float64)
+    total = rows.sum()
+    peak_index = int(np.argmax(current))
+    row["total"] = total
+    row["peak"] = current.flat[peak_index]
+    row["peak_i"], row["peak_j"] = divmod(peak_index, current.shape[1])
+    if total != 0:
+        row["centroid_i"] = rows @ np.arange(len(rows)) / total
+        row["centroid_j"] = cols @ np.arange(len(cols)) / total
+    else:
+        row["centroid_i"] = row["centroid_j"] = np.nan
+    top, bottom, left, right = weights
+    row["leakage"] = (np.sum(top * (current[1, 1:-1] - current[0, 1:-1]), dtype=np.float64)
+                      + np.sum(bottom * (current[-2, 1:-1] - current[-1, 1:-1]), dtype=np.float64)
+                      + np.sum(left * (current[1:-1, 1] - current[1:-1, 0]), dtype=np.float64)
+                      + np.sum(right * (current[1:-1, -2] - current[1:-1, -1]), dtype=np.float64))
+    row["change"] = np.linalg.norm((current - previous).ravel())
+
+
+class ProbeSet:
+    """Deret waktu flux di titik probe dan integral daerah, dicatat per langkah.
+
+    ``probes`` adalah dict nama -> spesifikasi:
+    - ``(i, j)``: nilai flux di satu titik
+    - ``(i0, i1, j0, j1)``: integral flux pada persegi ``[i0:i1, j0:j1]``
+    - array boolean seukuran grid: integral flux pada sel bernilai True
+
+    Semua spesifikasi diubah sekali menjadi indeks datar, sehingga ``record`` hanya
+    melakukan gather pada field yang sudah di-ravel. Hasil disimpan di ``values``
+    (``time_steps`` x jumlah probe, float64) dengan urutan kolom ``names``.
+    """
+
+    def __init__(self, shape, time_steps, probes):
+        self.shape = tuple(shape)
+        self.names = list(probes)
+        self.values = np.zeros((time_steps, len(self.names)), dtype=np.float64)
+        point_columns, points, self.regions = [], [], []
+        for column, (name, spec) in enumerate(probes.items()):
+            if isinstance(spec, np.ndarray) and spec.dtype == bool:
+                if spec.shape != self.shape:
+                    raise ValueError(f"Mask probe '{name}' berukuran {spec.shape}, grid {self.shape}.")
+                mask = spec
+            elif len(spec) == 2:
+                if not all(-n <= k < n for k, n in zip(spec, self.shape)):
+                    raise ValueError(f"Titik probe '{name}' {tuple(spec)} di luar grid {self.shape}.")
+                points.append(np.ravel_multi_index(tuple(k % n for k, n in zip(spec, self.shape)), self.shape))
+                point_columns.append(column)
+                continue
+            elif len(spec) == 4:
+                i0, i1, j0, j1 = spec
+                mask = np.zeros(self.shape, dtype=bool)
+                mask[i0:i1, j0:j1] = True
+            else:
+                raise ValueError(f"Spesifikasi probe '{name}' tidak dikenali: {spec!r}")
+            indices = np.flatnonzero(mask)
+            if not indices.size:
+                raise ValueError(f"Daerah probe '{name}' kosong.")
+            self.regions.append((column, indices))
+        self.point_columns = np.array(point_columns, dtype=np.intp)
+        self.points = np.array(points, dtype=np.intp)
+
+    def record(self, step, field):
+        """Mengisi baris ``step`` dari ``field`` (array 2D seukuran grid)."""
+        flat = field.reshape(-1)
+        row = self.values[step]
+        row[self.point_columns] = flat[self.points]
+        for column, indices in self.regions:
+            row[column] = np.sum(flat[indices], dtype=np.float64)
+
+    def as_dict(self):
+        """Deret waktu per probe sebagai dict nama -> array (siap untuk DataFrame)."""
+        return {name: self.values[:, column] for column, name in enumerate(self.names)}
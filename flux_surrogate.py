@@ -0,0 +1,228 @@
+"""Model surrogate parametrik untuk pertanyaan what-if simulasi flux neutron 2D.
+
+``RunDatabase`` menyimpan hasil run (parameter, kurva total flux, field akhir yang
+di-resample ke grid ``POD_GRID``) ke file .npz. ``FluxSurrogate`` dilatih dari database
+itu: kurva total flux (log, di ``CURVE_POINTS`` langkah berjarak geometris) dan koefisien
+POD field akhir diprediksi sekaligus oleh satu Gaussian process dari
+(log D, log Sigma_a, log S, log grid_size, heterogen). Prediksi menyertakan simpangan
+baku GP (dikalibrasi dengan validasi silang) sebagai estimasi ketidakpastian; ``query`` memakai solver asli jika parameter
+berada di luar domain latih atau ketidakpastiannya terlalu besar.
+
+Target dinormalisasi dulu dengan ``output_scale`` (flux sebanding dengan S, total flux
+juga dengan jumlah sel dalam) sehingga GP hanya mempelajari bentuk respons. Pada teras
+heterogen sumber berasal dari tabel material, jadi S masukan tidak dipakai sebagai skala.
+
+Masukan "material" direduksi menjadi satu fitur biner ``heterogeneous``: GUI hanya bisa
+menghasilkan dua konfigurasi material, grid seragam (D, Sigma_a, S dari isian) atau teras
+tetap dari ``core_materials`` (``build_core_layout`` + ``material_data``), sehingga flag ini
+menentukan konfigurasi sepenuhnya. Layout atau tabel material lain membutuhkan fitur
+tambahan (mis. fraksi luas dan sifat rata-rata per zona) dan data latih baru.
+"""
+import os
+import time
+
+import numpy as np
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import ConstantKernel, RBF, WhiteKernel
+from sklearn.model_selection import KFold
+
+PARAMETERS = ("D", "Sigma_a", "S", "grid_size", "heterogeneous")
+POD_GRID = 32  # Sisi grid field akhir yang disimpan dan didekomposisi POD
+CURVE_POINTS = 50  # Jumlah titik sampel kurva total flux sepanjang horizon
+MIN_RUNS = 8  # Jumlah run minimum untuk melatih surrogate
+
+
+def resample_field(field, size=POD_GRID):
+    """Interpolasi bilinear field 2D ke grid ``size`` x ``size`` (koordinat ternormalisasi 0..1)."""
+    field = np.asarray(field, dtype=np.float64)
+    target = np.linspace(0, 1, size)
+    rows = np.array([np.interp(target, np.linspace(0, 1, field.shape[1]), row) for row in field])
+    return np.array([np.interp(target, np.linspace(0, 1, field.shape[0]), col) for col in rows.T]).T
+
+
+def features(params):
+    """Vektor fitur dari dict parameter run: log untuk besaran positif, 0/1 untuk layout."""
+    return np.array([np.log(params["D"]), np.log(params["Sigma_a"]), np.log(params["S"]),
+                     np.log(params["grid_size"]), float(params["heterogeneous"])])
+
+
+def output_scale(params):
+    """Skala normalisasi (field, total flux): S dan S x jumlah sel bagian dalam grid."""
+    source = 1.0 if params["heterogeneous"] else params["S"]
+    return source, source * (params["grid_size"] - 2)**2
+
+
+def sweep_parameters(center, n_runs, spread=2.0, grid_range=(20, 64), seed=0):
+    """Sampel Latin hypercube di sekitar ``center`` (D, Sigma_a, S dikali/dibagi ``spread``).
+
+    Ukuran grid diambil dari ``grid_range`` dan layout seragam/heterogen bergantian.
+    """
+    rng = np.random.default_rng(seed)
+    strata = (np.arange(n_runs)[:, None] + rng.random((n_runs, 4))) / n_runs
+    for column in range(4):
+        rng.shuffle(strata[:, column])
+    runs = []
+    for index, (d, sigma, source, grid) in enumerate(strata):
+        runs.append({"D": center["D"] * spread ** (2 * d - 1),
+                     "Sigma_a": center["Sigma_a"] * spread ** (2 * sigma - 1),
+                     "S": center["S"] * spread ** (2 * source - 1),
+                     "grid_size": int(round(grid_range[0] + grid * (grid_range[1] - grid_range[0]))),
+                     "heterogeneous": bool(index % 2)})
+    return runs
+
+
+class RunDatabase:
+    """Database hasil run untuk melatih surrogate, disimpan ke ``path`` (.npz) jika diberikan."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.params, self.totals, self.fields = [], [], []
+        if path is not None and os.path.exists(path):
+            with np.load(path) as data:
+                for row, total, field in zip(data["params"], data["totals"], data["fields"]):
+                    self.params.append(dict(zip(PARAMETERS, row.tolist())))
+                    self.totals.append(total[~np.isnan(total)])
+                    self.fields.append(field)
+
+    def __len__(self):
+        return len(self.params)
+
+    def add(self, params, total, final_field):
+        self.params.append({key: params[key] for key in PARAMETERS})
+        self.totals.append(np.asarray(total, dtype=np.float64))
+        self.fields.append(resample_field(final_field))
+
+    def save(self):
+        """Menyimpan database; kurva dengan panjang berbeda diisi NaN sampai kurva terpanjang."""
+        if self.path is None or not self.params:
+            return
+        length = max(len(total) for total in self.totals)
+        totals = np.full((len(self.totals), length), np.nan)
+        for row, total in zip(totals, self.totals):
+            row[:len(total)] = total
+        params = np.array([[p[key] for key in PARAMETERS] for p in self.params], dtype=np.float64)
+        temp_path = self.path + ".tmp.npz"
+        np.savez_compressed(temp_path, params=params, totals=totals, fields=np.array(self.fields))
+        os.replace(temp_path, self.path)
+
+
+class FluxSurrogate:
+    """Gaussian process multi-output untuk kurva total flux dan koefisien POD field akhir.
+
+    Hanya run dengan kurva sepanjang minimal ``horizon`` langkah yang dipakai. Mode POD
+    dipilih sampai ``energy`` energi snapshot tercakup. ``uncertainty_limit`` adalah batas
+    simpangan baku relatif total flux untuk menerima prediksi surrogate di ``query``.
+    """
+
+    def __init__(self, horizon, energy=0.999, uncertainty_limit=0.05):
+        self.horizon = horizon
+        self.energy = energy
+        self.uncertainty_limit = uncertainty_limit
+        self.curve_steps = np.unique(np.geomspace(1, horizon, CURVE_POINTS).round().astype(int))
+        self.validation = None
+        self.std_scale = 1.0  # Faktor kalibrasi simpangan baku GP dari validasi silang
+
+    def _fit_arrays(self, X, curves, fields, kernel=None):
+        """Melatih POD dan GP dari array; ``kernel`` tetap (tanpa optimasi) dipakai saat validasi silang."""
+        mean = fields.mean(axis=0)
+        _, singular, modes = np.linalg.svd(fields - mean, full_matrices=False)
+        energy = np.cumsum(singular**2) / max(np.sum(singular**2), np.finfo(float).tiny)
+        n_modes = min(int(np.searchsorted(energy, self.energy)) + 1, len(singular))
+        modes = modes[:n_modes]
+        Y = np.hstack([curves, (fields - mean) @ modes.T])
+        if kernel is None:
+            kernel = (ConstantKernel(1.0, (1e-3, 1e3)) * RBF(np.ones(X.shape[1]), (1e-2, 1e3))
+                      + WhiteKernel(1e-4, (1e-10, 1e-1)))
+            gp = GaussianProcessRegressor(kernel, normalize_y=True, n_restarts_optimizer=2, random_state=0)
+        else:
+            gp = GaussianProcessRegressor(kernel, normalize_y=True, optimizer=None)
+        return {"gp": gp.fit(X, Y), "mean": mean, "modes": modes}
+
+    @staticmethod
+    def _predict_arrays(model, X, n_curve):
+        Y, std = model["gp"].predict(X, return_std=True)
+        std = std.reshape(Y.shape)
+        return Y[:, :n_curve], std[:, :n_curve], model["mean"] + Y[:, n_curve:] @ model["modes"], \
+            np.sqrt(std[:, n_curve:]**2 @ model["modes"]**2)
+
+    def fit(self, database, folds=5):
+        """Melatih surrogate dari ``database`` dan menghitung metrik validasi silang K-fold."""
+        usable = [i for i, total in enumerate(database.totals) if len(total) >= self.horizon]
+        if len(usable) < MIN_RUNS:
+            raise ValueError(f"Butuh minimal {MIN_RUNS} run dengan {self.horizon} langkah (ada {len(usable)}).")
+        X = np.array([features(database.params[i]) for i in usable])
+        scales = np.array([output_scale(database.params[i]) for i in usable])
+        totals = np.array([database.totals[i][self.curve_steps - 1] for i in usable]) / scales[:, 1:]
+        curves = np.log(np.maximum(totals, 1e-300))
+        fields = np.array([database.fields[i].ravel() for i in usable]) / scales[:, :1]
+        self.model = self._fit_arrays(X, curves, fields)
+        self.bounds = (X.min(axis=0), X.max(axis=0))
+        self.n_runs = len(usable)
+        self.validation = self._cross_validate(X, curves, fields, folds)
+        return self
+
+    def _cross_validate(self, X, curves, fields, folds):
+        n_curve = len(self.curve_steps)
+        total_errors, field_errors, z_scores = [], [], []
+        for train, test in KFold(min(folds, len(X)), shuffle=True, random_state=0).split(X):
+            model = self._fit_arrays(X[train], curves[train], fields[train], kernel=self.model["gp"].kernel_)
+            curve, curve_std, field, _ = self._predict_arrays(model, X[test], n_curve)
+            total_errors.append(np.exp(curve - curves[test]) - 1)
+            field_errors.append(np.linalg.norm(field - fields[test], axis=1)
+                                / np.maximum(np.linalg.norm(fields[test], axis=1), 1e-300))
+            z_scores.append(np.abs(curve - curves[test]) / np.maximum(curve_std, 1e-12))
+        z_scores = np.concatenate(z_scores).ravel()
+        # Simpangan baku diskalakan agar 95% galat validasi berada di dalam 1.96 sigma
+        self.std_scale = max(float(np.quantile(z_scores, 0.95)) / 1.96, 1e-3)
+        return {"total_rel_rmse": float(np.sqrt(np.mean(np.concatenate(total_errors)**2))),
+                "field_rel_error": float(np.mean(np.concatenate(field_errors))),
+                "coverage_2sigma": float(np.mean(z_scores <= 2 * self.std_scale)),
+                "std_scale": self.std_scale, "folds": min(folds, len(X))}
+
+    def in_domain(self, params, step=None):
+        """True jika parameter di dalam kotak batas data latih (dan step <= horizon)."""
+        x = features(params)
+        low, high = self.bounds
+        return bool(np.all(x >= low - 1e-9) and np.all(x <= high + 1e-9)
+                    and (step is None or 1 <= step <= self.horizon))
+
+    def predict(self, params):
+        """Prediksi kurva total flux (langkah 1..horizon), simpangan baku relatifnya, dan field akhir."""
+        start = time.perf_counter()
+        curve, curve_std, field, field_std = self._predict_arrays(self.model, features(params)[None, :],
+                                                                  len(self.curve_steps))
+        curve_std, field_std = curve_std * self.std_scale, field_std * self.std_scale
+        steps = np.arange(1, self.horizon + 1)
+        log_total = np.interp(steps, self.curve_steps, curve[0])
+        field_scale, total_scale = output_scale(params)
+        return {"total": np.exp(log_total) * total_scale,
+                "total_rel_std": np.interp(steps, self.curve_steps, curve_std[0]),
+                "final_field": field[0].reshape(POD_GRID, POD_GRID) * field_scale,
+                "final_field_std": field_std[0].reshape(POD_GRID, POD_GRID) * field_scale,
+                "source": "surrogate", "seconds": time.perf_counter() - start}
+
+    def query(self, params, step, solver=None, database=None):
+        """Total flux di ``step`` untuk ``params``; memakai ``solver`` jika di luar domain/terlalu tidak pasti.
+
+        ``solver(params, time_steps)`` mengembalikan (kurva total flux, field akhir). Hasil solver
+        ditambahkan ke ``database`` (jika diberikan) agar surrogate berikutnya mencakup titik itu.
+        """
+        if self.in_domain(params, step):
+            result = self.predict(params)
+            result["total_at_step"] = result["total"][step - 1]
+            result["rel_std_at_step"] = result["total_rel_std"][step - 1]
+            if solver is None or result["rel_std_at_step"] <= self.uncertainty_limit:
+                return result
+            reason = "ketidakpastian terlalu besar"
+        else:
+            reason = "di luar domain latih"
+        if solver is None:
+            raise ValueError(f"Parameter {reason} dan solver tidak tersedia.")
+        start = time.perf_counter()
+        total, final_field = solver(params, max(step, self.horizon))
+        if database is not None:
+            database.add(params, total, final_field)
+        return {"total": np.asarray(total), "total_rel_std": np.zeros(len(total)),
+                "final_field": resample_field(final_field), "final_field_std": np.zeros((POD_GRID, POD_GRID)),
+                "total_at_step": total[step - 1], "rel_std_at_step": 0.0, "source": "solver",
+                "reason": reason, "seconds": time.perf_counter() - start}
@@ -0,0 +1,94 @@
+"""Piramida multi-resolusi frame flux untuk scrubbing cepat dan thumbnail.
+
+Level 0 adalah field penuh (dibaca dari ``source``, misalnya ``flux_history``); level k
+adalah rata-rata blok 2x2 dari level k-1, sampai sisi terpanjang <= ``min_size``.
+Level >= 1 disimpan dalam cache LRU berbatas byte: saat ``add`` dipanggil ketika frame
+diproduksi, atau dihitung ulang dari ``source`` saat diminta setelah tergusur.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def block_average(field):
+    """Rata-rata blok 2x2; baris/kolom terakhir yang ganjil diabaikan."""
+    rows, cols = field.shape[0] // 2, field.shape[1] // 2
+    return field[:2 * rows, :2 * cols].reshape(rows, 2, cols, 2).mean(axis=(1, 3))
+
+
+class FramePyramid:
+    """Cache LRU level resolusi rendah untuk frame flux.
+
+    ``shape`` adalah ukuran field penuh. ``source(frame)`` mengembalikan field penuh frame;
+    boleh diisi belakangan (setelah run selesai) karena ``add`` tidak membutuhkannya. Level
+    disimpan dalam ``dtype`` (bawaan float32) dan total byte cache dijaga <= ``max_bytes``.
+    """
+
+    def __init__(self, shape, source=None, max_bytes=256 * 1024**2, min_size=64, dtype=np.float32):
+        self.shape = tuple(shape)
+        self.source = source
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.dtype = dtype
+        self.nbytes = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def levels(self):
+        """Jumlah level tereduksi (level terkasar = ``levels``; 0 jika grid sudah kecil)."""
+        count, shape = 0, self.shape
+        while max(shape) > self.min_size and min(shape) >= 2:
+            shape = (shape[0] // 2, shape[1] // 2)
+            count += 1
+        return count
+
+    def level_for(self, pixels):
+        """Level terkasar yang sisi terpanjangnya masih >= ``pixels`` (untuk resolusi tampilan)."""
+        level = 0
+        while level < self.levels and max(self.shape) >> (level + 1) >= pixels:
+            level += 1
+        return level
+
+    def add(self, frame, field):
+        """Membangun dan menyimpan semua level frame yang baru diproduksi."""
+        for level in range(1, self.levels + 1):
+            field = block_average(field)
+            self._store((frame, level), field)
+
+    def get(self, frame, level):
+        if level == 0:
+            return self.source(frame)
+        with self._lock:
+            cached = self._cache.get((frame, level))
+            if cached is not None:
+                self._cache.move_to_end((frame, level))
+                return cached
+        field = self.source(frame)
+        for k in range(1, level + 1):
+            field = block_average(field)
+            stored = self._store((frame, k), field)
+        return stored  # Nilai yang disimpan di bawah lock, bukan baca ulang cache yang bisa sudah berubah
+
+    def _store(self, key, field):
+        """Menyimpan ``field`` (dikonversi ke ``dtype``) ke cache LRU dan mengembalikan salinan tersimpan itu."""
+        field = field.astype(self.dtype)
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._cache[key] = field
+            self.nbytes += field.nbytes
+            while self.nbytes > self.max_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return field
+
+    def thumbnail_strip(self, frames):
+        """Menggabungkan level terkasar ``frames`` secara horizontal; tiap tile dinormalisasi ke [0, 1]."""
+        tiles = []
+        for frame in frames:
+            tile = self.get(frame, self.levels)
+            tiles.append(tile / (tile.max() or 1.0))
+        return np.hstack(tiles)
@@ -0,0 +1,35 @@
+"""Langkah partikel peluruhan bersama untuk simulasi peluruhan (1.3_) dan Geiger counter (1.4_).
+
+``step_particles`` menggerakkan dan meluruhkan partikel secara in-place pada array yang
+dialokasikan pemanggil, dan ``PARTICLE_CMAP`` mewarnai status partikel pada scatter plot.
+"""
+import numpy as np
+from matplotlib.colors import ListedColormap
+
+# Colormap dua warna: 0 = meluruh (abu-abu), 1 = aktif (biru)
+PARTICLE_CMAP = ListedColormap(["gray", "blue"])
+
+
+def step_particles(positions, alive, decay_prob, rng, step_buffer, draw_buffer, decayed):
+    """Menggerakkan partikel aktif secara acak dan meluruhkan sebagian secara in-place.
+
+    Semua array (posisi (N, 2), status hidup, dan buffer kerja) dialokasikan
+    sekali oleh pemanggil, sehingga satu langkah tidak membuat objek baru.
+    Mengembalikan jumlah partikel yang meluruh pada langkah ini.
+    """
+    # Gerakan acak dalam rentang (-0.05, 0.05), hanya untuk partikel aktif
+    rng.random(out=step_buffer)
+    step_buffer -= 0.5
+    step_buffer *= 0.1
+    step_buffer *= alive[:, None]
+    positions += step_buffer
+
+    # Membatasi gerakan dalam batas (0, 1)
+    np.clip(positions, 0, 1, out=positions)
+
+    # Partikel aktif meluruh dengan probabilitas tertentu
+    rng.random(out=draw_buffer)
+    np.less(draw_buffer, decay_prob, out=decayed)
+    decayed &= alive
+    alive ^= decayed
+    return int(np.count_nonzero(decayed))
@@ -0,0 +1,214 @@
+"""Lapisan profiling opsional untuk skrip simulasi flux neutron dan peluruhan.
+
+Profiling aktif jika skrip dijalankan dengan argumen ``--profile`` atau variabel
+lingkungan ``FLUX_PROFILE=1``. Saat tidak aktif, ``PROFILER.phase(...)`` hanya
+mengembalikan context manager kosong sehingga biaya di hot path sangat kecil.
+
+- ``PROFILER.phase(nama)`` mencatat jumlah panggilan, total, dan maksimum waktu fase.
+- ``PROFILER.count(nama, n)`` menambah penghitung (langkah, frame, byte ekspor).
+- ``PROFILER.run(nama, **params)`` membuka log JSON-lines per run di folder
+  ``FLUX_PROFILE_DIR`` (bawaan ``profiling_logs``) dan menulis ringkasan saat selesai.
+- ``PROFILER.export(nama, path)`` adalah run ekspor: fase ``export`` plus ukuran file
+  ``path`` yang dicatat sebelum run ditutup, sehingga byte dan MB/s masuk ke log run.
+- ``--profile-sampling`` / ``FLUX_PROFILE_SAMPLING=1`` menambahkan profiler sampling
+  yang menyimpan stack terlipat (format flamegraph) di samping log run.
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SamplingProfiler:
+    """Profiler sampling berbasis thread: setiap ``interval`` detik stack semua thread lain dicatat.
+
+    Hasil disimpan dalam format stack terlipat (``a;b;c jumlah``) yang bisa dibaca
+    flamegraph.pl atau speedscope.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self, path):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class PhaseProfiler:
+    """Registry timer fase dan penghitung dengan log JSON-lines per run."""
+
+    def __init__(self, enabled=False, sampling=False, log_dir="profiling_logs"):
+        self.enabled = enabled
+        self.sampling = sampling
+        self.log_dir = log_dir
+        self.phases = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._null = contextlib.nullcontext()
+        self._log = None
+        self._run_start = None
+        self._runs = 0
+        self._status_previous = None
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def phase(self, name):
+        """Context manager pengukur waktu fase ``name`` (kosong jika profiling mati)."""
+        return self._timed(name) if self.enabled else self._null
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            entry = self.phases.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            phases = {name: {"calls": calls, "seconds": total, "max": peak, "mean": total / calls}
+                      for name, (calls, total, peak) in self.phases.items()}
+            return {"phases": phases, "counters": dict(self.counters)}
+
+    def reset(self):
+        with self._lock:
+            self.phases.clear()
+            self.counters.clear()
+        self._status_previous = None
+
+    def log(self, event, **fields):
+        """Menulis satu record ke log run yang sedang terbuka."""
+        if self._log is not None:
+            record = {"t": time.perf_counter() - self._run_start, "event": event, **fields}
+            self._log.write(json.dumps(record, default=float) + "\n")
+
+    @contextlib.contextmanager
+    def run(self, name, **params):
+        """Membuka log JSON-lines untuk satu run dan menulis ringkasan fase di akhir run."""
+        if not self.enabled or self._log is not None:
+            yield
+            return
+        self.reset()
+        self._runs += 1
+        os.makedirs(self.log_dir, exist_ok=True)
+        stem = os.path.join(self.log_dir, f"{name}_{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}_{self._runs}")
+        self._log = open(stem + ".jsonl", "w", encoding="utf-8")
+        self._run_start = time.perf_counter()
+        sampler = SamplingProfiler() if self.sampling else None
+        if sampler is not None:
+            sampler.start()
+        self.log("run_start", name=name, script=os.path.basename(sys.argv[0]), params=params)
+        try:
+            yield
+        finally:
+            if sampler is not None:
+                sampler.stop(stem + ".folded")
+            self.log("run_end", name=name, seconds=time.perf_counter() - self._run_start, **self.snapshot())
+            self._log.close()
+            self._log = None
+
+    @contextlib.contextmanager
+    def export(self, name, path, **params):
+        """Run ekspor ke ``path``: waktu fase "export" lalu ukuran file, keduanya di dalam run."""
+        with self.run(name, path=path, **params):
+            with self.phase("export"):
+                yield
+            if self.enabled and os.path.exists(path):
+                size = os.path.getsize(path)
+                self.count("export_bytes", size)
+                seconds = self.snapshot()["phases"].get("export", {}).get("seconds")
+                self.log("export", bytes=size, mb_per_s=size / 1e6 / seconds if seconds else None)
+
+    def status_text(self):
+        """Ringkasan singkat untuk status bar: langkah/s, ms render per frame, dan MB/s ekspor.
+
+        Langkah/s dihitung dari selisih sejak pemanggilan sebelumnya.
+        """
+        now = time.perf_counter()
+        snap = self.snapshot()
+        counters, phases = snap["counters"], snap["phases"]
+        parts = []
+        steps = counters.get("steps", 0)
+        if self._status_previous is not None and now > self._status_previous[0]:
+            rate = (steps - self._status_previous[1]) / (now - self._status_previous[0])
+            parts.append(f"{rate:,.0f} langkah/s")
+        self._status_previous = (now, steps)
+        if "render" in phases:
+            parts.append(f"render {phases['render']['mean'] * 1e3:.1f} ms/frame")
+        if "export" in phases and counters.get("export_bytes"):
+            parts.append(f"ekspor {counters['export_bytes'] / 1e6 / phases['export']['seconds']:.1f} MB/s")
+        return "Profiling: " + ("   ".join(parts) if parts else "menunggu data")
+
+    def attach_status(self, label, interval_ms=500):
+        """Memperbarui ``label`` Tk secara berkala dengan ``status_text`` (hanya saat profiling aktif)."""
+        if not self.enabled:
+            return
+
+        def refresh():
+            label.config(text=self.status_text())
+            label.after(interval_ms, refresh)
+
+        refresh()
+
+    def status_bar(self, parent, row=None, columnspan=2, **layout):
+        """Membuat label status profiling di ``parent`` dan menyambungkannya ke ``attach_status``.
+
+        Tanpa ``row`` label di-pack selebar parent; dengan ``row`` label di-grid pada kolom 0
+        sepanjang ``columnspan`` kolom. ``layout`` diteruskan ke pack/grid (mis. ``pady``).
+        """
+        from tkinter import ttk
+
+        label = ttk.Label(parent, text="", anchor="w")
+        if row is None:
+            label.pack(**{"fill": "x", **layout})
+        else:
+            label.grid(**{"row": row, "column": 0, "columnspan": columnspan, "sticky": "we", "padx": 10, **layout})
+        self.attach_status(label)
+        return label
+
+
+PROFILER = PhaseProfiler(
+    enabled="--profile" in sys.argv or os.environ.get("FLUX_PROFILE") == "1",
+    sampling="--profile-sampling" in sys.argv or os.environ.get("FLUX_PROFILE_SAMPLING") == "1",
+    log_dir=os.environ.get("FLUX_PROFILE_DIR", "profiling_logs"),
+)
+if PROFILER.sampling:
+    PROFILER.enabled = True
@@ -0,0 +1,128 @@
+"""Tabel Treeview tervirtualisasi untuk deret hasil yang panjang.
+
+Treeview hanya memiliki ``height`` baris tetap; saat digulir, nilainya diisi ulang dari
+array NumPy untuk rentang yang terlihat. Membuka tabel 10^5 langkah sama cepatnya dengan
+10 langkah, dan pengurutan kolom memakai ``np.argsort`` pada array, bukan item Treeview.
+"""
+from tkinter import ttk
+
+import numpy as np
+
+
+class VirtualTable:
+    """Tabel tervirtualisasi di atas kolom-kolom array NumPy yang sama panjang.
+
+    ``columns`` adalah dict judul -> array, ``formats`` string format per kolom
+    (misalnya ``"{:.2f}"``). Klik judul kolom mengurutkan naik/turun; isian "Lompat ke"
+    memilih baris dengan indeks asli (langkah waktu) tertentu.
+    """
+
+    def __init__(self, master, columns, formats, height=20, width=100):
+        self.names = list(columns)
+        self.arrays = [np.asarray(values) for values in columns.values()]
+        self.formats = list(formats)
+        self.length = len(self.arrays[0])
+        self.height = min(height, self.length)
+        self.order = np.arange(self.length)
+        self.offset = 0
+        self.sorted_by = None
+        self.selected = None  # Indeks asli baris terpilih (tetap terpilih saat digulir)
+
+        self.frame = ttk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=self.names, show="headings", height=max(self.height, 1),
+                                 selectmode="browse")
+        for name in self.names:
+            self.tree.heading(name, text=name, command=lambda name=name: self.sort(name))
+            self.tree.column(name, width=width, anchor="center")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        jump_frame = ttk.Frame(self.frame)
+        jump_frame.grid(row=1, column=0, columnspan=2, sticky="w", pady=(5, 0))
+        ttk.Label(jump_frame, text="Lompat ke:").grid(row=0, column=0)
+        self.jump_entry = ttk.Entry(jump_frame, width=10)
+        self.jump_entry.grid(row=0, column=1, padx=5)
+        self.jump_entry.bind("<Return>", lambda event: self._on_jump())
+        ttk.Button(jump_frame, text="Lompat", command=self._on_jump).grid(row=0, column=2)
+
+        # Item Treeview dibuat sekali; isinya diganti saat tabel digulir
+        self.items = [self.tree.insert("", "end") for _ in range(self.height)]
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.offset - self.height) or "break")
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.offset + self.height) or "break")
+        self.tree.bind("<Up>", lambda event: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda event: self._on_arrow(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.refresh()
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def refresh(self):
+        rows = self.order[self.offset:self.offset + self.height]
+        for item, row in zip(self.items, rows):
+            self.tree.item(item, values=[fmt.format(array[row]) for array, fmt in zip(self.arrays, self.formats)])
+        visible = np.flatnonzero(rows == self.selected) if self.selected is not None else ()
+        self.tree.selection_set([self.items[position] for position in visible])
+        if self.length:
+            self.scrollbar.set(self.offset / self.length, (self.offset + self.height) / self.length)
+
+    def scroll_to(self, offset):
+        self.offset = int(min(max(offset, 0), self.length - self.height))
+        self.refresh()
+
+    def sort(self, name):
+        """Mengurutkan menurut kolom ``name``; klik kedua membalik urutan."""
+        column = self.names.index(name)
+        descending = self.sorted_by == (name, False)
+        self.order = np.argsort(self.arrays[column], kind="stable")
+        if descending:
+            self.order = self.order[::-1]
+        self.sorted_by = (name, descending)
+        for other in self.names:
+            arrow = (" ▼" if descending else " ▲") if other == name else ""
+            self.tree.heading(other, text=other + arrow)
+        self.scroll_to(0)
+
+    def jump(self, index):
+        """Menggulir ke baris dengan indeks asli ``index`` dan memilihnya."""
+        self.selected = index
+        self.scroll_to(int(np.flatnonzero(self.order == index)[0]) - self.height // 2)
+
+    def _on_jump(self):
+        try:
+            index = int(self.jump_entry.get())
+        except ValueError:
+            return
+        if 0 <= index < self.length:
+            self.jump(index)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = self.order[self.offset + self.items.index(selection[0])]
+
+    def _on_arrow(self, delta):
+        selection = self.tree.selection()
+        position = self.items.index(selection[0]) + delta if selection else 0
+        if 0 <= position < self.height:
+            return None  # Pilihan masih di dalam jendela; Treeview memindahkannya sendiri
+        if 0 <= self.offset + position < self.length:
+            self.selected = self.order[self.offset + position]
+            self.scroll_to(self.offset + delta)
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * self.length))
+        else:
+            self.scroll_to(self.offset + int(amount) * (self.height if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"